@@ -0,0 +1,143 @@
+"""
+Contribution analytics for the Qdrant Stars Dashboard
+
+A star x month x type cube of contribution counts (NumPy) is built once per
+roster snapshot. Months outside month_index.plausible_months() count as
+undated, so one mistyped year can't blow up the month axis. Leaderboards,
+monthly series, month-over-month trends and streaks are computed from it
+with pandas and memoized on the cube, so reruns only slice cached frames.
+Import this module lazily: pandas is heavy and the plain dashboard does not
+need it.
+"""
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from contribution_types import CONTRIBUTION_TYPES, ContributionType, contribution_type, type_info
+from month_index import month_key, month_label, plausible_months
+from storage import snapshot_derived
+
+
+class ContributionCube:
+    """Counts indexed by [star position, month offset, type column]"""
+
+    def __init__(self, stars: Sequence[Dict]):
+        self.stars = stars
+        self.names: List[str] = [star.get('name', 'Unknown') for star in stars]
+        self.types: List[ContributionType] = [info.code for info in CONTRIBUTION_TYPES]
+        type_column = {code: column for column, code in enumerate(self.types)}
+
+        rows, keys, columns = [], [], []
+        self.undated = 0
+        earliest, latest = plausible_months()
+        for position, star in enumerate(stars):
+            for contrib in star.get('contributions', []):
+                key = month_key(contrib.get('month', ''))
+                if key is None or not earliest <= key <= latest:
+                    self.undated += 1
+                    continue
+                rows.append(position)
+                keys.append(key)
+                columns.append(type_column[contribution_type(contrib)])
+
+        # Contiguous month axis from the first to the last dated contribution
+        self.first_key = min(keys) if keys else None
+        month_count = max(keys) - self.first_key + 1 if keys else 0
+        self.months: List[str] = [month_label(self.first_key + offset) for offset in range(month_count)]
+        self.counts = np.zeros((len(stars), month_count, len(self.types)), dtype=np.int32)
+        if keys:
+            np.add.at(self.counts, (np.array(rows), np.array(keys) - self.first_key, np.array(columns)), 1)
+
+        self._lock = threading.Lock()
+        self._memo: Dict[Tuple, object] = {}
+
+    def _cached(self, key: Tuple, compute):
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+            return self._memo[key]
+
+    def _month_slice(self, start: Optional[str], end: Optional[str]) -> slice:
+        """Month-axis slice for an inclusive 'YYYY-MM' range (open ends allowed)"""
+        if self.first_key is None:
+            return slice(0, 0)
+        lower = 0 if start is None else max(0, month_key(start) - self.first_key)
+        upper = len(self.months) if end is None else max(0, month_key(end) - self.first_key + 1)
+        return slice(lower, upper)
+
+    def leaderboard(self, start: Optional[str] = None, end: Optional[str] = None,
+                    type_code: Optional[ContributionType] = None, limit: int = 10) -> pd.DataFrame:
+        """Top stars by contributions in a month range (optionally of one type), with per-type columns"""
+        def compute():
+            window = self.counts[:, self._month_slice(start, end), :].sum(axis=1)
+            if type_code is not None:
+                window = window[:, [self.types.index(type_code)]]
+                labels = [type_info(type_code).badge_label]
+            else:
+                labels = [type_info(code).badge_label for code in self.types]
+            frame = pd.DataFrame(window, columns=labels)
+            frame.insert(0, 'Star', self.names)
+            frame.insert(1, 'Total', window.sum(axis=1))
+            frame = frame[frame['Total'] > 0]
+            # Stable sort keeps roster order among equal totals
+            frame = frame.sort_values('Total', ascending=False, kind='stable')
+            frame = frame.loc[:, (frame != 0).any(axis=0)]
+            return frame.reset_index(drop=True)
+        return self._cached(('leaderboard', start, end, type_code), compute).head(limit).copy()
+
+    def monthly_by_type(self, last: Optional[int] = None) -> pd.DataFrame:
+        """Contributions per month (rows) and type (columns), optionally only the last N months"""
+        def compute():
+            totals = self.counts.sum(axis=0)
+            frame = pd.DataFrame(totals, index=pd.Index(self.months, name='Month'),
+                                 columns=[type_info(code).badge_label for code in self.types])
+            return frame.loc[:, frame.sum(axis=0) > 0]
+        frame = self._cached(('monthly_by_type',), compute)
+        return (frame.tail(last) if last else frame).copy()
+
+    def trend(self, last: Optional[int] = None) -> pd.DataFrame:
+        """Monthly totals with month-over-month change and percentage change"""
+        def compute():
+            totals = pd.Series(self.counts.sum(axis=(0, 2)), index=pd.Index(self.months, name='Month'), name='Total')
+            frame = totals.to_frame()
+            frame['Change'] = totals.diff().fillna(0).astype(int)
+            frame['Change %'] = (totals.pct_change().replace([np.inf, -np.inf], np.nan) * 100).round(1)
+            return frame
+        frame = self._cached(('trend',), compute)
+        return (frame.tail(last) if last else frame).copy()
+
+    def streaks(self, through: Optional[str] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """Per star: consecutive active months ending at `through` (default: current month) and the longest run"""
+        through = through or datetime.now().strftime('%Y-%m')
+
+        def compute():
+            active = self.counts.sum(axis=2) > 0
+            end = month_key(through) - self.first_key if self.first_key is not None else -1
+            records = []
+            for position, row in enumerate(active):
+                longest = run = 0
+                for flag in row:
+                    run = run + 1 if flag else 0
+                    longest = max(longest, run)
+                current = 0
+                # A streak still counts if this month has nothing yet but the previous one does
+                index = end
+                if index >= len(row) or (index >= 0 and not row[index]):
+                    index -= 1
+                while 0 <= index < len(row) and row[index]:
+                    current += 1
+                    index -= 1
+                if longest:
+                    records.append((self.names[position], current, longest))
+            frame = pd.DataFrame(records, columns=['Star', 'Current streak', 'Longest streak'])
+            return frame.sort_values(['Current streak', 'Longest streak'], ascending=False, kind='stable').reset_index(drop=True)
+        frame = self._cached(('streaks', through), compute)
+        return (frame.head(limit) if limit else frame).copy()
+
+
+def get_cube(stars: Sequence[Dict]) -> ContributionCube:
+    """Cube for a roster snapshot, rebuilt only when load_stars() returns a new snapshot"""
+    return snapshot_derived(stars, 'analytics_cube', ContributionCube)
@@ -0,0 +1,323 @@
+"""
+Read-only JSON API for the Qdrant Stars Dashboard
+
+A dependency-free ASGI app for tools that need the roster without scraping
+the Streamlit page or parsing data/stars.json themselves:
+
+    pip install uvicorn                # optional: not in requirements.txt
+    uvicorn api:app --port 8502        # or any other ASGI server
+
+    GET /stars                  ?q=&page=&per_page=   star summaries (search like the dashboard)
+    GET /stars/<id or slug>                           one star with its contributions
+    GET /contributions          ?month=YYYY-MM | ?from=YYYY-MM&to=YYYY-MM, &type=&page=&per_page=
+    GET /contributions/current  ?page=&per_page=      this month's contributions
+    GET /aggregates                                   totals by type and month
+
+Every response body is rendered once per roster snapshot (load_stars() hands
+out a new one only when the data changes) and served with a strong ETag
+(hash of the body) and Cache-Control, so polling clients get a bodiless 304
+until something actually changes. Responses are built in a worker thread
+(loading the roster reads files under a lock), never on the event loop.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+from contribution_stats import get_contribution_stats
+from contribution_types import CONTRIBUTION_TYPES, contribution_type, resolve_type, type_info
+from month_index import current_month_key, get_month_index, month_key, month_range, previous_month
+from search import search_stars
+from storage import snapshot_derived
+from utils import get_star_by_id, load_stars
+
+# Seconds clients may reuse a response before revalidating it
+API_MAX_AGE = int(os.getenv("STARS_API_MAX_AGE", "30"))
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Rendered responses kept per roster snapshot
+RESPONSE_CACHE_SIZE = 1024
+
+
+class ApiError(Exception):
+    """Turned into a JSON error response"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Response:
+    """Serialized JSON body with its strong ETag"""
+
+    __slots__ = ('status', 'body', 'etag')
+
+    def __init__(self, payload: Dict, status: int = 200):
+        self.status = status
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=16).hexdigest()}"'
+
+
+class ResponseCache:
+    """LRU of rendered responses for one roster snapshot"""
+
+    def __init__(self, stars: Sequence[Dict], max_entries: int = RESPONSE_CACHE_SIZE):
+        self.stars = stars
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Response]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, build) -> Response:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                return response
+        response = build()
+        with self._lock:
+            self._entries[key] = response
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return response
+
+
+def get_response_cache(stars: Sequence[Dict]) -> ResponseCache:
+    """Response cache of a roster snapshot, replaced when load_stars() returns a new snapshot"""
+    return snapshot_derived(stars, 'api_responses', ResponseCache)
+
+
+def _int_param(params: Dict[str, str], name: str, default: int, minimum: int, maximum: Optional[int] = None) -> int:
+    value = params.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be an integer")
+    if number < minimum or (maximum is not None and number > maximum):
+        limit = f"between {minimum} and {maximum}" if maximum is not None else f"at least {minimum}"
+        raise ApiError(400, f"'{name}' must be {limit}")
+    return number
+
+
+def paginate(items: Sequence, params: Dict[str, str]) -> Dict:
+    """Page envelope: items, page, per_page, total, pages"""
+    per_page = _int_param(params, 'per_page', DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+    page = _int_param(params, 'page', 1, 1)
+    total = len(items)
+    start = (page - 1) * per_page
+    return {
+        'items': list(items[start:start + per_page]),
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page,
+    }
+
+
+def type_counts(counts: Dict) -> Dict[str, int]:
+    """Type code -> count as canonical type name -> count, in display order"""
+    return {info.name: counts[info.code] for info in CONTRIBUTION_TYPES if counts.get(info.code)}
+
+
+def star_summary(star: Dict) -> Dict:
+    stats = get_contribution_stats(star)
+    return {
+        'id': star.get('id', ''),
+        'name': star.get('name', ''),
+        'role': star.get('role', ''),
+        'bio': star.get('bio', ''),
+        'contribution_count': stats.total,
+        'by_type': type_counts(stats.by_type),
+    }
+
+
+def contribution_entry(star: Dict, contrib: Dict) -> Dict:
+    """A contribution with its canonical type and the star it belongs to"""
+    return {
+        **contrib,
+        'type': type_info(contribution_type(contrib)).name,
+        'star': {'id': star.get('id', ''), 'name': star.get('name', '')},
+    }
+
+
+def list_stars(stars: Sequence[Dict], params: Dict[str, str]) -> Dict:
+    query = params.get('q', '').strip()
+    matches = search_stars(stars, query) if query else stars
+    page = paginate(matches, params)
+    page['items'] = [star_summary(star) for star in page['items']]
+    return page
+
+
+def get_star(stars: Sequence[Dict], key: str) -> Dict:
+    # By id or slug, which never contain '/' (names may); full names still work too
+    star = get_star_by_id(stars, key)
+    if star is None:
+        raise ApiError(404, f"No star with id or slug {key!r}")
+    return {
+        **star_summary(star),
+        'contributions': [contribution_entry(star, contrib) for contrib in star.get('contributions', [])],
+    }
+
+
+def _month_param(params: Dict[str, str], name: str) -> Optional[str]:
+    value = params.get(name)
+    if value and month_key(value) is None:
+        raise ApiError(400, f"'{name}' must be a YYYY-MM month")
+    return value or None
+
+
+def list_contributions(stars: Sequence[Dict], params: Dict[str, str], current: bool = False) -> Dict:
+    if current:
+        key = current_month_key()
+        requested = (key, key)
+    elif params.get('month'):
+        key = month_key(_month_param(params, 'month'))
+        requested = (key, key)
+    else:
+        requested = month_range(_month_param(params, 'from'), _month_param(params, 'to'))
+
+    index = get_month_index(stars)
+    # Most recent month first, like the detail page
+    entries = index.entries(requested)[::-1]
+    if requested == (None, None):
+        # No range at all also lists contributions without a (valid) month, last
+        entries += index.undated
+
+    type_name = params.get('type', '').strip()
+    if type_name:
+        type_code = resolve_type(type_name)
+        entries = [entry for entry in entries if contribution_type(entry.contribution) == type_code]
+
+    page = paginate(entries, params)
+    page['items'] = [contribution_entry(entry.star, entry.contribution) for entry in page['items']]
+    return page
+
+
+def aggregates(stars: Sequence[Dict]) -> Dict:
+    index = get_month_index(stars)
+    by_type: Dict = {}
+    for star in stars:
+        for code, count in get_contribution_stats(star).by_type.items():
+            by_type[code] = by_type.get(code, 0) + count
+    current = current_month_key()
+    return {
+        'stars': len(stars),
+        'contributions': sum(get_contribution_stats(star).total for star in stars),
+        'current_month': index.count((current, current)),
+        'previous_month': index.count(previous_month()),
+        'active_stars_current_month': len(index.star_positions((current, current))),
+        'by_type': type_counts(by_type),
+        'by_month': {month: index.count((key, key)) for month, key in zip(index.months(), index.keys)},
+        'undated': len(index.undated),
+    }
+
+
+# Query parameters each route reads (others are ignored, so they don't fragment the cache)
+ROUTE_PARAMS = {
+    'stars': ('q', 'page', 'per_page'),
+    'contributions': ('month', 'from', 'to', 'type', 'page', 'per_page'),
+    'current': ('page', 'per_page'),
+}
+
+
+def route(path: str) -> Tuple[str, Optional[str]]:
+    """(route name, star key) for a request path"""
+    parts = [part for part in path.split('/') if part]
+    if parts == ['stars']:
+        return 'stars', None
+    if len(parts) == 2 and parts[0] == 'stars':
+        return 'star', parts[1]
+    if parts == ['contributions']:
+        return 'contributions', None
+    if parts == ['contributions', 'current']:
+        return 'current', None
+    if parts == ['aggregates']:
+        return 'aggregates', None
+    raise ApiError(404, f"Unknown path {path!r}")
+
+
+def render(stars: Sequence[Dict], name: str, star_key: Optional[str], params: Dict[str, str]) -> Response:
+    if name == 'stars':
+        return Response(list_stars(stars, params))
+    if name == 'star':
+        return Response(get_star(stars, star_key))
+    if name == 'contributions':
+        return Response(list_contributions(stars, params))
+    if name == 'current':
+        return Response(list_contributions(stars, params, current=True))
+    return Response(aggregates(stars))
+
+
+def handle(method: str, path: str, query_string: str) -> Response:
+    """Cached response for a GET, or an error response"""
+    try:
+        return _cached_response(method, path, query_string)
+    except ApiError as error:
+        return Response({'error': str(error)}, status=error.status)
+
+
+def _cached_response(method: str, path: str, query_string: str) -> Response:
+    if method not in ('GET', 'HEAD'):
+        raise ApiError(405, "Read-only API: only GET and HEAD are allowed")
+    name, star_key = route(path)
+    params = dict(parse_qsl(query_string))
+    params = {key: params[key] for key in ROUTE_PARAMS.get(name, ()) if key in params}
+    stars = load_stars()
+    cache = get_response_cache(stars)
+    # Responses about "this month" change with the calendar, not only with the data
+    month = current_month_key() if name in ('current', 'aggregates') else None
+    key = (name, star_key, tuple(sorted(params.items())), month)
+    return cache.get_or_build(key, lambda: render(stars, name, star_key, params))
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)"""
+    if if_none_match.strip() == '*':
+        return True
+    return any(candidate.strip().removeprefix('W/') == etag for candidate in if_none_match.split(','))
+
+
+def response_headers(response: Response, allow: bool = False) -> List[Tuple[bytes, bytes]]:
+    headers = [
+        (b'content-type', b'application/json; charset=utf-8'),
+        (b'etag', response.etag.encode('ascii')),
+        (b'cache-control', f'public, max-age={API_MAX_AGE}'.encode('ascii') if response.status == 200 else b'no-store'),
+    ]
+    if allow:
+        headers.append((b'allow', b'GET, HEAD'))
+    return headers
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    method = scope['method']
+    response = await asyncio.to_thread(
+        handle, method, scope['path'], scope.get('query_string', b'').decode('latin-1'))
+
+    headers = response_headers(response, allow=response.status == 405)
+    request_headers = dict(scope.get('headers', ()))
+    if_none_match = request_headers.get(b'if-none-match')
+    if response.status == 200 and if_none_match and etag_matches(if_none_match.decode('latin-1'), response.etag):
+        await send({'type': 'http.response.start', 'status': 304, 'headers': headers[1:]})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    headers.append((b'content-length', str(len(response.body)).encode('ascii')))
+    await send({'type': 'http.response.start', 'status': response.status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': b'' if method == 'HEAD' else response.body})
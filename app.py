@@ -3,15 +3,22 @@ Qdrant Stars Dashboard - Streamlit App
 A professional dashboard to showcase Qdrant stars' contributions
 """
 import streamlit as st
-import json
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
+from urllib.parse import quote, unquote
 import utils
+from contribution_stats import get_contribution_stats
+from fragments import DASHBOARD_CSS, profile_card_html, star_header_html, tab_blocks, tile_html, youtube_embed_html
+from images import find_star_image, thumbnail_src
+from instrumentation import METRICS_ENABLED, RerunTrace, json_snapshot, metrics, prometheus_text, rerun, timed, timer
+from month_index import current_quarter, get_month_index, last_months, month_label, previous_month
+from search import find_star_fuzzy, fuzzy_find_stars, search_stars
+from contribution_types import CONTRIBUTION_TYPES, TYPE_NAMES, resolve_type, type_info
 from utils import (
     load_stars, save_stars, add_or_update_star, delete_star,
     get_star_by_id, get_star_by_name, get_current_month_contributions,
-    validate_url, extract_youtube_id, verify_admin_credentials,
-    extract_url_metadata
+    validate_month, validate_url, verify_admin_credentials,
+    extract_url_metadata, star_version, StaleStarError
 )
 
 # Page configuration
@@ -22,294 +29,29 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Custom CSS for clean, professional styling
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .star-card {
-        background: white;
-        border-radius: 12px;
-        padding: 2rem;
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
-        margin-bottom: 2rem;
-        border: 1px solid #e8e8e8;
-    }
-    .star-name {
-        font-size: 1.75rem;
-        font-weight: 600;
-        color: #1a1a1a;
-        margin-bottom: 0.5rem;
-    }
-    .star-role {
-        color: #666;
-        font-size: 0.95rem;
-        margin-bottom: 1rem;
-    }
-    .contribution-item {
-        background: #f8f9fa;
-        padding: 1rem;
-        border-radius: 8px;
-        margin-bottom: 0.75rem;
-        border-left: 3px solid #667eea;
-    }
-    .contribution-type {
-        font-weight: 600;
-        color: #667eea;
-        font-size: 0.8rem;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    .contribution-title {
-        font-weight: 500;
-        color: #333;
-        margin-top: 0.5rem;
-        font-size: 0.95rem;
-    }
-    .month-badge {
-        background: #667eea;
-        color: white;
-        padding: 0.4rem 1rem;
-        border-radius: 20px;
-        font-size: 0.8rem;
-        display: inline-block;
-        margin-bottom: 1rem;
-        font-weight: 500;
-    }
-    .stat-box {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 12px;
-        text-align: center;
-    }
-    .stat-number {
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-    }
-    .stat-label {
-        font-size: 0.9rem;
-        opacity: 0.95;
-    }
-    .login-container {
-        max-width: 400px;
-        margin: 0 auto;
-        padding: 2rem;
-        background: white;
-        border-radius: 12px;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
-    }
-    .bio-text {
-        color: #555;
-        font-size: 0.95rem;
-        line-height: 1.6;
-        margin-top: 0.5rem;
-    }
-    .profile-card-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
-        gap: 1.5rem;
-        margin-top: 2rem;
-    }
-    .profile-card-item {
-        background: white;
-        border-radius: 12px;
-        padding: 1.5rem;
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
-        border: 1px solid #e8e8e8;
-        cursor: pointer;
-        transition: transform 0.2s, box-shadow 0.2s;
-    }
-    .profile-card-item:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
-    }
-    .profile-card-name {
-        font-size: 1.25rem;
-        font-weight: 600;
-        color: #1a1a1a;
-        margin-bottom: 0.5rem;
-    }
-    .profile-card-role {
-        color: #666;
-        font-size: 0.9rem;
-        margin-bottom: 0.75rem;
-    }
-    .profile-card-stats {
-        display: flex;
-        gap: 1rem;
-        margin-top: 1rem;
-        padding-top: 1rem;
-        border-top: 1px solid #e8e8e8;
-    }
-    .profile-stat {
-        flex: 1;
-        text-align: center;
-    }
-    .profile-stat-number {
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: #667eea;
-    }
-    .profile-stat-label {
-        font-size: 0.75rem;
-        color: #666;
-        margin-top: 0.25rem;
-    }
-    .star-tile {
-        background: white;
-        border-radius: 16px;
-        padding: 0;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
-        border: 1px solid #e8e8e8;
-        cursor: pointer;
-        transition: transform 0.3s, box-shadow 0.3s;
-        overflow: hidden;
-        height: 500px;
-        display: flex;
-        flex-direction: column;
-        margin-bottom: 1.5rem;
-    }
-    .star-tile:hover {
-        transform: translateY(-8px);
-        box-shadow: 0 8px 20px rgba(0, 0, 0, 0.15);
-    }
-    .star-tile-container {
-        position: relative;
-        width: 100%;
-        margin-bottom: 1.5rem;
-        height: 500px;
-    }
-    .star-tile-wrapper {
-        position: relative;
-        width: 100%;
-        z-index: 1;
-    }
-    /* Make button overlay the card - target buttons that are siblings of star-tile-container */
-    div:has(.star-tile-container) ~ div[data-testid="stButton"],
-    div[data-testid="column"]:has(.star-tile-container) ~ div[data-testid="stButton"] {
-        position: absolute !important;
-        top: 0 !important;
-        left: 0 !important;
-        width: 100% !important;
-        height: 500px !important;
-        z-index: 10 !important;
-        margin: 0 !important;
-        padding: 0 !important;
-        margin-top: -500px !important;
-    }
-    div:has(.star-tile-container) ~ div[data-testid="stButton"] > button,
-    div[data-testid="column"]:has(.star-tile-container) ~ div[data-testid="stButton"] > button {
-        width: 100% !important;
-        height: 500px !important;
-        background: transparent !important;
-        border: none !important;
-        padding: 0 !important;
-        margin: 0 !important;
-        cursor: pointer !important;
-        box-shadow: none !important;
-        min-height: 500px !important;
-        color: black !important;
-    }
-    div:has(.star-tile-container) ~ div[data-testid="stButton"] > button:hover,
-    div[data-testid="column"]:has(.star-tile-container) ~ div[data-testid="stButton"] > button:hover {
-        background: transparent !important;
-        border: none !important;
-        box-shadow: none !important;
-        color: black !important;
-    }
-    div:has(.star-tile-container) ~ div[data-testid="stButton"] > button > p {
-        color: black !important;
-    }
-    .star-tile-image {
-        width: 100%;
-        height: 250px;
-        object-fit: cover;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        flex-shrink: 0;
-    }
-    .star-tile-content {
-        padding: 1.5rem;
-        flex: 1;
-        display: flex;
-        flex-direction: column;
-        min-height: 0;
-    }
-    .star-tile-name {
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: #1a1a1a;
-        margin-bottom: 0.5rem;
-        line-height: 1.3;
-    }
-    .star-tile-role {
-        color: #667eea;
-        font-size: 0.95rem;
-        font-weight: 500;
-        margin-bottom: 1rem;
-        flex-shrink: 0;
-    }
-    .star-tile-bio {
-        color: #666;
-        font-size: 0.9rem;
-        line-height: 1.6;
-        margin-bottom: 1rem;
-        flex: 1;
-        display: -webkit-box;
-        -webkit-line-clamp: 3;
-        -webkit-box-orient: vertical;
-        overflow: hidden;
-        min-height: 0;
-    }
-    .star-tile-stats {
-        display: flex;
-        gap: 0.5rem;
-        flex-wrap: wrap;
-        margin-top: auto;
-        padding-top: 1rem;
-        border-top: 1px solid #e8e8e8;
-        flex-shrink: 0;
-    }
-    .star-tile-stat {
-        background: #f8f9fa;
-        padding: 0.4rem 0.8rem;
-        border-radius: 20px;
-        font-size: 0.75rem;
-        color: #667eea;
-        font-weight: 600;
-    }
-    </style>
+# Custom CSS for clean, professional styling (shared with the static export)
+st.markdown(f"""
+    <style>{DASHBOARD_CSS}    </style>
 """, unsafe_allow_html=True)
 
-def get_star_image_path(star_name: str):
-    """Get the image path for a star based on their name"""
-    from pathlib import Path
-    
-    # Try both folder names (stars-img and stars-image)
-    for folder_name in ["stars-img", "stars-image"]:
-        # Convert name to filename format (lowercase, replace spaces with hyphens)
-        filename = star_name.lower().replace(' ', '-').replace('_', '-')
-        image_path = Path(folder_name) / f"{filename}.jpg"
-        
-        # Check if file exists
-        if image_path.exists():
-            return str(image_path)
-        
-        # Try alternative formats
-        alt_path = Path(folder_name) / f"{star_name.lower().replace(' ', '_')}.jpg"
-        if alt_path.exists():
-            return str(alt_path)
-    
-    # Return None if no image found
-    return None
+# Shown when an optimistic version check fails on save
+STALE_STAR_MESSAGE = "⚠️ This star was changed by another admin while you were editing. The latest data is loaded now — please review and try again."
+
+# Star grid page sizes (multiples of the 3 grid columns)
+GRID_PAGE_SIZES = [12, 24, 48, 96]
+DEFAULT_GRID_PAGE_SIZE = 24
+
+# "Active in" filter: label -> month-key range (None = no filter), evaluated per run
+ACTIVITY_PERIODS = {
+    "Any time": lambda: None,
+    "This month": lambda: last_months(1),
+    "Previous month": previous_month,
+    "Last 3 months": lambda: last_months(3),
+    "Last 6 months": lambda: last_months(6),
+    "Last 12 months": lambda: last_months(12),
+    "This quarter": current_quarter,
+    "Previous quarter": lambda: current_quarter(offset=-1),
+}
 
 def init_session_state():
     """Initialize session state variables"""
@@ -323,74 +65,93 @@ def init_session_state():
         st.session_state.selected_star_id = None
     if 'view_mode' not in st.session_state:
         st.session_state.view_mode = 'grid'  # 'grid' or 'detail'
+    if 'grid_page' not in st.session_state:
+        st.session_state.grid_page = 1
+    if 'grid_filter' not in st.session_state:
+        st.session_state.grid_filter = None  # (search term, period, page size) the page number belongs to
+
+def set_grid_page(page: int):
+    """Button callback: show another page of the star grid"""
+    st.session_state.grid_page = page
+
+def paginate(items: List, page: int, page_size: int):
+    """(visible slice, clamped 1-based page, page count) of a list"""
+    page_count = max(1, -(-len(items) // page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return items[start:start + page_size], page, page_count
+
+def render_pagination(page: int, page_count: int):
+    """Previous / page indicator / next controls below the star grid"""
+    if page_count <= 1:
+        return
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("◀ Previous", key="grid_prev", use_container_width=True, disabled=page <= 1,
+                  on_click=set_grid_page, args=(page - 1,))
+    with col_page:
+        st.markdown(f'<div style="text-align: center; padding-top: 0.5rem;">Page {page} of {page_count}</div>',
+                    unsafe_allow_html=True)
+    with col_next:
+        st.button("Next ▶", key="grid_next", use_container_width=True, disabled=page >= page_count,
+                  on_click=set_grid_page, args=(page + 1,))
+
+def render_insights(stars: List[Dict]):
+    """Leaderboard, monthly chart and streaks from the cached analytics cube"""
+    # pandas/NumPy are only imported when insights are opened
+    from analytics import get_cube
+    
+    cube = get_cube(stars)
+    if not cube.months:
+        st.info("No dated contributions yet.")
+        return
+    
+    this_month = datetime.now().strftime('%Y-%m')
+    periods = {
+        label: tuple(month_label(key) if key is not None else None for key in month_range)
+        for label, month_range in (
+            ("Previous month", previous_month()),
+            ("This month", last_months(1)),
+            ("Last 3 months", last_months(3)),
+            ("Last 12 months", last_months(12)),
+            ("All time", (None, None)),
+        )
+    }
+    
+    col_board, col_chart = st.columns([2, 3])
+    with col_board:
+        period = st.selectbox("Leaderboard period", list(periods), key="insights_period")
+        leaderboard = cube.leaderboard(*periods[period], limit=10)
+        if leaderboard.empty:
+            st.caption("No contributions in this period.")
+        else:
+            st.dataframe(leaderboard, hide_index=True, use_container_width=True)
+    with col_chart:
+        st.markdown("**Contributions per month**")
+        st.bar_chart(cube.monthly_by_type(last=12))
+        trend = cube.trend(last=2)
+        if len(trend) == 2:
+            st.caption(f"{trend.index[-1]}: {int(trend['Total'].iloc[-1])} contributions "
+                       f"({int(trend['Change'].iloc[-1]):+d} vs {trend.index[-2]})")
+    
+    streaks = cube.streaks(through=this_month, limit=5)
+    if not streaks.empty:
+        st.markdown("**🔥 Monthly streaks**")
+        st.dataframe(streaks, hide_index=True, use_container_width=True)
 
 def render_youtube_preview(url: str):
     """Render YouTube video preview"""
-    video_id = extract_youtube_id(url)
-    if video_id:
-        st.markdown(f"""
-        <div style="margin-top: 1rem;">
-            <iframe width="100%" height="400" 
-                    src="https://www.youtube.com/embed/{video_id}" 
-                    frameborder="0" 
-                    allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" 
-                    allowfullscreen>
-            </iframe>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"[Watch on YouTube]({url})")
+    st.markdown(youtube_embed_html(url), unsafe_allow_html=True)
 
 def render_profile_card_compact(star: Dict):
     """Render a compact profile card for grid view"""
-    name = star.get('name', 'Unknown')
-    role = star.get('role', '')
-    contributions = star.get('contributions', [])
-    
-    # Count contributions by type
-    youtube_count = len([c for c in contributions if c.get('type', '').lower() == 'youtube'])
-    medium_count = len([c for c in contributions if c.get('type', '').lower() == 'medium'])
-    linkedin_count = len([c for c in contributions if c.get('type', '').lower() == 'linkedin'])
-    substack_count = len([c for c in contributions if c.get('type', '').lower() == 'substack'])
-    meetups_count = len([c for c in contributions if c.get('type', '').lower() in ['meetups/events', 'meetups', 'events']])
-    opensource_count = len([c for c in contributions if c.get('type', '').lower() in ['open source', 'opensource']])
-    other_count = len(contributions) - youtube_count - medium_count - linkedin_count - substack_count - meetups_count - opensource_count
-    
     # Use name as identifier (URL-safe)
-    import urllib.parse
-    star_name_encoded = urllib.parse.quote(name)
-    
-    # Build stats HTML with all contribution types
-    stats_html = ""
-    if youtube_count > 0:
-        stats_html += f'<div class="profile-stat"><div class="profile-stat-number">{youtube_count}</div><div class="profile-stat-label">YouTube</div></div>'
-    if medium_count > 0:
-        stats_html += f'<div class="profile-stat"><div class="profile-stat-number">{medium_count}</div><div class="profile-stat-label">Medium</div></div>'
-    if linkedin_count > 0:
-        stats_html += f'<div class="profile-stat"><div class="profile-stat-number">{linkedin_count}</div><div class="profile-stat-label">LinkedIn</div></div>'
-    if substack_count > 0:
-        stats_html += f'<div class="profile-stat"><div class="profile-stat-number">{substack_count}</div><div class="profile-stat-label">Substack</div></div>'
-    if meetups_count > 0:
-        stats_html += f'<div class="profile-stat"><div class="profile-stat-number">{meetups_count}</div><div class="profile-stat-label">Meetups</div></div>'
-    if opensource_count > 0:
-        stats_html += f'<div class="profile-stat"><div class="profile-stat-number">{opensource_count}</div><div class="profile-stat-label">Open Source</div></div>'
-    if other_count > 0:
-        stats_html += f'<div class="profile-stat"><div class="profile-stat-number">{other_count}</div><div class="profile-stat-label">Other</div></div>'
-    
-    st.markdown(f"""
-    <div class="profile-card-item" onclick="window.location.href='?star_name={star_name_encoded}'">
-        <div class="profile-card-name">{name}</div>
-        <div class="profile-card-role">{role}</div>
-        <div class="profile-card-stats">
-            {stats_html if stats_html else '<div class="profile-stat"><div class="profile-stat-number">0</div><div class="profile-stat-label">No contributions</div></div>'}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    star_name_encoded = quote(star.get('name', 'Unknown'))
+    st.markdown(profile_card_html(star, f"?star_name={star_name_encoded}"), unsafe_allow_html=True)
 
+@timed('render_star_detail')
 def render_star_detail(star: Dict):
     """Render detailed star profile with categorized contributions"""
-    name = star.get('name', 'Unknown')
-    role = star.get('role', '')
     bio = star.get('bio', '')
     contributions = star.get('contributions', [])
     
@@ -400,12 +161,7 @@ def render_star_detail(star: Dict):
         st.session_state.view_mode = 'grid'
         st.rerun()
     
-    st.markdown(f"""
-    <div class="star-card">
-        <div class="star-name">{name}</div>
-        <div class="star-role">{role}</div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(star_header_html(star), unsafe_allow_html=True)
     
     if bio:
         st.markdown(f'<div class="bio-text">{bio}</div>', unsafe_allow_html=True)
@@ -414,114 +170,26 @@ def render_star_detail(star: Dict):
         st.info("No contributions yet.")
         return
     
-    # Categorize contributions
-    youtube_contribs = [c for c in contributions if c.get('type', '').lower() == 'youtube']
-    medium_contribs = [c for c in contributions if c.get('type', '').lower() == 'medium']
-    linkedin_contribs = [c for c in contributions if c.get('type', '').lower() == 'linkedin']
-    substack_contribs = [c for c in contributions if c.get('type', '').lower() == 'substack']
-    meetups_contribs = [c for c in contributions if c.get('type', '').lower() in ['meetups/events', 'meetups', 'events']]
-    opensource_contribs = [c for c in contributions if c.get('type', '').lower() in ['open source', 'opensource']]
-    other_contribs = [c for c in contributions if c.get('type', '').lower() not in [
-        'youtube', 'medium', 'linkedin', 'substack', 'meetups/events', 'meetups', 'events', 'open source', 'opensource'
-    ]]
+    # Contributions grouped by type and month (precomputed per star)
+    stats = get_contribution_stats(star)
     
     # Create tabs for different contribution types
-    tabs = []
-    tab_labels = []
-    
-    if youtube_contribs:
-        tabs.append(youtube_contribs)
-        tab_labels.append(f"🎥 YouTube ({len(youtube_contribs)})")
-    if medium_contribs:
-        tabs.append(medium_contribs)
-        tab_labels.append(f"📝 Medium ({len(medium_contribs)})")
-    if linkedin_contribs:
-        tabs.append(linkedin_contribs)
-        tab_labels.append(f"💼 LinkedIn ({len(linkedin_contribs)})")
-    if substack_contribs:
-        tabs.append(substack_contribs)
-        tab_labels.append(f"📰 Substack ({len(substack_contribs)})")
-    if meetups_contribs:
-        tabs.append(meetups_contribs)
-        tab_labels.append(f"🎪 Meetups/Events ({len(meetups_contribs)})")
-    if opensource_contribs:
-        tabs.append(opensource_contribs)
-        tab_labels.append(f"💻 Open Source ({len(opensource_contribs)})")
-    if other_contribs:
-        tabs.append(other_contribs)
-        tab_labels.append(f"📄 Other ({len(other_contribs)})")
-    
-    if tabs:
-        st_tabs = st.tabs(tab_labels)
+    type_tabs = [
+        (info.code, f"{info.tab_label} ({stats.count(info.code)})")
+        for info in CONTRIBUTION_TYPES
+        if stats.count(info.code)
+    ]
+    
+    if type_tabs:
+        st_tabs = st.tabs([tab_label for _, tab_label in type_tabs])
         
-        for idx, (contrib_list, tab_label) in enumerate(zip(tabs, tab_labels)):
+        for idx, (type_code, tab_label) in enumerate(type_tabs):
             with st_tabs[idx]:
-                # Group by month
-                monthly_contribs = {}
-                for contrib in contrib_list:
-                    month = contrib.get('month', 'Unknown')
-                    if month not in monthly_contribs:
-                        monthly_contribs[month] = []
-                    monthly_contribs[month].append(contrib)
-                
-                # Sort months (most recent first)
-                sorted_months = sorted(monthly_contribs.keys(), reverse=True)
-                
-                for month in sorted_months:
-                    st.markdown(f'<div class="month-badge">{month}</div>', unsafe_allow_html=True)
-                    
-                    for contrib in monthly_contribs[month]:
-                        contrib_type = contrib.get('type', '')
-                        title = contrib.get('title', '')
-                        url = contrib.get('url', '').strip()
-                        description = contrib.get('description', '').strip()
-                        contrib_type_lower = contrib_type.lower().strip()
-                        
-                        # Types that should not show descriptions
-                        no_description_types = ['linkedin', 'substack', 'open source', 'opensource', 'meetups/events', 'meetups', 'events']
-                        should_hide_description = contrib_type_lower in no_description_types
-                        
-                        # For LinkedIn, make title clickable (embedded link, no description)
-                        if contrib_type_lower == 'linkedin':
-                            st.markdown(f"""
-                            <div class="contribution-item">
-                                <div class="contribution-type">{contrib_type}</div>
-                                <a href="{url}" target="_blank" style="color: #667eea; text-decoration: none;">
-                                    <div class="contribution-title">{title}</div>
-                                </a>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        else:
-                            # For other types, show title and View button
-                            # Hide description for Open Source, Substack (like LinkedIn)
-                            # Never show description if type is in no_description_types
-                            if should_hide_description:
-                                # No description for these types
-                                st.markdown(f"""
-                                <div class="contribution-item">
-                                    <div class="contribution-type">{contrib_type}</div>
-                                    <div class="contribution-title">{title}</div>
-                                    <a href="{url}" target="_blank" style="color: #667eea; text-decoration: none; font-size: 0.9rem; margin-top: 0.5rem; display: inline-block;">View →</a>
-                                </div>
-                                """, unsafe_allow_html=True)
-                            else:
-                                # Show description for other types if available
-                                show_description = description and description.strip()
-                                st.markdown(f"""
-                                <div class="contribution-item">
-                                    <div class="contribution-type">{contrib_type}</div>
-                                    <div class="contribution-title">{title}</div>
-                                    {f'<p style="color: #666; font-size: 0.85rem; margin-top: 0.5rem;">{description}</p>' if show_description else ''}
-                                    <a href="{url}" target="_blank" style="color: #667eea; text-decoration: none; font-size: 0.9rem; margin-top: 0.5rem; display: inline-block;">View →</a>
-                                </div>
-                                """, unsafe_allow_html=True)
-                            
-                            # Show YouTube preview if it's a YouTube video
-                            if contrib_type.lower() == 'youtube':
-                                render_youtube_preview(url)
-                        
-                        st.markdown("<br>", unsafe_allow_html=True)
+                # Month badges, contributions and embeds, pre-rendered once per star version
+                for block in tab_blocks(star, type_code):
+                    st.markdown(block, unsafe_allow_html=True)
 
+@timed('dashboard_page')
 def dashboard_page():
     """Clean dashboard page for stars to view their progress"""
     st.markdown('<div class="main-header">⭐ Qdrant Stars Dashboard</div>', unsafe_allow_html=True)
@@ -533,11 +201,11 @@ def dashboard_page():
     selected_name = query_params.get("star_name", st.session_state.selected_star_id)
     
     if selected_name:
-        import urllib.parse
-        selected_name = urllib.parse.unquote(selected_name)
-        selected_star = get_star_by_name(stars, selected_name)
+        selected_name = unquote(selected_name)
+        # Exact name first; links with typos or different spacing resolve to the closest name
+        selected_star = get_star_by_name(stars, selected_name) or find_star_fuzzy(stars, selected_name)
         if selected_star:
-            st.session_state.selected_star_id = selected_name
+            st.session_state.selected_star_id = selected_star.get('name', selected_name)
             st.session_state.view_mode = 'detail'
             render_star_detail(selected_star)
             return
@@ -550,18 +218,11 @@ def dashboard_page():
         return
     
     # Statistics
-    total_contributions = sum(len(star.get('contributions', [])) for star in stars)
+    total_contributions = sum(get_contribution_stats(star).total for star in stars)
     
-    # Calculate previous month contributions
-    from datetime import datetime, timedelta
-    last_month = (datetime.now().replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
-    previous_month_contribs = sum(
-        len([
-            c for c in star.get('contributions', [])
-            if c.get('month', '').startswith(last_month)
-        ])
-        for star in stars
-    )
+    # Previous month contributions (counted from the cached month buckets)
+    month_index = get_month_index(stars)
+    previous_month_contribs = month_index.count(previous_month())
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -588,123 +249,80 @@ def dashboard_page():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    # Search
-    search_term = st.text_input("🔍 Search", "", placeholder="Search by name or role...")
+    if st.toggle("📈 Show insights", key="show_insights"):
+        render_insights(stars)
+    
+    # Search, activity period and page size
+    col_search, col_period, col_page_size = st.columns([3, 1, 1])
+    with col_search:
+        search_term = st.text_input("🔍 Search", "", placeholder="Search by name, role, bio or contribution...")
+    with col_period:
+        active_period = st.selectbox("Active in", list(ACTIVITY_PERIODS))
+    with col_page_size:
+        page_size = st.selectbox("Stars per page", GRID_PAGE_SIZES,
+                                 index=GRID_PAGE_SIZES.index(DEFAULT_GRID_PAGE_SIZE))
     
-    # Filter stars
+    # Filter stars (ranked, through the cached inverted index)
     filtered_stars = stars
-    if search_term:
-        filtered_stars = [
-            star for star in stars
-            if search_term.lower() in star.get('name', '').lower()
-            or search_term.lower() in star.get('role', '').lower()
-        ]
+    if search_term.strip():
+        filtered_stars = search_stars(stars, search_term)
+        if not filtered_stars:
+            # No word matches: fall back to names that look like the query (typos)
+            filtered_stars = [star for _, star in fuzzy_find_stars(stars, search_term, k=GRID_PAGE_SIZES[0])]
+            if filtered_stars:
+                st.caption(f"No exact matches for “{search_term}” — showing the closest names.")
+    
+    # Only stars with contributions in the selected period
+    month_range = ACTIVITY_PERIODS[active_period]()
+    if month_range is not None:
+        active = {id(star) for star in month_index.active_stars(month_range)}
+        filtered_stars = [star for star in filtered_stars if id(star) in active]
     
     if not filtered_stars:
-        st.info("No stars found matching your search.")
+        st.info("No stars found matching your search." if search_term.strip() else "No stars with contributions in this period.")
         return
     
+    # A new search, period or page size starts again from the first page
+    if st.session_state.grid_filter != (search_term, active_period, page_size):
+        st.session_state.grid_filter = (search_term, active_period, page_size)
+        st.session_state.grid_page = 1
+    
+    # Only the visible page of tiles (and their thumbnails) is rendered
+    page_stars, page, page_count = paginate(filtered_stars, st.session_state.grid_page, page_size)
+    first = (page - 1) * page_size
+    st.caption(f"Showing {first + 1}–{first + len(page_stars)} of {len(filtered_stars)} stars")
+    
+    # Thumbnails are linked as static files when the server exposes ./static
+    static_serving = st.get_option("server.enableStaticServing")
+    
     # Display stars in grid with image tiles
+    with timer('render_tiles'):
+        render_tiles(page_stars, first, static_serving)
+    
+    render_pagination(page, page_count)
+
+def render_tiles(page_stars: List[Dict], first: int, static_serving: bool):
+    """One page of star tiles with their View Profile buttons"""
     cols = st.columns(3)
-    for idx, star in enumerate(filtered_stars):
+    for idx, star in enumerate(page_stars, start=first):
         with cols[idx % 3]:
             name = star.get('name', 'Unknown')
-            role = star.get('role', '')
-            bio = star.get('bio', '')
-            contributions = star.get('contributions', [])
-            
-            # Get image path
-            image_path = get_star_image_path(name)
             
-            # Count contributions by type
-            youtube_count = len([c for c in contributions if c.get('type', '').lower() == 'youtube'])
-            medium_count = len([c for c in contributions if c.get('type', '').lower() == 'medium'])
-            linkedin_count = len([c for c in contributions if c.get('type', '').lower() == 'linkedin'])
-            substack_count = len([c for c in contributions if c.get('type', '').lower() == 'substack'])
-            meetups_count = len([c for c in contributions if c.get('type', '').lower() in ['meetups/events', 'meetups', 'events']])
-            opensource_count = len([c for c in contributions if c.get('type', '').lower() in ['open source', 'opensource']])
-            other_count = len(contributions) - youtube_count - medium_count - linkedin_count - substack_count - meetups_count - opensource_count
-            
-            # Build stats badges
-            stats_badges = []
-            if youtube_count > 0:
-                stats_badges.append(f'<span class="star-tile-stat">{youtube_count} YouTube</span>')
-            if medium_count > 0:
-                stats_badges.append(f'<span class="star-tile-stat">{medium_count} Medium</span>')
-            if linkedin_count > 0:
-                stats_badges.append(f'<span class="star-tile-stat">{linkedin_count} LinkedIn</span>')
-            if substack_count > 0:
-                stats_badges.append(f'<span class="star-tile-stat">{substack_count} Substack</span>')
-            if meetups_count > 0:
-                stats_badges.append(f'<span class="star-tile-stat">{meetups_count} Meetups</span>')
-            if opensource_count > 0:
-                stats_badges.append(f'<span class="star-tile-stat">{opensource_count} Open Source</span>')
-            if other_count > 0:
-                stats_badges.append(f'<span class="star-tile-stat">{other_count} Other</span>')
-            
-            # Build stats HTML
-            stats_html = ''.join(stats_badges) if stats_badges else '<span class="star-tile-stat">No contributions yet</span>'
-            
-            # Use Streamlit button for clickable cards
-            import urllib.parse
-            star_name_encoded = urllib.parse.quote(name)
+            # Get image (path plus the stat signature recorded by the image index)
+            image = find_star_image(name)
             
             # Button key for unique identification
             button_key = f"star_card_{idx}_{name.replace(' ', '_').replace('/', '_')}"
             
             # Create a container to hold both card and button
             with st.container():
-                # Create fully clickable tile with image
-                if image_path:
-                    # Get image as base64 or use direct path
-                    import base64
-                    from pathlib import Path
-                    
-                    # Read image and convert to base64 for embedding
-                    try:
-                        with open(image_path, "rb") as img_file:
-                            img_data = base64.b64encode(img_file.read()).decode()
-                            img_src = f"data:image/jpeg;base64,{img_data}"
-                    except:
-                        img_src = image_path
-                    
-                    # Create container with card
-                    st.markdown(f"""
-                    <div class="star-tile-container">
-                        <div class="star-tile-wrapper">
-                            <div class="star-tile">
-                                <img src="{img_src}" class="star-tile-image" alt="{name}" style="width: 100%; height: 250px; object-fit: cover; display: block;">
-                                <div class="star-tile-content">
-                                    <div class="star-tile-name">{name}</div>
-                                    <div class="star-tile-role">{role}</div>
-                                    {f'<div class="star-tile-bio">{bio}</div>' if bio else ''}
-                                    <div class="star-tile-stats">
-                                        {stats_html}
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    # No image - show gradient placeholder
-                    st.markdown(f"""
-                    <div class="star-tile-container">
-                        <div class="star-tile-wrapper">
-                            <div class="star-tile">
-                                <div class="star-tile-image"></div>
-                                <div class="star-tile-content">
-                                    <div class="star-tile-name">{name}</div>
-                                    <div class="star-tile-role">{role}</div>
-                                    {f'<div class="star-tile-bio">{bio}</div>' if bio else ''}
-                                    <div class="star-tile-stats">
-                                        {stats_html}
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                # Cached, resized thumbnail: a static URL if static serving is on, else a data URI
+                img_src = None
+                if image:
+                    img_src = thumbnail_src(image.path, static_serving=static_serving, signature=image.signature) or image.path
+                
+                # Tile HTML is cached per (star, data version, template version, image)
+                st.markdown(tile_html(star, img_src), unsafe_allow_html=True)
                 
                 # Button that will trigger navigation - positioned absolutely over the card
                 if st.button("View Profile", key=button_key, use_container_width=True, type="secondary"):
@@ -763,7 +381,7 @@ def admin_page():
     stars = load_stars()
     
     # Tabs for different admin functions
-    tab1, tab2, tab3 = st.tabs(["➕ Manage Stars", "📊 Manage Contributions", "🗑️ Delete Stars"])
+    tab1, tab2, tab3, tab4 = st.tabs(["➕ Manage Stars", "📊 Manage Contributions", "🗑️ Delete Stars", "⏱️ Performance"])
     
     with tab1:
         st.markdown("### Add or Edit Star")
@@ -813,9 +431,15 @@ def admin_page():
                         'bio': bio,
                         'contributions': editing_star.get('contributions', []) if editing_star else []
                     }
-                    add_or_update_star(star_data)
-                    st.success(f"Star {'updated' if editing_star else 'added'} successfully!")
-                    st.rerun()
+                    # Version-check edits of this star (a changed name saves as a new star, as before)
+                    same_star = editing_star and editing_star.get('name', '').casefold() == name.casefold()
+                    try:
+                        add_or_update_star(star_data, expected_version=star_version(editing_star) if same_star else None)
+                    except StaleStarError:
+                        st.error(STALE_STAR_MESSAGE)
+                    else:
+                        st.success(f"Star {'updated' if editing_star else 'added'} successfully!")
+                        st.rerun()
         
         if editing_star:
             with col2:
@@ -868,11 +492,18 @@ def admin_page():
                                 st.json(contrib)
                             with col2:
                                 if st.button(f"🗑️ Delete", key=f"del_contrib_{idx}"):
-                                    contributions.pop(idx)
-                                    selected_star['contributions'] = contributions
-                                    add_or_update_star(selected_star)
-                                    st.success("Contribution deleted!")
-                                    st.rerun()
+                                    # Loaded stars are shared read-only views, so save a modified copy
+                                    remaining = [c for i, c in enumerate(contributions) if i != idx]
+                                    try:
+                                        add_or_update_star(
+                                            {**selected_star, 'contributions': remaining},
+                                            expected_version=star_version(selected_star)
+                                        )
+                                    except StaleStarError:
+                                        st.error(STALE_STAR_MESSAGE)
+                                    else:
+                                        st.success("Contribution deleted!")
+                                        st.rerun()
                 
                 st.markdown("---")
                 st.markdown("#### Add New Contribution")
@@ -881,7 +512,7 @@ def admin_page():
                 with col1:
                     contrib_type = st.selectbox(
                         "Contribution Type",
-                        ["YouTube", "Medium", "LinkedIn", "Substack", "Meetups/Events", "Open Source", "Other"]
+                        TYPE_NAMES
                     )
                 with col2:
                     month = st.text_input(
@@ -900,12 +531,13 @@ def admin_page():
                 
                 # Extract metadata button (skip for LinkedIn, Substack, Meetups/Events, Open Source)
                 extract_key = "extract_metadata"
-                skip_extraction = contrib_type.lower() in ['linkedin', 'substack', 'meetups/events', 'meetups', 'events', 'open source', 'opensource']
+                contrib_type_info = type_info(resolve_type(contrib_type))
+                skip_extraction = not contrib_type_info.extract_metadata
                 
                 if not skip_extraction:
                     if st.button("🔍 Extract Metadata from URL", key=extract_key):
                         if url and url.strip():
-                            if validate_url(url, contrib_type.lower()):
+                            if validate_url(url, contrib_type):
                                 with st.spinner("Extracting metadata..."):
                                     metadata = extract_url_metadata(url, contrib_type)
                                     if metadata:
@@ -919,15 +551,8 @@ def admin_page():
                                 st.warning(f"URL may not be valid for {contrib_type}")
                         else:
                             st.error("Please enter a URL first")
-                else:
-                    if contrib_type.lower() == 'linkedin':
-                        st.info("💡 LinkedIn: Just enter a title and paste the link. No metadata extraction needed.")
-                    elif contrib_type.lower() == 'substack':
-                        st.info("💡 Substack: Just enter a title and paste the link. No metadata extraction needed.")
-                    elif contrib_type.lower() in ['meetups/events', 'meetups', 'events']:
-                        st.info("💡 Meetups/Events: Enter event name and link. No metadata extraction available.")
-                    elif contrib_type.lower() in ['open source', 'opensource']:
-                        st.info("💡 Open Source: Enter contribution title and link. No metadata extraction available.")
+                elif contrib_type_info.admin_hint:
+                    st.info(contrib_type_info.admin_hint)
                 
                 # Use extracted data if available, otherwise use empty string
                 title_value = st.session_state.extracted_title if st.session_state.extracted_title else ''
@@ -950,24 +575,31 @@ def admin_page():
                 if st.button("➕ Add Contribution"):
                     if not title or not url:
                         st.error("Title and URL are required!")
-                    elif not validate_url(url, contrib_type.lower()):
+                    elif not validate_url(url, contrib_type):
                         st.warning(f"URL may not be valid for {contrib_type}")
+                    elif not validate_month(month):
+                        st.error("Month must be a real YYYY-MM month (e.g., 2024-01)!")
                     else:
                         new_contrib = {
                             'type': contrib_type,
                             'title': title,
                             'url': url,
-                            'month': month,
+                            'month': month.strip(),
                             'description': description
                         }
-                        contributions.append(new_contrib)
-                        selected_star['contributions'] = contributions
-                        add_or_update_star(selected_star)
-                        # Clear extracted data after adding
-                        st.session_state.extracted_title = ''
-                        st.session_state.extracted_description = ''
-                        st.success("Contribution added successfully!")
-                        st.rerun()
+                        try:
+                            add_or_update_star(
+                                {**selected_star, 'contributions': [*contributions, new_contrib]},
+                                expected_version=star_version(selected_star)
+                            )
+                        except StaleStarError:
+                            st.error(STALE_STAR_MESSAGE)
+                        else:
+                            # Clear extracted data after adding
+                            st.session_state.extracted_title = ''
+                            st.session_state.extracted_description = ''
+                            st.success("Contribution added successfully!")
+                            st.rerun()
     
     with tab3:
         st.markdown("### Delete Stars")
@@ -1012,9 +644,72 @@ def admin_page():
                             if st.button(f"❌ Cancel", key=f"cancel_delete_{star_name.replace(' ', '_')}"):
                                 st.session_state[delete_key] = False
                                 st.rerun()
+    
+    with tab4:
+        render_performance()
+
+def render_performance():
+    """Per-rerun latency breakdowns, operation totals and cache counters of this server process"""
+    st.markdown("### Performance")
+    if not METRICS_ENABLED:
+        st.info("Instrumentation is turned off (STARS_METRICS=0).")
+        return
+    
+    snapshot = metrics.snapshot()
+    
+    st.markdown("#### Recent reruns")
+    st.caption("Latest first. Each operation column is the time (ms) that rerun spent in it; nested operations overlap.")
+    reruns = snapshot['reruns']
+    if reruns:
+        operations = sorted({name for trace in reruns for name in trace['operations']})
+        st.dataframe([
+            {
+                'Time': datetime.fromtimestamp(trace['started_at']).strftime('%H:%M:%S'),
+                'Page': trace['page'],
+                'Total ms': trace['total_ms'],
+                **{name: trace['operations'].get(name, {}).get('ms', 0.0) for name in operations},
+            }
+            for trace in reversed(reruns)
+        ], use_container_width=True, hide_index=True)
+    else:
+        st.info("No reruns recorded yet.")
+    
+    st.markdown("#### Operations since start")
+    timers = sorted(snapshot['timers'].items(), key=lambda item: item[1]['total_ms'], reverse=True)
+    st.dataframe([
+        {'Operation': name, 'Calls': stats['calls'], 'Avg ms': stats['avg_ms'],
+         'Max ms': stats['max_ms'], 'Total ms': stats['total_ms']}
+        for name, stats in timers
+    ], use_container_width=True, hide_index=True)
+    
+    st.markdown("#### Caches and extractors")
+    counters = [{'Source': 'events', 'Counter': name, 'Value': value} for name, value in sorted(snapshot['counters'].items())]
+    counters += [
+        {'Source': source, 'Counter': name, 'Value': value}
+        for source, values in sorted(snapshot['collectors'].items())
+        for name, value in sorted(values.items())
+    ]
+    if counters:
+        st.dataframe(counters, use_container_width=True, hide_index=True)
+    
+    col_prometheus, col_json, col_reset = st.columns(3)
+    with col_prometheus:
+        st.download_button("⬇️ Prometheus text", prometheus_text(), file_name="stars_metrics.prom", mime="text/plain")
+    with col_json:
+        st.download_button("⬇️ JSON", json_snapshot(), file_name="stars_metrics.json", mime="application/json")
+    with col_reset:
+        if st.button("🔄 Reset metrics"):
+            metrics.reset()
+            st.rerun()
 
 def main():
     """Main app function"""
+    # Everything timed during this rerun is attributed to it (admin Performance tab)
+    with rerun() as trace:
+        route_page(trace)
+
+def route_page(trace: Optional[RerunTrace]):
+    """Navigation and the selected page"""
     init_session_state()
     
     # Simple navigation without sidebar for cleaner look
@@ -1027,6 +722,9 @@ def main():
             label_visibility="collapsed"
         )
     
+    if trace is not None:
+        trace.page = page
+    
     # Route to appropriate page
     if page == "⭐ Dashboard":
         dashboard_page()
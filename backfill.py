@@ -0,0 +1,129 @@
+"""
+Bulk metadata backfill for the Qdrant Stars Dashboard
+
+Fills empty contribution descriptions (and titles) from the URL metadata
+extractors in one run, instead of clicking "Extract Metadata" per URL:
+
+    python backfill.py [--workers 16] [--per-host 4] [--all-types] [--overwrite] [--dry-run]
+
+URLs are fetched concurrently on a thread pool sharing utils' pooled HTTP
+client, with at most `--per-host` requests in flight per host. Each unique
+URL is fetched once, results go through the persistent metadata cache, and
+all updates are written back in a single save.
+"""
+import argparse
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple
+from urllib.parse import urlsplit
+
+import utils
+from contribution_types import contribution_type, type_info
+from metadata_cache import normalize_url
+
+
+def find_candidates(stars: List[Dict], all_types: bool = False, overwrite: bool = False) -> Dict[str, Tuple[str, str]]:
+    """Normalized URL -> (URL, type) for contributions that need metadata"""
+    candidates = {}
+    for star in stars:
+        for contrib in star.get('contributions', []):
+            url = contrib.get('url', '').strip()
+            if not url:
+                continue
+            # Types the admin form never extracts for (LinkedIn, Meetups, ...) are skipped by default
+            if not all_types and not type_info(contribution_type(contrib)).extract_metadata:
+                continue
+            if not overwrite and contrib.get('description', '').strip():
+                continue
+            candidates.setdefault(normalize_url(url), (url, contrib.get('type', '')))
+    return candidates
+
+
+def fetch_all(candidates: Dict[str, Tuple[str, str]], workers: int, per_host: int) -> Dict[str, Dict]:
+    """Extract metadata for every candidate concurrently; returns normalized URL -> metadata"""
+    host_limits = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+    host_limits_lock = threading.Lock()
+
+    def fetch(url: str, url_type: str) -> Dict:
+        host = urlsplit(url).netloc.lower()
+        with host_limits_lock:
+            limit = host_limits[host]
+        with limit:
+            return utils.extract_url_metadata(url, url_type)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fetch, url, url_type): key for key, (url, url_type) in candidates.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                metadata = future.result()
+            except Exception:
+                metadata = {}
+            if metadata:
+                results[futures[future]] = metadata
+            print(f"\r  fetched {done}/{len(futures)}", end='', flush=True)
+    if futures:
+        print()
+    return results
+
+
+def apply_metadata(stars: List[Dict], results: Dict[str, Dict], overwrite: bool = False) -> Tuple[List[Dict], int]:
+    """Roster with descriptions/titles filled from `results`; returns (stars, contributions updated)"""
+    updated_count = 0
+    updated_stars = []
+    for star in stars:
+        contributions = []
+        for contrib in star.get('contributions', []):
+            metadata = results.get(normalize_url(contrib.get('url', ''))) if contrib.get('url', '').strip() else None
+            if metadata:
+                changes = {}
+                # Same fallback as the admin form: YouTube only provides an author
+                description = metadata.get('description') or metadata.get('author', '')
+                if description and (overwrite or not contrib.get('description', '').strip()):
+                    changes['description'] = description
+                if metadata.get('title') and not contrib.get('title', '').strip():
+                    changes['title'] = metadata['title']
+                if changes:
+                    contrib = {**contrib, **changes}
+                    updated_count += 1
+            contributions.append(contrib)
+        updated_stars.append({**star, 'contributions': contributions})
+    return updated_stars, updated_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill empty contribution descriptions from URL metadata")
+    parser.add_argument('--workers', type=int, default=16, help="Concurrent fetches overall")
+    parser.add_argument('--per-host', type=int, default=4, help="Concurrent fetches per host")
+    parser.add_argument('--all-types', action='store_true', help="Also fetch LinkedIn, Substack, Meetups/Events and Open Source URLs")
+    parser.add_argument('--overwrite', action='store_true', help="Replace existing descriptions too")
+    parser.add_argument('--dry-run', action='store_true', help="Fetch and report, but do not save")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    candidates = find_candidates(utils.load_stars(), all_types=args.all_types, overwrite=args.overwrite)
+    print(f"Fetching metadata for {len(candidates)} URLs...")
+    results = fetch_all(candidates, workers=args.workers, per_host=args.per_host)
+
+    if args.dry_run:
+        _, count = apply_metadata(utils.load_stars(), results, overwrite=args.overwrite)
+    else:
+        count = 0
+
+        def update(stars: List[Dict]) -> List[Dict]:
+            nonlocal count
+            # Applied to the roster as it is now, in case it changed while fetching
+            updated, count = apply_metadata(stars, results, overwrite=args.overwrite)
+            return updated
+
+        if results:
+            utils.update_stars(update)
+
+    action = "Would update" if args.dry_run else "Updated"
+    print(f"{action} {count} contributions from {len(results)} URLs with metadata in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""
+Hot-path benchmarks for the data layer, dashboard rendering and extraction
+
+Generates synthetic rosters (10 to 10,000 stars, up to 1M contributions) and
+times load_stars, save_stars, add_or_update_star, get_star_by_name,
+get_current_month_contributions, the dashboard's stat boxes and first page
+of tiles, search, and the metadata extractors (the generic one and the
+registry dispatch to the YouTube, Medium, LinkedIn and Substack specs)
+against a local stub HTTP server. Every scale runs in a fresh interpreter inside its own temporary
+data directory, so caches and files never leak between runs:
+
+    python benchmarks/hotpaths.py [--scales 10,100,1000] [--repeat 5]
+    python benchmarks/hotpaths.py --save-baseline        # store results as the baseline
+    python benchmarks/hotpaths.py --threshold 0.2        # compare against it
+
+The fastest of the timed batches is compared with the stored baseline
+(benchmarks/baseline.json by default). Timings are machine-specific: the
+committed baseline is a reference from a development machine (its "_note"
+says so), so re-record it with --save-baseline on the machine that runs the
+comparison. Exits with status 1 if any case got slower than the baseline by
+more than the threshold. STARS_BACKEND=sqlite benchmarks the
+SQLite store instead of the JSON file.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# Roster size -> contributions per star (10,000 x 100 = 1M contributions)
+SCALES = {
+    10: 10,
+    100: 10,
+    1000: 20,
+    10000: 100,
+}
+DEFAULT_SCALES = (10, 100, 1000)
+BASELINE_NOTE = ("Machine-specific reference timings in milliseconds; "
+                 "re-record with --save-baseline on the machine that runs the comparison")
+# Differences below this many milliseconds are noise, never regressions
+MIN_REGRESSION_MS = 0.25
+TILES_PER_PAGE = 24
+MONTHS = 24
+
+_TYPES = ('YouTube', 'Medium', 'LinkedIn', 'Substack', 'Meetups/Events', 'Open Source', 'Other')
+_WORDS = ('vector', 'search', 'qdrant', 'embedding', 'rag', 'llm', 'retrieval', 'hybrid',
+          'quantization', 'index', 'semantic', 'pipeline', 'agents', 'multimodal', 'rust')
+
+
+def make_roster(stars: int, per_star: int, seed: int = 42) -> List[Dict]:
+    """Synthetic roster: contributions spread over the last MONTHS months, all types"""
+    rng = random.Random(seed)
+    today = time.localtime()
+    now_key = today.tm_year * 12 + today.tm_mon - 1
+    roster = []
+    for number in range(stars):
+        contributions = []
+        for item in range(per_star):
+            key = now_key - rng.randrange(MONTHS)
+            contrib_type = rng.choice(_TYPES)
+            title = ' '.join(rng.choice(_WORDS) for _ in range(5)).capitalize()
+            contributions.append({
+                'type': contrib_type,
+                'title': title,
+                'url': f"https://example.com/{number}/{item}",
+                'description': f"{title} with {' and '.join(rng.sample(_WORDS, 3))}",
+                'month': f"{key // 12:04d}-{key % 12 + 1:02d}",
+            })
+        roster.append({
+            'id': f"star_{number:05d}",
+            'name': f"Star {number:05d} {rng.choice(_WORDS).title()}",
+            'role': f"{rng.choice(_WORDS).title()} Engineer",
+            'bio': ' '.join(rng.choice(_WORDS) for _ in range(20)),
+            'contributions': contributions,
+        })
+    return roster
+
+
+def measure(fn: Callable, repeat: int, number: int = 1, setup: Optional[Callable] = None) -> Dict:
+    """Milliseconds per call of `fn` (median and min over `repeat` timed batches of `number` calls)"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        # Like timeit: a collection pass over a 1M-object roster would swamp the timing
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            timings.append((time.perf_counter() - started) * 1000 / number)
+        finally:
+            gc.enable()
+    return {'median_ms': round(statistics.median(timings), 4), 'min_ms': round(min(timings), 4)}
+
+
+# --- worker side (runs in the temporary data directory) -------------------------------------------
+
+def _touch(path: str):
+    """New mtime, so the store treats the file as changed and re-reads it"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def bench_data_layer(stars: int, repeat: int) -> Dict[str, Dict]:
+    import utils
+    from contribution_stats import get_contribution_stats
+    from fragments import tile_html
+    from month_index import MonthIndex, get_month_index, previous_month
+    from search import SearchIndex
+    from storage import thaw
+
+    roster = make_roster(stars, SCALES[stars])
+    utils.ensure_data_dir()
+    if utils.STARS_BACKEND == 'json':
+        with open(utils.STARS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(roster, f)
+        reload = lambda: _touch(str(utils.STARS_FILE))  # noqa: E731
+    else:
+        utils.save_stars(roster)
+        reload = None
+    slow = max(1, repeat // 2) if stars >= 10000 else repeat
+    results = {}
+
+    if reload is not None:
+        results['load_stars (cold)'] = measure(utils.load_stars, slow, setup=reload)
+    results['load_stars (warm)'] = measure(utils.load_stars, repeat, number=100)
+
+    snapshot = utils.load_stars()
+    rng = random.Random(7)
+    names = [star['name'] for star in rng.sample(list(snapshot), min(100, len(snapshot)))]
+    results['get_star_by_name'] = measure(
+        lambda: [utils.get_star_by_name(snapshot, name) for name in names], repeat, number=10)
+    per_lookup_us = results['get_star_by_name']['median_ms'] * 1000 / len(names)
+    results['get_star_by_name']['per_lookup_us'] = round(per_lookup_us, 3)
+
+    results['month index build'] = measure(lambda: MonthIndex(snapshot), slow)
+    results['get_current_month_contributions'] = measure(utils.get_current_month_contributions, repeat, number=10)
+
+    def dashboard_counts():
+        # The stat boxes and first page of tiles of dashboard_page()
+        total = sum(get_contribution_stats(star).total for star in snapshot)
+        previous = get_month_index(snapshot).count(previous_month())
+        tiles = [tile_html(star) for star in snapshot[:TILES_PER_PAGE]]
+        return total, previous, tiles
+
+    def fresh_snapshot():
+        nonlocal snapshot
+        if reload is not None:
+            reload()
+        snapshot = utils.load_stars()
+
+    if reload is not None:
+        results['dashboard counts + tiles (new snapshot)'] = measure(dashboard_counts, slow, setup=fresh_snapshot)
+    fresh_snapshot()
+    results['dashboard counts + tiles (warm)'] = measure(dashboard_counts, repeat, number=10)
+
+    # Every star must be tokenized again: a reused snapshot would serve the memoized per-star terms
+    if reload is not None:
+        results['search (index build + query)'] = measure(
+            lambda: SearchIndex(snapshot).search('vector ret'), slow, setup=fresh_snapshot)
+    else:
+        plain_roster = thaw(snapshot)
+        results['search (index build + query)'] = measure(
+            lambda: SearchIndex(plain_roster).search('vector ret'), slow)
+
+    target = thaw(snapshot[len(snapshot) // 2])
+    flip = [0]
+
+    def update_one():
+        flip[0] += 1
+        utils.add_or_update_star({**target, 'bio': f"{target['bio']} {flip[0]}"})
+
+    results['add_or_update_star'] = measure(update_one, repeat, number=5)
+
+    plain = thaw(utils.load_stars())
+    results['save_stars'] = measure(lambda: utils.save_stars(plain), slow)
+    return results
+
+
+_OEMBED = json.dumps({'title': 'Benchmark video', 'author_name': 'Bench', 'thumbnail_url': ''}).encode()
+_PAGE = (b"<html><head><title>Benchmark page</title>"
+         b"<meta property='og:title' content='OG title'>"
+         b"<meta property='og:description' content='OG description'></head>"
+         b"<body><h1>Heading</h1>" + b"<p>filler</p>" * 20000 + b"</body></html>")
+
+
+def start_stub_server() -> str:
+    """Local HTTP server answering GETs with one HTML page (304 for its ETag) and /oembed with JSON"""
+    import http.server
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path.startswith('/oembed'):
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(_OEMBED)))
+                self.end_headers()
+                self.wfile.write(_OEMBED)
+                return
+            if self.headers.get('If-None-Match') == '"bench"':
+                self.send_response(304)
+                self.send_header('ETag', '"bench"')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('ETag', '"bench"')
+            self.send_header('Content-Length', str(len(_PAGE)))
+            self.end_headers()
+            self.wfile.write(_PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# Contribution type -> URL template; the registry picks the spec by type, as the admin form does
+DISPATCH_URLS = {
+    'YouTube': "https://www.youtube.com/watch?v={number:011d}",
+    'Medium': "https://medium.com/@bench/post-{number}",
+    'LinkedIn': "https://www.linkedin.com/posts/bench-{number}",
+    'Substack': "https://bench.substack.com/p/post-{number}",
+}
+
+
+def bench_extraction(repeat: int) -> Dict[str, Dict]:
+    from urllib.parse import urlsplit
+
+    import utils
+    from contribution_types import resolve_type
+    from extractors import ExtractorRegistry
+    from http_client import HttpClient
+    from metadata_cache import MetadataCache
+
+    base_url = start_stub_server()
+    registry = utils.get_extractors()
+    generic = registry.get('generic')
+    counter = [0]
+
+    def fresh_url() -> str:
+        counter[0] += 1
+        return f"{base_url}/article/{counter[0]}"
+
+    results = {
+        'extract (uncached, stub HTTP)': measure(lambda: generic.uncached(fresh_url()), repeat, number=5),
+        'extract (cache miss + store)': measure(
+            lambda: utils.extract_url_metadata(fresh_url(), 'Other'), repeat, number=5),
+    }
+    cached_url = fresh_url()
+    utils.extract_url_metadata(cached_url, 'Other')
+    results['extract (cache hit)'] = measure(
+        lambda: utils.extract_url_metadata(cached_url, 'Other'), repeat, number=50)
+
+    class StubClient(HttpClient):
+        """Sends every request (YouTube's oEmbed endpoint too) to the stub server, keeping path and query"""
+
+        def stream(self, url: str, *args, **kwargs):
+            parts = urlsplit(url)
+            return super().stream(f"{base_url}{parts.path}?{parts.query}", *args, **kwargs)
+
+    stub_registry = ExtractorRegistry(StubClient(), MetadataCache('dispatch_cache.db'))
+    for url_type, template in DISPATCH_URLS.items():
+        def extract(url_type=url_type, template=template):
+            counter[0] += 1
+            return stub_registry.extract(template.format(number=counter[0]), url_type)
+        name = stub_registry.resolve('', resolve_type(url_type)).name
+        results[f"extract {name} (dispatch + cache miss)"] = measure(extract, repeat, number=5)
+    return results
+
+
+def run_worker(scale: str, repeat: int):
+    sys.path.insert(0, ROOT)
+    if scale == 'extract':
+        results = bench_extraction(repeat)
+    else:
+        results = bench_data_layer(int(scale), repeat)
+    print(json.dumps(results))
+
+
+# --- driver side --------------------------------------------------------------------------------
+
+def run_scale(scale: str, repeat: int) -> Dict[str, Dict]:
+    """Run one worker in a fresh interpreter and temporary data directory"""
+    workdir = tempfile.mkdtemp(prefix='stars-bench-')
+    try:
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', scale, '--repeat', str(repeat)],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+    except subprocess.CalledProcessError as error:
+        sys.stderr.write(error.stderr)
+        raise
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def benchmark(scales: List[int], repeat: int, extraction: bool = True) -> Dict[str, Dict]:
+    """'<scale>/<case>' -> timings"""
+    results = {}
+    labels = [str(scale) for scale in scales] + (['extract'] if extraction else [])
+    for label in labels:
+        for case, timing in run_scale(label, repeat).items():
+            key = case if label == 'extract' else f"{label} stars/{case}"
+            results[key] = timing
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Print the report table; returns the regressed cases"""
+    # Best-of-N is compared (as timeit recommends): noise only ever makes a run slower
+    regressions = []
+    width = max(len(key) for key in results)
+    print(f"{'case':<{width}}  {'median ms':>11}  {'min ms':>11}  {'baseline':>11}  {'change':>8}")
+    for key, timing in results.items():
+        best = timing['min_ms']
+        base = baseline.get(key, {}).get('min_ms')
+        row = f"{key:<{width}}  {timing['median_ms']:>11.4f}  {best:>11.4f}"
+        if base is None:
+            print(f"{row}  {'-':>11}  {'new':>8}")
+            continue
+        change = (best - base) / base if base else 0.0
+        regressed = change > threshold and best - base > MIN_REGRESSION_MS
+        print(f"{row}  {base:>11.4f}  {change:>+7.0%}{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help=f"roster sizes to run, from {sorted(SCALES)} (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed batches per case (median is reported)")
+    parser.add_argument('--no-extract', action='store_true', help="skip the extractor benchmarks")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline file (default: %(default)s)")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help="allowed slowdown before a case is flagged "
+                             "(default 0.5 = 50%%; tighten on a quiet CI machine)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.repeat)
+        return
+
+    scales = [int(scale) for scale in args.scales.split(',') if scale]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s) {unknown}; choose from {sorted(SCALES)}")
+
+    results = benchmark(scales, args.repeat, extraction=not args.no_extract)
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'_note': BASELINE_NOTE, **results}, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Cold-start benchmark for the dashboard page
+
+Imports what a fresh Streamlit worker imports for the dashboard in a new
+interpreter under `python -X importtime`, several times, and reports the
+median total import time, the slowest modules, and whether any extraction /
+scraping module was loaded (it must not be):
+
+    python benchmarks/startup.py [--runs 5] [--top 15] [--render] [--json]
+
+--render also executes app.py once (Streamlit's AppTest, dashboard page) and
+checks the modules loaded by the full first paint. Exits with status 1 if a
+forbidden module was imported.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the dashboard page imports
+DASHBOARD_MODULES = (
+    'streamlit', 'utils', 'contribution_types', 'contribution_stats', 'images',
+    'fragments', 'month_index', 'search', 'instrumentation',
+)
+
+# Only needed to extract metadata (admin form, backfill), never to render the dashboard
+FORBIDDEN_MODULES = (
+    'requests', 'urllib3', 'bs4', 'html.parser',
+    'extractors', 'html_meta', 'metadata_cache', 'backfill',
+)
+
+_IMPORT_SCRIPT = """
+import json, sys
+for module in {modules!r}:
+    __import__(module)
+print(json.dumps(sorted(sys.modules)))
+"""
+
+_RENDER_SCRIPT = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60).run()
+if at.exception:
+    raise SystemExit(str(at.exception))
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every line of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # Drop the separator space; the remaining indent is two spaces per nesting level
+        rows.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_once(script: str) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """Run `script` in a fresh interpreter; returns (importtime rows, loaded module names)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+    return parse_importtime(result.stderr), json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def top_level_total_ms(rows: List[Tuple[str, int, int]]) -> float:
+    """Total import time: the sum of the cumulative times of top-level imports"""
+    return sum(cumulative for name, _, cumulative in rows if not name.startswith(' ')) / 1000
+
+
+def benchmark(runs: int, top: int, render: bool) -> Dict:
+    script = _IMPORT_SCRIPT.format(modules=DASHBOARD_MODULES)
+    totals, modules_ms, loaded = [], {}, set()
+    for _ in range(runs):
+        rows, modules = run_once(script)
+        totals.append(top_level_total_ms(rows))
+        loaded.update(modules)
+        for name, _, cumulative in rows:
+            modules_ms.setdefault(name.strip(), []).append(cumulative / 1000)
+
+    report = {
+        'runs': runs,
+        'import_ms_median': round(statistics.median(totals), 1),
+        'import_ms_min': round(min(totals), 1),
+        'project_modules_ms': {
+            name: round(statistics.median(modules_ms[name]), 1)
+            for name in DASHBOARD_MODULES if name in modules_ms
+        },
+        'slowest_modules_ms': sorted(
+            ((name, round(statistics.median(times), 1)) for name, times in modules_ms.items()),
+            key=lambda item: item[1], reverse=True
+        )[:top],
+    }
+    if render:
+        _, modules = run_once(_RENDER_SCRIPT.format(app=os.path.join(ROOT, 'app.py')))
+        loaded.update(modules)
+    report['forbidden_loaded'] = sorted(name for name in FORBIDDEN_MODULES if name in loaded)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure dashboard cold-start import time")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument('--top', type=int, default=15, help="Slowest modules to list")
+    parser.add_argument('--render', action='store_true', help="Also run app.py once and check its imports")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = benchmark(args.runs, args.top, args.render)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Dashboard imports: {report['import_ms_median']:.1f} ms median "
+              f"({report['import_ms_min']:.1f} ms best of {report['runs']})")
+        for name, ms in report['project_modules_ms'].items():
+            print(f"  {name:<24} {ms:>8.1f} ms")
+        print("Slowest modules (cumulative):")
+        for name, ms in report['slowest_modules_ms']:
+            print(f"  {name:<40} {ms:>8.1f} ms")
+        if report['forbidden_loaded']:
+            print(f"FAIL: dashboard imported {', '.join(report['forbidden_loaded'])}")
+        else:
+            print("OK: no extraction modules imported")
+    sys.exit(1 if report['forbidden_loaded'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Per-star contribution aggregates for the Qdrant Stars Dashboard
+"""
+from typing import List, Dict, Tuple
+
+from contribution_types import CONTRIBUTION_TYPES, ContributionType, contribution_type
+
+
+class ContributionStats:
+    """Counts and groupings of one star's contributions by type code, built in a single pass"""
+
+    __slots__ = ('total', 'by_type', 'by_month', '_groups')
+
+    def __init__(self, contributions: List[Dict]):
+        self.total = len(contributions)
+        self.by_type: Dict[ContributionType, int] = {}
+        self.by_month: Dict[str, int] = {}
+        # type code -> month -> contributions, in their original order
+        self._groups: Dict[ContributionType, Dict[str, List[Dict]]] = {}
+        for contrib in contributions:
+            type_code = contribution_type(contrib)
+            month = contrib.get('month', 'Unknown')
+            self.by_type[type_code] = self.by_type.get(type_code, 0) + 1
+            self.by_month[month] = self.by_month.get(month, 0) + 1
+            self._groups.setdefault(type_code, {}).setdefault(month, []).append(contrib)
+
+    def count(self, type_code: ContributionType) -> int:
+        """Number of contributions of a type"""
+        return self.by_type.get(type_code, 0)
+
+    def badges(self) -> List[Tuple[int, str]]:
+        """(count, badge label) for every non-empty type, in display order"""
+        return [
+            (self.by_type[info.code], info.badge_label)
+            for info in CONTRIBUTION_TYPES
+            if self.by_type.get(info.code)
+        ]
+
+    def months(self, type_code: ContributionType) -> List[Tuple[str, List[Dict]]]:
+        """(month, contributions) for a type, most recent month first"""
+        groups = self._groups.get(type_code, {})
+        return [(month, groups[month]) for month in sorted(groups, reverse=True)]
+
+
+def get_contribution_stats(star: Dict) -> ContributionStats:
+    """Aggregates for a star, computed once per cached record and reused on every rerun"""
+    derived = getattr(star, 'derived', None)
+    if derived is None:
+        # Plain (editable) dicts can change under us, so they are never cached
+        return ContributionStats(star.get('contributions', []))
+    return derived('contribution_stats', lambda record: ContributionStats(record.get('contributions', [])))
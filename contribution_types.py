@@ -0,0 +1,118 @@
+"""
+Canonical contribution types for the Qdrant Stars Dashboard
+
+Every contribution type is declared once in CONTRIBUTION_TYPES. Stored
+`type` strings are canonicalized on write (admin form, imports), and code
+compares ContributionType members instead of lowercased strings.
+"""
+from enum import IntEnum
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class ContributionType(IntEnum):
+    """Compact code for a contribution type (also stored in the SQLite backend)"""
+    OTHER = 0
+    YOUTUBE = 1
+    MEDIUM = 2
+    LINKEDIN = 3
+    SUBSTACK = 4
+    MEETUPS = 5
+    OPEN_SOURCE = 6
+
+
+class TypeInfo(NamedTuple):
+    code: ContributionType
+    name: str                           # canonical value stored in `type`
+    aliases: Tuple[str, ...]            # other accepted spellings (lowercase)
+    badge_label: str                    # label on tiles and profile cards
+    tab_label: str                      # label of the detail-page tab
+    url_hosts: Optional[Tuple[str, ...]] = None  # URL must mention one of these hosts
+    any_url: bool = False               # accept any URL (no http(s) check)
+    show_description: bool = True       # show the description on the detail page
+    extract_metadata: bool = True       # offer "Extract Metadata" in the admin form
+    admin_hint: str = ''                # shown in the admin form instead of extraction
+
+
+# Registry in display order (tiles, tabs, admin select box)
+CONTRIBUTION_TYPES: List[TypeInfo] = [
+    TypeInfo(ContributionType.YOUTUBE, 'YouTube', ('youtube',), 'YouTube', '🎥 YouTube',
+             url_hosts=('youtube.com', 'youtu.be')),
+    TypeInfo(ContributionType.MEDIUM, 'Medium', ('medium',), 'Medium', '📝 Medium',
+             url_hosts=('medium.com', 'towardsdatascience.com')),
+    TypeInfo(ContributionType.LINKEDIN, 'LinkedIn', ('linkedin',), 'LinkedIn', '💼 LinkedIn',
+             url_hosts=('linkedin.com',), show_description=False, extract_metadata=False,
+             admin_hint="💡 LinkedIn: Just enter a title and paste the link. No metadata extraction needed."),
+    TypeInfo(ContributionType.SUBSTACK, 'Substack', ('substack',), 'Substack', '📰 Substack',
+             url_hosts=('substack.com',), show_description=False, extract_metadata=False,
+             admin_hint="💡 Substack: Just enter a title and paste the link. No metadata extraction needed."),
+    TypeInfo(ContributionType.MEETUPS, 'Meetups/Events', ('meetups/events', 'meetups', 'events'),
+             'Meetups', '🎪 Meetups/Events', any_url=True, show_description=False, extract_metadata=False,
+             admin_hint="💡 Meetups/Events: Enter event name and link. No metadata extraction available."),
+    TypeInfo(ContributionType.OPEN_SOURCE, 'Open Source', ('open source', 'opensource'),
+             'Open Source', '💻 Open Source', any_url=True, show_description=False, extract_metadata=False,
+             admin_hint="💡 Open Source: Enter contribution title and link. No metadata extraction available."),
+    TypeInfo(ContributionType.OTHER, 'Other', ('other',), 'Other', '📄 Other'),
+]
+
+_INFO_BY_CODE: Dict[ContributionType, TypeInfo] = {info.code: info for info in CONTRIBUTION_TYPES}
+
+# Canonical names resolve with one exact lookup; aliases after strip/lower
+_CODE_BY_NAME: Dict[str, ContributionType] = {info.name: info.code for info in CONTRIBUTION_TYPES}
+_CODE_BY_ALIAS: Dict[str, ContributionType] = {
+    alias: info.code for info in CONTRIBUTION_TYPES for alias in (info.name.lower(), *info.aliases)
+}
+
+# Values for the admin "Contribution Type" select box
+TYPE_NAMES: List[str] = [info.name for info in CONTRIBUTION_TYPES]
+
+
+def resolve_type(type_name: Optional[str]) -> ContributionType:
+    """Code for a type name or alias (OTHER for anything unknown)"""
+    if not type_name:
+        return ContributionType.OTHER
+    code = _CODE_BY_NAME.get(type_name)
+    if code is None:
+        code = _CODE_BY_ALIAS.get(type_name.strip().lower(), ContributionType.OTHER)
+    return code
+
+
+def type_info(code: ContributionType) -> TypeInfo:
+    """Registry entry for a type code"""
+    return _INFO_BY_CODE[code]
+
+
+def contribution_type(contrib: Dict) -> ContributionType:
+    """Type code of a contribution"""
+    return resolve_type(contrib.get('type', ''))
+
+
+def canonical_type_name(type_name: Optional[str]) -> str:
+    """Stored form of a type: the canonical name, or the trimmed original for unregistered types"""
+    code = resolve_type(type_name)
+    if code is ContributionType.OTHER and type_name and type_name.strip():
+        return type_name.strip()
+    return _INFO_BY_CODE[code].name
+
+
+def normalize_contribution(contrib: Dict) -> Dict:
+    """Contribution with a canonical `type` (returned as-is if already canonical)"""
+    canonical = canonical_type_name(contrib.get('type', ''))
+    if contrib.get('type') == canonical:
+        return contrib
+    return {**contrib, 'type': canonical}
+
+
+def normalize_star(star: Dict) -> Dict:
+    """Star with canonical types on all of its contributions"""
+    if 'contributions' not in star:
+        return star
+    return {**star, 'contributions': [normalize_contribution(c) for c in star['contributions']]}
+
+
+def extract_youtube_id(url: str) -> Optional[str]:
+    """Extract YouTube video ID from URL"""
+    if 'youtube.com/watch?v=' in url:
+        return url.split('v=')[1].split('&')[0]
+    elif 'youtu.be/' in url:
+        return url.split('youtu.be/')[1].split('?')[0]
+    return None
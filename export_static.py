@@ -0,0 +1,312 @@
+"""
+Static site export for the Qdrant Stars Dashboard
+
+Renders the public dashboard grid and every star's detail page into a
+self-contained HTML/CSS bundle that any CDN or nginx can serve without
+running Streamlit:
+
+    python export_static.py [--out site] [--width 400]
+
+    site/
+    ├── index.html                      # stats + grid of all stars
+    ├── stars/<slug>.html               # one detail page per star
+    └── assets/
+        ├── dashboard.<hash>.css        # DASHBOARD_CSS + static-page layout
+        └── thumbs/<hash>-<width>.webp  # resized photos (content-hashed)
+
+Pages reuse the cached fragments from fragments.py, so they match the live
+dashboard. Asset names change whenever their content does, so they can be
+served with a long immutable Cache-Control while the HTML pages revalidate.
+Each export is written to its own versioned directory next to `--out`
+(`.site.<nanoseconds>-<random>/`), and `--out` is a symlink that is atomically
+repointed to it once complete, so a server following the symlink sees either
+the old or the new bundle, never a missing or half-written one. The newest
+KEEP_VERSIONS bundles are kept, so requests already reading the previous one
+can finish.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from contribution_stats import get_contribution_stats
+from contribution_types import CONTRIBUTION_TYPES
+from fragments import DASHBOARD_CSS, star_header_html, tab_blocks, tile_html
+from images import THUMBNAIL_WIDTH, find_star_image, get_thumbnail
+from month_index import get_month_index, previous_month
+from storage import slugify
+from utils import load_stars
+
+DEFAULT_OUTPUT_DIR = "site"
+# Written into every bundle; an existing --out directory is only replaced if it has one
+MARKER_FILE = ".stars-export"
+# Bundles kept on disk: the published one and the one it replaced
+KEEP_VERSIONS = 2
+
+# Layout that Streamlit's columns and tabs provide in the live app
+STATIC_CSS = """
+    body {
+        margin: 0;
+        padding: 2rem 1rem 4rem;
+        background: #fafafa;
+        font-family: "Source Sans Pro", -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
+        color: #31333f;
+    }
+    .page {
+        max-width: 1100px;
+        margin: 0 auto;
+    }
+    .stat-row {
+        display: grid;
+        grid-template-columns: repeat(3, 1fr);
+        gap: 1rem;
+        margin-bottom: 2rem;
+    }
+    .star-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
+        gap: 1rem;
+    }
+    .star-tile-link {
+        color: inherit;
+        text-decoration: none;
+    }
+    .back-link {
+        display: inline-block;
+        margin-bottom: 1rem;
+        color: #667eea;
+        text-decoration: none;
+    }
+    .tabs > input {
+        display: none;
+    }
+    .tabs > label {
+        display: inline-block;
+        padding: 0.5rem 1rem;
+        cursor: pointer;
+        border-bottom: 2px solid transparent;
+    }
+    .tabs > input:checked + label {
+        color: #667eea;
+        border-bottom-color: #667eea;
+    }
+    .tab-panel {
+        display: none;
+        padding-top: 1rem;
+        border-top: 1px solid #e6e6e6;
+    }
+""" + "".join(
+    f"    #tab-{index}:checked ~ #panel-{index} {{ display: block; }}\n"
+    for index in range(len(CONTRIBUTION_TYPES))
+)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def page_html(title: str, css_href: str, body: str) -> str:
+    """A complete HTML document around `body`"""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{escape(title)}</title>
+<link rel="stylesheet" href="{css_href}">
+</head>
+<body>
+<div class="page">
+{body}
+</div>
+</body>
+</html>
+"""
+
+
+def star_slugs(stars: Sequence[Dict]) -> List[str]:
+    """File name (without .html) of each star's page, unique within the export"""
+    slugs, seen = [], set()
+    for star in stars:
+        base = slugify(star.get('name', '')) or 'star'
+        slug, number = base, 2
+        while slug in seen:
+            slug, number = f"{base}_{number}", number + 1
+        seen.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+class SiteExporter:
+    """Writes one bundle into `root` (an empty directory)"""
+
+    def __init__(self, root: Path, width: int = THUMBNAIL_WIDTH):
+        self.root = root
+        self.width = width
+        self.thumbnails = 0
+
+    def write(self, relative_path: str, data: bytes):
+        path = self.root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def write_css(self) -> str:
+        """Hashed stylesheet; returns its path relative to the bundle root"""
+        data = (DASHBOARD_CSS + STATIC_CSS).encode('utf-8')
+        relative_path = f"assets/dashboard.{content_hash(data)}.css"
+        self.write(relative_path, data)
+        return relative_path
+
+    def write_thumbnail(self, star: Dict) -> Optional[str]:
+        """Star photo as a resized, content-hashed asset (None if the star has no usable image)"""
+        image = find_star_image(star.get('name', ''))
+        if not image:
+            return None
+        thumbnail = get_thumbnail(image.path, self.width, image.signature)
+        if thumbnail is None:
+            return None
+        relative_path = f"assets/thumbs/{thumbnail.filename}"
+        if not (self.root / relative_path).exists():
+            self.write(relative_path, thumbnail.data)
+            self.thumbnails += 1
+        return relative_path
+
+    def index_html(self, stars: Sequence[Dict], slugs: List[str], thumbs: List[Optional[str]], css: str) -> str:
+        total_contributions = sum(get_contribution_stats(star).total for star in stars)
+        previous_month_contribs = get_month_index(stars).count(previous_month())
+        stat_boxes = "".join(
+            f'<div class="stat-box"><div class="stat-number">{number}</div><div class="stat-label">{label}</div></div>'
+            for number, label in (
+                (len(stars), "Stars"),
+                (total_contributions, "Total Contributions"),
+                (previous_month_contribs, "Previous Month"),
+            )
+        )
+        tiles = "".join(
+            f'<a class="star-tile-link" href="stars/{slug}.html">{tile_html(star, thumb)}</a>'
+            for star, slug, thumb in zip(stars, slugs, thumbs)
+        )
+        body = (
+            '<div class="main-header">⭐ Qdrant Stars Dashboard</div>'
+            f'<div class="stat-row">{stat_boxes}</div>'
+            f'<div class="star-grid">{tiles if stars else "<p>✨ No stars added yet. Check back soon!</p>"}</div>'
+        )
+        return page_html("Qdrant Stars Dashboard", css, body)
+
+    def star_html(self, star: Dict, css: str) -> str:
+        parts = ['<a class="back-link" href="../index.html">← Back to Dashboard</a>', star_header_html(star)]
+        bio = star.get('bio', '')
+        if bio:
+            parts.append(f'<div class="bio-text">{bio}</div>')
+
+        stats = get_contribution_stats(star)
+        type_tabs = [info for info in CONTRIBUTION_TYPES if stats.count(info.code)]
+        if not type_tabs:
+            parts.append('<p>No contributions yet.</p>')
+        else:
+            # CSS-only tabs: radio inputs and labels first, then the panels they show
+            parts.append('<div class="tabs">')
+            for index, info in enumerate(type_tabs):
+                checked = ' checked' if index == 0 else ''
+                parts.append(f'<input type="radio" name="tab" id="tab-{index}"{checked}>'
+                             f'<label for="tab-{index}">{info.tab_label} ({stats.count(info.code)})</label>')
+            for index, info in enumerate(type_tabs):
+                parts.append(f'<section class="tab-panel" id="panel-{index}">')
+                parts.extend(tab_blocks(star, info.code))
+                parts.append('</section>')
+            parts.append('</div>')
+        return page_html(f"{star.get('name', 'Unknown')} · Qdrant Stars", f"../{css}", "\n".join(parts))
+
+    def export(self, stars: Sequence[Dict]) -> int:
+        """Write every page and asset; returns the number of pages"""
+        css = self.write_css()
+        slugs = star_slugs(stars)
+        thumbs = [self.write_thumbnail(star) for star in stars]
+        self.write("index.html", self.index_html(stars, slugs, thumbs, css).encode('utf-8'))
+        for star, slug in zip(stars, slugs):
+            self.write(f"stars/{slug}.html", self.star_html(star, css).encode('utf-8'))
+        self.write(MARKER_FILE, b"Generated by export_static.py; older bundles are deleted by later exports.\n")
+        return len(stars) + 1
+
+
+def version_prefix(target: Path) -> str:
+    """Name prefix of the versioned bundle directories behind `target`"""
+    return f".{target.name}."
+
+
+def new_version(target: Path) -> Path:
+    """Empty versioned directory to build the next bundle in (sorts after the existing ones)"""
+    # Zero-padded nanoseconds: name order is creation order, even within one second
+    stamp = f"{time.time_ns():020d}"
+    return Path(tempfile.mkdtemp(dir=target.parent, prefix=f"{version_prefix(target)}{stamp}-"))
+
+
+def publish(built: Path, target: Path):
+    """Atomically point the `target` symlink at a finished bundle (only replaces our symlink or an empty dir)"""
+    if target.is_symlink():
+        if not os.readlink(target).startswith(version_prefix(target)):
+            raise RuntimeError(f"{target} is a symlink that was not created by export_static.py")
+    elif target.is_dir():
+        if any(target.iterdir()):
+            raise RuntimeError(f"{target} is not empty and was not created by export_static.py")
+        target.rmdir()
+    elif target.exists():
+        raise RuntimeError(f"{target} is not a directory or a symlink created by export_static.py")
+
+    link = target.with_name(f"{version_prefix(target)}link-{os.getpid()}")
+    if link.is_symlink():
+        link.unlink()
+    os.symlink(built.name, link, target_is_directory=True)
+    try:
+        os.replace(link, target)
+    except BaseException:
+        link.unlink()
+        raise
+    remove_old_versions(target)
+
+
+def remove_old_versions(target: Path):
+    """Delete all but the newest KEEP_VERSIONS bundles (never the published one)"""
+    current = os.readlink(target)
+    versions = sorted(
+        path for path in target.parent.glob(f"{version_prefix(target)}*")
+        if path.is_dir() and not path.is_symlink() and (path / MARKER_FILE).exists()
+    )
+    for path in versions[:-KEEP_VERSIONS]:
+        if path.name != current:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the public dashboard as static HTML/CSS")
+    parser.add_argument('--out', default=DEFAULT_OUTPUT_DIR, help=f"output directory (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument('--width', type=int, default=THUMBNAIL_WIDTH, help="thumbnail width in pixels")
+    args = parser.parse_args()
+
+    # Not resolve(): --out itself is the symlink to replace
+    target = Path(os.path.abspath(args.out))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    stars = load_stars()
+
+    built = new_version(target)
+    try:
+        exporter = SiteExporter(built, args.width)
+        pages = exporter.export(stars)
+        os.chmod(built, 0o755)
+        publish(built, target)
+    except BaseException:
+        shutil.rmtree(built, ignore_errors=True)
+        raise
+
+    print(f"Exported {pages} pages and {exporter.thumbnails} thumbnails to {target} -> {built.name} "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
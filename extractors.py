@@ -0,0 +1,226 @@
+"""
+URL metadata extractor registry for the Qdrant Stars Dashboard
+
+Every extractor is declared once in BUILTIN_EXTRACTORS with the hosts and
+contribution types it handles and its fetch strategy:
+
+    oembed  - the site's oEmbed JSON endpoint (no HTML at all)
+    api     - a JSON API (e.g. GitHub's REST API)
+    og      - Open Graph / <title> tags from a streamed, <head>-only parse
+    none    - link only, nothing is fetched
+
+ExtractorRegistry picks the extractor for a URL (contribution type first,
+then host, then the generic Open Graph extractor) and runs it through the
+shared HTTP client and metadata cache with a per-extractor timeout, keeping
+call / fetch / error / latency counters for each one.
+"""
+import os
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from contribution_types import ContributionType, extract_youtube_id, resolve_type
+from http_client import DEFAULT_TIMEOUT, HttpClient
+from instrumentation import timer
+
+if TYPE_CHECKING:
+    from metadata_cache import MetadataCache
+
+# fetch(client, url, timeout) -> metadata dict (may raise; errors become {})
+FetchFunction = Callable[[HttpClient, str, float], Dict]
+
+STRATEGIES = ('oembed', 'api', 'og', 'none')
+
+
+class ExtractorSpec(NamedTuple):
+    name: str                                   # cache namespace and metrics key
+    strategy: str                               # one of STRATEGIES
+    fetch: Optional[FetchFunction]
+    hosts: Tuple[str, ...] = ()                 # host names (subdomains match too)
+    types: Tuple[ContributionType, ...] = ()    # contribution types it is used for
+    timeout: float = DEFAULT_TIMEOUT
+
+
+def og_fetch(*title_sources: str) -> FetchFunction:
+    """Fetch strategy reading the title (first of `title_sources`) and og:description from <head>"""
+    def fetch(client: HttpClient, url: str, timeout: float) -> Dict:
+        from html_meta import parse_head
+
+        with client.stream(url, timeout=timeout) as response:
+            if response.status_code != 200:
+                return {}
+            head = parse_head(response.iter_content(16 * 1024), response.encoding,
+                              h1_fallback='h1' in title_sources)
+        return {
+            'title': head.first(*title_sources),
+            'description': head.first('og:description')
+        }
+    return fetch
+
+
+def fetch_youtube(client: HttpClient, url: str, timeout: float) -> Dict:
+    """YouTube oEmbed: title, channel name and thumbnail without loading the watch page"""
+    if not extract_youtube_id(url):
+        return {}
+    oembed_url = "https://www.youtube.com/oembed?" + urlencode({'url': url, 'format': 'json'})
+    response = client.get(oembed_url, timeout=timeout)
+    if response.status_code != 200:
+        return {}
+    data = response.json()
+    return {
+        'title': data.get('title', ''),
+        'author': data.get('author_name', ''),
+        'thumbnail': data.get('thumbnail_url', '')
+    }
+
+
+_GITHUB_PATH = re.compile(r'^/([\w.-]+)/([\w.-]+?)(?:\.git)?(?:/(?:issues|pull)/(\d+))?(?:/.*)?$')
+
+
+def fetch_github(client: HttpClient, url: str, timeout: float) -> Dict:
+    """GitHub REST API for repositories, issues and pull requests; other pages fall back to Open Graph"""
+    match = _GITHUB_PATH.match(urlsplit(url).path)
+    if not match:
+        return og_fetch('og:title', 'title')(client, url, timeout)
+    owner, repo, number = match.groups()
+    api_url = f"https://api.github.com/repos/{owner}/{repo}" + (f"/issues/{number}" if number else "")
+    headers = {'Accept': 'application/vnd.github+json'}
+    token = os.getenv("GITHUB_TOKEN")
+    if token:
+        headers['Authorization'] = f"Bearer {token}"
+    response = client.get(api_url, headers=headers, timeout=timeout)
+    if response.status_code != 200:
+        return {}
+    data = response.json()
+    if number:
+        return {'title': data.get('title', ''), 'description': f"{owner}/{repo}#{number}"}
+    return {'title': data.get('full_name', ''), 'description': data.get('description') or ''}
+
+
+# Registry; for a type, the first extractor listing it wins
+BUILTIN_EXTRACTORS: List[ExtractorSpec] = [
+    ExtractorSpec('youtube', 'oembed', fetch_youtube, hosts=('youtube.com', 'youtu.be'),
+                  types=(ContributionType.YOUTUBE,)),
+    ExtractorSpec('medium', 'og', og_fetch('og:title', 'h1', 'title'),
+                  hosts=('medium.com', 'towardsdatascience.com'), types=(ContributionType.MEDIUM,)),
+    ExtractorSpec('substack', 'og', og_fetch('og:title', 'h1', 'title'), hosts=('substack.com',),
+                  types=(ContributionType.SUBSTACK,)),
+    # LinkedIn pages need a login, so the link is used as is
+    ExtractorSpec('linkedin', 'none', None, hosts=('linkedin.com',), types=(ContributionType.LINKEDIN,)),
+    ExtractorSpec('github', 'api', fetch_github, hosts=('github.com',)),
+    ExtractorSpec('meetup', 'og', og_fetch('og:title', 'title'), hosts=('meetup.com', 'lu.ma')),
+    ExtractorSpec('generic', 'og', og_fetch('og:title', 'title')),
+]
+
+
+class ExtractorStats:
+    """Counters for one extractor (cache hits are calls that did not fetch)"""
+
+    __slots__ = ('calls', 'fetches', 'errors', 'fetch_seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.fetches = 0
+        self.errors = 0
+        self.fetch_seconds = 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'cache_hits': self.calls - self.fetches,
+            'fetches': self.fetches,
+            'errors': self.errors,
+            'avg_fetch_ms': round(1000 * self.fetch_seconds / self.fetches, 1) if self.fetches else 0.0,
+        }
+
+
+class Extractor:
+    """A registered extractor: cached, timed and counted"""
+
+    def __init__(self, spec: ExtractorSpec, client: HttpClient, cache: 'MetadataCache'):
+        if spec.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown fetch strategy {spec.strategy!r} for extractor {spec.name!r}")
+        self.spec = spec
+        self.client = client
+        self.stats = ExtractorStats()
+        self._lock = threading.Lock()
+        # Timer name matching the old per-site functions (extract_medium_metadata, ...)
+        self._timer = f"extract_{spec.name}_metadata"
+        self._cached = cache.cached(spec.name)(self.uncached)
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    def handles_host(self, host: str) -> bool:
+        return any(host == pattern or host.endswith('.' + pattern) for pattern in self.spec.hosts)
+
+    def uncached(self, url: str) -> Dict:
+        """Fetch metadata now, bypassing the cache (errors give {})"""
+        if self.spec.fetch is None:
+            return {}
+        started = time.perf_counter()
+        try:
+            return self.spec.fetch(self.client, url, self.spec.timeout) or {}
+        except Exception:
+            with self._lock:
+                self.stats.errors += 1
+            return {}
+        finally:
+            with self._lock:
+                self.stats.fetches += 1
+                self.stats.fetch_seconds += time.perf_counter() - started
+
+    def __call__(self, url: str) -> Dict:
+        if self.spec.fetch is None:
+            return {}
+        with self._lock:
+            self.stats.calls += 1
+        with timer(self._timer):
+            return self._cached(url)
+
+
+class ExtractorRegistry:
+    """Extractors by name, contribution type and host"""
+
+    def __init__(self, client: HttpClient, cache: 'MetadataCache', specs: List[ExtractorSpec] = BUILTIN_EXTRACTORS):
+        self.client = client
+        self.cache = cache
+        self._extractors: Dict[str, Extractor] = {}
+        self._by_type: Dict[ContributionType, Extractor] = {}
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: ExtractorSpec) -> Extractor:
+        """Add (or replace, by name) an extractor"""
+        extractor = Extractor(spec, self.client, self.cache)
+        self._extractors[spec.name] = extractor
+        self._by_type = {}
+        for registered in self._extractors.values():
+            for type_code in registered.spec.types:
+                self._by_type.setdefault(type_code, registered)
+        return extractor
+
+    def get(self, name: str) -> Extractor:
+        return self._extractors[name]
+
+    def resolve(self, url: str, type_code: ContributionType = ContributionType.OTHER) -> Extractor:
+        """Extractor for the contribution type, else for the URL's host, else the generic one"""
+        extractor = self._by_type.get(type_code)
+        if extractor is not None:
+            return extractor
+        host = urlsplit(url.strip()).netloc.lower().split(':')[0]
+        for extractor in self._extractors.values():
+            if extractor.handles_host(host):
+                return extractor
+        return self._extractors['generic']
+
+    def extract(self, url: str, url_type: Optional[str] = None) -> Dict:
+        """Metadata for a URL of a contribution type name"""
+        return self.resolve(url, resolve_type(url_type))(url)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Counters per extractor name"""
+        return {name: extractor.stats.as_dict() for name, extractor in self._extractors.items()}
@@ -0,0 +1,489 @@
+"""
+Pre-rendered HTML fragments for the Qdrant Stars Dashboard
+
+Star tiles, profile cards, detail headers and the markdown blocks of each
+contribution-type tab are built here (no Streamlit dependency, so the static
+export can reuse them) and kept in an LRU cache keyed by
+(fragment kind, star id, star data version, TEMPLATE_VERSION, variant).
+A star's fragments are rebuilt only when that star changes; bump
+TEMPLATE_VERSION whenever the markup below changes.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from contribution_stats import get_contribution_stats
+from contribution_types import ContributionType, extract_youtube_id, type_info
+from instrumentation import metrics, timer
+from storage import star_version
+
+TEMPLATE_VERSION = 2
+FRAGMENT_CACHE_SIZE = 8192
+
+# Styles for all fragments (injected by app.py, written to a CSS file by export_static.py)
+DASHBOARD_CSS = """
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: 700;
+        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .star-card {
+        background: white;
+        border-radius: 12px;
+        padding: 2rem;
+        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
+        margin-bottom: 2rem;
+        border: 1px solid #e8e8e8;
+    }
+    .star-name {
+        font-size: 1.75rem;
+        font-weight: 600;
+        color: #1a1a1a;
+        margin-bottom: 0.5rem;
+    }
+    .star-role {
+        color: #666;
+        font-size: 0.95rem;
+        margin-bottom: 1rem;
+    }
+    .contribution-item {
+        background: #f8f9fa;
+        padding: 1rem;
+        border-radius: 8px;
+        margin-bottom: 0.75rem;
+        border-left: 3px solid #667eea;
+    }
+    .contribution-type {
+        font-weight: 600;
+        color: #667eea;
+        font-size: 0.8rem;
+        text-transform: uppercase;
+        letter-spacing: 0.5px;
+    }
+    .contribution-title {
+        font-weight: 500;
+        color: #333;
+        margin-top: 0.5rem;
+        font-size: 0.95rem;
+    }
+    .month-badge {
+        background: #667eea;
+        color: white;
+        padding: 0.4rem 1rem;
+        border-radius: 20px;
+        font-size: 0.8rem;
+        display: inline-block;
+        margin-bottom: 1rem;
+        font-weight: 500;
+    }
+    .stat-box {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 12px;
+        text-align: center;
+    }
+    .stat-number {
+        font-size: 2.5rem;
+        font-weight: 700;
+        margin-bottom: 0.5rem;
+    }
+    .stat-label {
+        font-size: 0.9rem;
+        opacity: 0.95;
+    }
+    .login-container {
+        max-width: 400px;
+        margin: 0 auto;
+        padding: 2rem;
+        background: white;
+        border-radius: 12px;
+        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
+    }
+    .bio-text {
+        color: #555;
+        font-size: 0.95rem;
+        line-height: 1.6;
+        margin-top: 0.5rem;
+    }
+    .profile-card-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
+        gap: 1.5rem;
+        margin-top: 2rem;
+    }
+    .profile-card-item {
+        background: white;
+        border-radius: 12px;
+        padding: 1.5rem;
+        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
+        border: 1px solid #e8e8e8;
+        cursor: pointer;
+        transition: transform 0.2s, box-shadow 0.2s;
+    }
+    .profile-card-item:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
+    }
+    .profile-card-name {
+        font-size: 1.25rem;
+        font-weight: 600;
+        color: #1a1a1a;
+        margin-bottom: 0.5rem;
+    }
+    .profile-card-role {
+        color: #666;
+        font-size: 0.9rem;
+        margin-bottom: 0.75rem;
+    }
+    .profile-card-stats {
+        display: flex;
+        gap: 1rem;
+        margin-top: 1rem;
+        padding-top: 1rem;
+        border-top: 1px solid #e8e8e8;
+    }
+    .profile-stat {
+        flex: 1;
+        text-align: center;
+    }
+    .profile-stat-number {
+        font-size: 1.5rem;
+        font-weight: 700;
+        color: #667eea;
+    }
+    .profile-stat-label {
+        font-size: 0.75rem;
+        color: #666;
+        margin-top: 0.25rem;
+    }
+    .star-tile {
+        background: white;
+        border-radius: 16px;
+        padding: 0;
+        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
+        border: 1px solid #e8e8e8;
+        cursor: pointer;
+        transition: transform 0.3s, box-shadow 0.3s;
+        overflow: hidden;
+        height: 500px;
+        display: flex;
+        flex-direction: column;
+        margin-bottom: 1.5rem;
+    }
+    .star-tile:hover {
+        transform: translateY(-8px);
+        box-shadow: 0 8px 20px rgba(0, 0, 0, 0.15);
+    }
+    .star-tile-container {
+        position: relative;
+        width: 100%;
+        margin-bottom: 1.5rem;
+        height: 500px;
+    }
+    .star-tile-wrapper {
+        position: relative;
+        width: 100%;
+        z-index: 1;
+    }
+    /* Make button overlay the card - target buttons that are siblings of star-tile-container */
+    div:has(.star-tile-container) ~ div[data-testid="stButton"],
+    div[data-testid="column"]:has(.star-tile-container) ~ div[data-testid="stButton"] {
+        position: absolute !important;
+        top: 0 !important;
+        left: 0 !important;
+        width: 100% !important;
+        height: 500px !important;
+        z-index: 10 !important;
+        margin: 0 !important;
+        padding: 0 !important;
+        margin-top: -500px !important;
+    }
+    div:has(.star-tile-container) ~ div[data-testid="stButton"] > button,
+    div[data-testid="column"]:has(.star-tile-container) ~ div[data-testid="stButton"] > button {
+        width: 100% !important;
+        height: 500px !important;
+        background: transparent !important;
+        border: none !important;
+        padding: 0 !important;
+        margin: 0 !important;
+        cursor: pointer !important;
+        box-shadow: none !important;
+        min-height: 500px !important;
+        color: black !important;
+    }
+    div:has(.star-tile-container) ~ div[data-testid="stButton"] > button:hover,
+    div[data-testid="column"]:has(.star-tile-container) ~ div[data-testid="stButton"] > button:hover {
+        background: transparent !important;
+        border: none !important;
+        box-shadow: none !important;
+        color: black !important;
+    }
+    div:has(.star-tile-container) ~ div[data-testid="stButton"] > button > p {
+        color: black !important;
+    }
+    .star-tile-image {
+        width: 100%;
+        height: 250px;
+        object-fit: cover;
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        flex-shrink: 0;
+    }
+    .star-tile-content {
+        padding: 1.5rem;
+        flex: 1;
+        display: flex;
+        flex-direction: column;
+        min-height: 0;
+    }
+    .star-tile-name {
+        font-size: 1.5rem;
+        font-weight: 700;
+        color: #1a1a1a;
+        margin-bottom: 0.5rem;
+        line-height: 1.3;
+    }
+    .star-tile-role {
+        color: #667eea;
+        font-size: 0.95rem;
+        font-weight: 500;
+        margin-bottom: 1rem;
+        flex-shrink: 0;
+    }
+    .star-tile-bio {
+        color: #666;
+        font-size: 0.9rem;
+        line-height: 1.6;
+        margin-bottom: 1rem;
+        flex: 1;
+        display: -webkit-box;
+        -webkit-line-clamp: 3;
+        -webkit-box-orient: vertical;
+        overflow: hidden;
+        min-height: 0;
+    }
+    .star-tile-stats {
+        display: flex;
+        gap: 0.5rem;
+        flex-wrap: wrap;
+        margin-top: auto;
+        padding-top: 1rem;
+        border-top: 1px solid #e8e8e8;
+        flex-shrink: 0;
+    }
+    .star-tile-stat {
+        background: #f8f9fa;
+        padding: 0.4rem 0.8rem;
+        border-radius: 20px;
+        font-size: 0.75rem;
+        color: #667eea;
+        font-weight: 600;
+    }
+"""
+
+
+class FragmentCache:
+    """Thread-safe LRU of finished fragments"""
+
+    def __init__(self, max_entries: int = FRAGMENT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, object]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], object]):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        with timer('build_fragment'):
+            value = build()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = FragmentCache()
+metrics.register_collector('fragment_cache', lambda: {'hits': _cache.hits, 'misses': _cache.misses, 'entries': len(_cache)})
+
+
+def data_version(star: Dict) -> str:
+    """Content version of a star, hashed once per cached record"""
+    derived = getattr(star, 'derived', None)
+    if derived is None:
+        return star_version(star)
+    return derived('version', star_version)
+
+
+def _cached(kind: str, star: Dict, variant: Hashable, build: Callable[[], object]):
+    key = (kind, star.get('id') or star.get('name', ''), data_version(star), TEMPLATE_VERSION, variant)
+    return _cache.get_or_build(key, build)
+
+
+def _build_tile(star: Dict, img_src: Optional[str]) -> str:
+    name = star.get('name', 'Unknown')
+    role = star.get('role', '')
+    bio = star.get('bio', '')
+    stats_badges = [
+        f'<span class="star-tile-stat">{count} {label}</span>'
+        for count, label in get_contribution_stats(star).badges()
+    ]
+    stats_html = ''.join(stats_badges) if stats_badges else '<span class="star-tile-stat">No contributions yet</span>'
+    if img_src:
+        image_html = f'<img src="{img_src}" class="star-tile-image" alt="{name}" style="width: 100%; height: 250px; object-fit: cover; display: block;">'
+    else:
+        # No image - gradient placeholder
+        image_html = '<div class="star-tile-image"></div>'
+    return f"""
+<div class="star-tile-container">
+    <div class="star-tile-wrapper">
+        <div class="star-tile">
+            {image_html}
+            <div class="star-tile-content">
+                <div class="star-tile-name">{name}</div>
+                <div class="star-tile-role">{role}</div>
+                {f'<div class="star-tile-bio">{bio}</div>' if bio else ''}
+                <div class="star-tile-stats">
+                    {stats_html}
+                </div>
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+
+def _src_key(img_src: Optional[str]) -> Optional[str]:
+    """Cache key part for an `<img src>`: data URIs (tens of KB each) are keyed by their digest"""
+    if img_src and img_src.startswith('data:'):
+        return 'data:' + hashlib.blake2b(img_src.encode('ascii', 'replace'), digest_size=16).hexdigest()
+    return img_src
+
+
+def tile_html(star: Dict, img_src: Optional[str] = None) -> str:
+    """Grid tile of a star (photo `img_src`, or a gradient placeholder)"""
+    return _cached('tile', star, _src_key(img_src), lambda: _build_tile(star, img_src))
+
+
+def _build_profile_card(star: Dict, link: str) -> str:
+    name = star.get('name', 'Unknown')
+    role = star.get('role', '')
+    stats_html = "".join(
+        f'<div class="profile-stat"><div class="profile-stat-number">{count}</div><div class="profile-stat-label">{label}</div></div>'
+        for count, label in get_contribution_stats(star).badges()
+    )
+    return f"""
+<div class="profile-card-item" onclick="window.location.href='{link}'">
+    <div class="profile-card-name">{name}</div>
+    <div class="profile-card-role">{role}</div>
+    <div class="profile-card-stats">
+        {stats_html if stats_html else '<div class="profile-stat"><div class="profile-stat-number">0</div><div class="profile-stat-label">No contributions</div></div>'}
+    </div>
+</div>
+"""
+
+
+def profile_card_html(star: Dict, link: str) -> str:
+    """Compact profile card opening `link` when clicked"""
+    return _cached('profile_card', star, link, lambda: _build_profile_card(star, link))
+
+
+def star_header_html(star: Dict) -> str:
+    """Name and role card at the top of a star's detail page"""
+    def build():
+        return f"""
+<div class="star-card">
+    <div class="star-name">{star.get('name', 'Unknown')}</div>
+    <div class="star-role">{star.get('role', '')}</div>
+</div>
+"""
+    return _cached('header', star, None, build)
+
+
+def youtube_embed_html(url: str) -> str:
+    """Embedded player for a YouTube URL (a plain link if no video id is found)"""
+    video_id = extract_youtube_id(url)
+    if not video_id:
+        return f'<a href="{url}" target="_blank" style="color: #667eea; text-decoration: none;">Watch on YouTube</a>'
+    return f"""
+<div style="margin-top: 1rem;">
+    <iframe width="100%" height="400"
+            src="https://www.youtube.com/embed/{video_id}"
+            frameborder="0"
+            allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture"
+            allowfullscreen>
+    </iframe>
+</div>
+"""
+
+
+def contribution_html(contrib: Dict, type_code: ContributionType) -> str:
+    """One contribution in a detail-page tab"""
+    contrib_type = contrib.get('type', '')
+    title = contrib.get('title', '')
+    url = contrib.get('url', '').strip()
+    description = contrib.get('description', '').strip()
+
+    # For LinkedIn, the title itself is the link (no description)
+    if type_code == ContributionType.LINKEDIN:
+        return f"""
+<div class="contribution-item">
+    <div class="contribution-type">{contrib_type}</div>
+    <a href="{url}" target="_blank" style="color: #667eea; text-decoration: none;">
+        <div class="contribution-title">{title}</div>
+    </a>
+</div>
+"""
+    # Some types (Substack, Open Source, ...) never show descriptions
+    if not type_info(type_code).show_description:
+        return f"""
+<div class="contribution-item">
+    <div class="contribution-type">{contrib_type}</div>
+    <div class="contribution-title">{title}</div>
+    <a href="{url}" target="_blank" style="color: #667eea; text-decoration: none; font-size: 0.9rem; margin-top: 0.5rem; display: inline-block;">View →</a>
+</div>
+"""
+    show_description = description and description.strip()
+    return f"""
+<div class="contribution-item">
+    <div class="contribution-type">{contrib_type}</div>
+    <div class="contribution-title">{title}</div>
+    {f'<p style="color: #666; font-size: 0.85rem; margin-top: 0.5rem;">{description}</p>' if show_description else ''}
+    <a href="{url}" target="_blank" style="color: #667eea; text-decoration: none; font-size: 0.9rem; margin-top: 0.5rem; display: inline-block;">View →</a>
+</div>
+"""
+
+
+def _build_tab_blocks(star: Dict, type_code: ContributionType) -> Tuple[str, ...]:
+    blocks = []
+    # Months are sorted most recent first
+    for month, month_contribs in get_contribution_stats(star).months(type_code):
+        blocks.append(f'<div class="month-badge">{month}</div>')
+        for contrib in month_contribs:
+            blocks.append(contribution_html(contrib, type_code))
+            if type_code == ContributionType.YOUTUBE:
+                blocks.append(youtube_embed_html(contrib.get('url', '').strip()))
+            blocks.append("<br>")
+    return tuple(blocks)
+
+
+def tab_blocks(star: Dict, type_code: ContributionType) -> Tuple[str, ...]:
+    """HTML blocks (month badges, contributions, embeds, spacers) of one contribution-type tab"""
+    return _cached('tab', star, int(type_code), lambda: _build_tab_blocks(star, type_code))
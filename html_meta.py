@@ -0,0 +1,166 @@
+"""
+Streaming <head> metadata parser for URL metadata extraction
+
+Pages are fed to an incremental html.parser in chunks as they arrive and
+parsing stops at the end of <head> (or at the first <h1> when the head has
+no title and the caller asked for that fallback), so the rest of the page is
+never downloaded or parsed.
+
+Without a charset in the Content-Type header the encoding is sniffed from
+the first bytes like browsers do (BOM, then <meta charset> / http-equiv),
+defaulting to UTF-8.
+"""
+import codecs
+import itertools
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Bytes searched for a <meta> charset declaration (the HTML spec's prescan window)
+SNIFF_BYTES = 1024
+
+_BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_:.-]+)', re.IGNORECASE)
+
+
+class HeadMeta:
+    """<title>, <meta> tags and (optionally) the first <h1> of a page"""
+
+    __slots__ = ('title', 'h1', 'meta')
+
+    def __init__(self):
+        self.title = ''
+        self.h1 = ''
+        # property / name (lowercased) -> content, first occurrence wins
+        self.meta: Dict[str, str] = {}
+
+    def first(self, *sources: str) -> str:
+        """First non-empty value among 'title', 'h1' and meta names such as 'og:title'"""
+        for source in sources:
+            if source == 'title':
+                value = self.title
+            elif source == 'h1':
+                value = self.h1
+            else:
+                value = self.meta.get(source, '')
+            value = (value or '').strip()
+            if value:
+                return value
+        return ''
+
+
+class HeadMetaParser(HTMLParser):
+    """Incremental parser that sets `done` once everything needed has been seen"""
+
+    def __init__(self, h1_fallback: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.result = HeadMeta()
+        self.h1_fallback = h1_fallback
+        self.head_done = False
+        self.done = False
+        self._capture: Optional[str] = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'meta':
+            attrs = dict(attrs)
+            name = (attrs.get('property') or attrs.get('name') or '').lower()
+            if name and attrs.get('content') is not None:
+                self.result.meta.setdefault(name, attrs['content'])
+        elif tag == 'title' and not self.head_done and not self.result.title:
+            self._start_capture(tag)
+        elif tag == 'h1' and self.head_done:
+            self._start_capture(tag)
+        elif tag == 'body':
+            self._end_head()
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == self._capture:
+            text = ' '.join(''.join(self._text).split())
+            self._capture = None
+            if tag == 'title':
+                self.result.title = text
+            else:
+                self.result.h1 = text
+                self.done = True
+        elif tag == 'head':
+            self._end_head()
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        if self._capture is not None:
+            # Truncated page: keep whatever text the open <title>/<h1> had
+            self.handle_endtag(self._capture)
+
+    def _start_capture(self, tag: str):
+        self._capture = tag
+        self._text = []
+
+    def _end_head(self):
+        if self.head_done:
+            return
+        self.head_done = True
+        if self._capture == 'title':
+            self.handle_endtag('title')
+        # Read on into <body> only when the head had nothing to use as a title
+        if not self.h1_fallback or self.result.first('og:title', 'title'):
+            self.done = True
+
+
+def sniff_encoding(data: bytes, declared: Optional[str] = None) -> str:
+    """Encoding of a page from its first bytes: BOM, then the header charset, then <meta>, else UTF-8"""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    candidates = [declared]
+    match = _META_CHARSET.search(data[:SNIFF_BYTES])
+    if match:
+        candidates.append(match.group(1).decode('ascii'))
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            name = codecs.lookup(candidate).name
+        except LookupError:
+            continue
+        # A <meta> can't truthfully declare UTF-16 in an ASCII-compatible prefix (HTML spec)
+        return 'utf-8' if name.startswith('utf-16') else name
+    return 'utf-8'
+
+
+def _with_prefix(chunks: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """The chunks, with the first ones merged until at least `size` bytes (or the end)"""
+    iterator = iter(chunks)
+    prefix: List[bytes] = []
+    length = 0
+    for chunk in iterator:
+        prefix.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            break
+    yield b''.join(prefix)
+    yield from iterator
+
+
+def parse_head(chunks: Iterable[bytes], encoding: Optional[str] = None, h1_fallback: bool = False) -> HeadMeta:
+    """Parse metadata from an iterable of byte chunks (`encoding`: the header charset, if any), consuming no more chunks than needed"""
+    chunks = _with_prefix(chunks, SNIFF_BYTES)
+    first = next(chunks)
+    decoder = codecs.getincrementaldecoder(sniff_encoding(first, encoding))(errors='replace')
+    parser = HeadMetaParser(h1_fallback=h1_fallback)
+    for chunk in itertools.chain((first,), chunks):
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+    else:
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+    return parser.result
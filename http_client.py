@@ -0,0 +1,181 @@
+"""
+Shared HTTP client for URL metadata extraction
+
+One pooled requests.Session (keep-alive, retries with exponential backoff on
+connection errors and 429/5xx) with capped response sizes. `stream()` lets
+callers read the body incrementally and stop early. Requests made
+inside `conditional(...)` send If-None-Match / If-Modified-Since with the
+validators of a previously cached result; a 304 is reported back through the
+Revalidation object so the caller can reuse that result without parsing.
+`requests` is only imported when the first request is made.
+"""
+import contextvars
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+DEFAULT_TIMEOUT = 5
+# Metadata lives in <head>; anything past this is never needed
+MAX_RESPONSE_BYTES = 2 * 1024 * 1024
+POOL_SIZE = 32
+RETRIES = 2
+BACKOFF_FACTOR = 0.5
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+class HttpResponse:
+    """Status, headers and (size-capped) body of a completed request"""
+
+    __slots__ = ('url', 'status_code', 'headers', 'content', 'truncated')
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes, truncated: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.truncated = truncated
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+def header_charset(content_type: str) -> Optional[str]:
+    """charset parameter of a Content-Type header value, if any"""
+    for parameter in content_type.split(';')[1:]:
+        name, _, value = parameter.partition('=')
+        if name.strip().lower() == 'charset' and value.strip(' "\''):
+            return value.strip(' "\'')
+    return None
+
+
+class HttpStream:
+    """An in-flight response whose body is read incrementally, up to `max_bytes`"""
+
+    def __init__(self, response, max_bytes: int):
+        self.url = response.url
+        self.status_code = response.status_code
+        # requests' CaseInsensitiveDict: servers and CDNs often send lowercase names
+        self.headers = response.headers
+        # Only a charset the server actually declared; requests' ISO-8859-1 default for text/* would
+        # mis-decode UTF-8 pages, so callers sniff the body instead (html_meta.parse_head)
+        self.encoding = header_charset(self.headers.get('Content-Type', ''))
+        self.truncated = False
+        self._response = response
+        self._remaining = max_bytes
+
+    def iter_content(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Body chunks; stops (and marks the response truncated) once the size cap is reached"""
+        for chunk in self._response.iter_content(chunk_size):
+            if len(chunk) >= self._remaining:
+                self.truncated = True
+                if self._remaining:
+                    yield chunk[:self._remaining]
+                self._remaining = 0
+                return
+            self._remaining -= len(chunk)
+            yield chunk
+
+
+class Revalidation:
+    """Validators sent with a conditional request, and what the server answered"""
+
+    def __init__(self, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = False
+        self.used = False
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        return {
+            key: value for key, value in (('etag', self.etag), ('last_modified', self.last_modified)) if value
+        }
+
+
+_revalidation: contextvars.ContextVar[Optional[Revalidation]] = contextvars.ContextVar('revalidation', default=None)
+
+
+@contextmanager
+def conditional(validators: Optional[Dict[str, str]] = None) -> Iterator[Revalidation]:
+    """Make the next request in this context conditional on `validators` (etag / last_modified)"""
+    validators = validators or {}
+    revalidation = Revalidation(validators.get('etag'), validators.get('last_modified'))
+    token = _revalidation.set(revalidation)
+    try:
+        yield revalidation
+    finally:
+        _revalidation.reset(token)
+
+
+class HttpClient:
+    """Thread-safe, pooled GET client used by all metadata extractors"""
+
+    def __init__(self, pool_size: int = POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                 max_bytes: int = MAX_RESPONSE_BYTES, retries: int = RETRIES,
+                 backoff_factor: float = BACKOFF_FACTOR):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._session = None
+        self._lock = threading.Lock()
+
+    def session(self):
+        """The shared requests.Session, created on first use"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+
+                    retry = Retry(
+                        total=self.retries,
+                        backoff_factor=self.backoff_factor,
+                        status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=frozenset(['GET', 'HEAD']),
+                        respect_retry_after_header=True,
+                        raise_on_status=False,
+                    )
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+                    session = requests.Session()
+                    session.headers['User-Agent'] = USER_AGENT
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    @contextmanager
+    def stream(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+               max_bytes: Optional[int] = None) -> Iterator['HttpStream']:
+        """GET `url` without reading the body; the connection is released when the block exits"""
+        headers = dict(headers or {})
+
+        # Only the first request in a conditional() block is made conditional
+        revalidation = _revalidation.get()
+        if revalidation is not None and revalidation.used:
+            revalidation = None
+        if revalidation is not None:
+            revalidation.used = True
+            if revalidation.etag:
+                headers['If-None-Match'] = revalidation.etag
+            if revalidation.last_modified:
+                headers['If-Modified-Since'] = revalidation.last_modified
+
+        with self.session().get(url, headers=headers, timeout=timeout or self.timeout, stream=True) as response:
+            if revalidation is not None:
+                if response.status_code == 304:
+                    revalidation.not_modified = True
+                elif response.status_code == 200:
+                    revalidation.etag = response.headers.get('ETag')
+                    revalidation.last_modified = response.headers.get('Last-Modified')
+            yield HttpStream(response, self.max_bytes if max_bytes is None else max_bytes)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+            max_bytes: Optional[int] = None) -> HttpResponse:
+        """GET `url`, reading at most `max_bytes` of the body (raises requests exceptions on failure)"""
+        with self.stream(url, headers, timeout, max_bytes) as response:
+            content = b''.join(response.iter_content()) if response.status_code != 304 else b''
+            return HttpResponse(response.url, response.status_code, response.headers, content, response.truncated)
@@ -0,0 +1,249 @@
+"""
+Star images and thumbnails for the Qdrant Stars Dashboard
+
+Star photos are found through an in-memory index of IMAGE_DIRS, built by one
+directory scan and refreshed at most every IMAGE_INDEX_REFRESH_SECONDS, so
+tile rendering does no filesystem probes.
+
+Tiles show a width-bounded, re-encoded thumbnail instead of the original
+photo. Thumbnails are generated once per source image (keyed by a hash of
+its content), written to THUMBNAIL_DIR under content-hashed names and kept
+in memory. They are served as Streamlit static files when static serving is
+enabled, or as cached data URIs.
+"""
+import base64
+import hashlib
+import io
+import mimetypes
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from instrumentation import timed
+from storage import atomic_write, slugify
+
+# Folders searched for star photos, in priority order
+IMAGE_DIRS = ("stars-img", "stars-image")
+# Supported photo formats, in priority order when a star has several
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+IMAGE_INDEX_REFRESH_SECONDS = 5.0
+
+# Widest thumbnail served (tiles are one column of a 3-column wide layout)
+THUMBNAIL_WIDTH = 400
+THUMBNAIL_QUALITY = 80
+
+# Streamlit serves ./static at app/static when server.enableStaticServing is on
+STATIC_DIR = Path("static")
+THUMBNAIL_DIR = STATIC_DIR / "thumbs"
+STATIC_URL_PREFIX = "app/static"
+
+
+class Thumbnail(NamedTuple):
+    filename: str   # content-hashed name, e.g. "3fa2c1d9e0b41c7a-400.webp"
+    mime: str
+    data: bytes
+    data_uri: str
+    on_disk: bool   # written to THUMBNAIL_DIR (servable as a static file)
+
+
+class ImageFile(NamedTuple):
+    path: str
+    signature: Tuple[int, int]  # (mtime_ns, size) when the index last looked
+
+
+def image_key(name: str) -> str:
+    """Normalized lookup key: casefolded, runs of spaces/underscores/punctuation become '-'"""
+    return re.sub(r'[\W_]+', '-', name.casefold()).strip('-')
+
+
+class ImageIndex:
+    """
+    Map of normalized star names and slugs to photo files.
+
+    "Jane Doe" finds stars-img/jane-doe.jpg, jane_doe.png, Jane Doe.webp, ...
+    The folders are rescanned when their mtime changes; otherwise the indexed
+    files are re-stat'ed so replaced photos get new thumbnails. Both happen at
+    most once per refresh interval, never per lookup.
+    """
+
+    def __init__(self, directories=IMAGE_DIRS, refresh_interval: float = IMAGE_INDEX_REFRESH_SECONDS):
+        self.directories = [Path(directory) for directory in directories]
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._dir_signatures: List[Optional[int]] = []
+        self._files: Dict[str, ImageFile] = {}
+
+    def _dir_mtimes(self) -> List[Optional[int]]:
+        mtimes = []
+        for directory in self.directories:
+            try:
+                mtimes.append(os.stat(directory).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return mtimes
+
+    def _scan(self) -> Dict[str, ImageFile]:
+        files: Dict[str, ImageFile] = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            candidates = []
+            for entry in entries:
+                stem, extension = os.path.splitext(entry.name)
+                if extension.lower() not in IMAGE_EXTENSIONS or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                candidates.append((IMAGE_EXTENSIONS.index(extension.lower()), entry.name, stem,
+                                   ImageFile(str(Path(directory) / entry.name), (stat.st_mtime_ns, stat.st_size))))
+            # Earlier folders and preferred extensions win
+            for _, _, stem, image in sorted(candidates):
+                files.setdefault(image_key(stem), image)
+        return files
+
+    def _restat(self, files: Dict[str, ImageFile]) -> Dict[str, ImageFile]:
+        refreshed = {}
+        for key, image in files.items():
+            try:
+                stat = os.stat(image.path)
+            except OSError:
+                continue
+            refreshed[key] = image._replace(signature=(stat.st_mtime_ns, stat.st_size))
+        return refreshed
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_interval:
+            return
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.refresh_interval:
+                return
+            mtimes = self._dir_mtimes()
+            if self._checked_at is None or mtimes != self._dir_signatures:
+                self._files = self._scan()
+            else:
+                self._files = self._restat(self._files)
+            self._dir_signatures = mtimes
+            self._checked_at = time.monotonic()
+
+    def find(self, star_name: str) -> Optional[ImageFile]:
+        """Photo for a star, matched by name or by the slug of the name"""
+        self._refresh()
+        files = self._files
+        return files.get(image_key(star_name)) or files.get(image_key(slugify(star_name)))
+
+    def invalidate(self):
+        """Force a rescan on the next lookup"""
+        with self._lock:
+            self._checked_at = None
+
+
+_image_index = ImageIndex()
+
+
+@timed('find_star_image')
+def find_star_image(star_name: str) -> Optional[ImageFile]:
+    """Indexed photo for a star (no filesystem access on the hot path)"""
+    return _image_index.find(star_name)
+
+
+_lock = threading.Lock()
+# (source path, width) -> (source stat signature, thumbnail)
+_thumbnails: Dict[Tuple[str, int], Tuple[Tuple[int, int], Thumbnail]] = {}
+
+
+def _encode(source: bytes, width: int) -> Tuple[bytes, str, str]:
+    """Resize to at most `width` pixels wide and re-encode; returns (bytes, mime, extension)"""
+    try:
+        from PIL import Image, ImageOps, features
+    except ImportError:
+        # Without Pillow the original image is served unchanged
+        return source, '', ''
+
+    with Image.open(io.BytesIO(source)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+
+        output = io.BytesIO()
+        if features.check('webp'):
+            image.save(output, format='WEBP', quality=THUMBNAIL_QUALITY, method=4)
+            return output.getvalue(), 'image/webp', '.webp'
+        image.save(output, format='JPEG', quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+        return output.getvalue(), 'image/jpeg', '.jpg'
+
+
+@timed('encode_thumbnail')
+def _build_thumbnail(image_path: Path, width: int) -> Thumbnail:
+    source = image_path.read_bytes()
+    digest = hashlib.sha256(source).hexdigest()[:16]
+
+    # Reuse a thumbnail another process (or an earlier run) already encoded
+    for extension, mime in (('.webp', 'image/webp'), ('.jpg', 'image/jpeg')):
+        cached = THUMBNAIL_DIR / f"{digest}-{width}{extension}"
+        if cached.exists():
+            data = cached.read_bytes()
+            return Thumbnail(cached.name, mime, data, f"data:{mime};base64,{base64.b64encode(data).decode()}", True)
+
+    data, mime, extension = _encode(source, width)
+    if not mime:
+        mime = mimetypes.guess_type(image_path.name)[0] or 'image/jpeg'
+        extension = image_path.suffix.lower()
+    filename = f"{digest}-{width}{extension}"
+    try:
+        THUMBNAIL_DIR.mkdir(parents=True, exist_ok=True)
+        atomic_write(THUMBNAIL_DIR / filename, data, durable=False)
+        on_disk = True
+    except OSError:
+        on_disk = False  # read-only deployments still get the in-memory data URI
+    return Thumbnail(filename, mime, data, f"data:{mime};base64,{base64.b64encode(data).decode()}", on_disk)
+
+
+def get_thumbnail(image_path: str, width: int = THUMBNAIL_WIDTH,
+                  signature: Optional[Tuple[int, int]] = None) -> Optional[Thumbnail]:
+    """
+    Thumbnail for an image file, regenerated only when the file changes (None if unreadable).
+
+    Pass the file's (mtime_ns, size) signature (e.g. from the image index) to skip the stat call.
+    """
+    key = (str(image_path), width)
+    if signature is None:
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _thumbnails.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _lock:
+        cached = _thumbnails.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            thumbnail = _build_thumbnail(Path(image_path), width)
+        except (OSError, ValueError):
+            return None
+        _thumbnails[key] = (signature, thumbnail)
+        return thumbnail
+
+
+def thumbnail_src(image_path: str, static_serving: bool = False, width: int = THUMBNAIL_WIDTH,
+                  signature: Optional[Tuple[int, int]] = None) -> Optional[str]:
+    """`<img src>` for a star image: a static file URL when static serving is on, else a data URI"""
+    thumbnail = get_thumbnail(image_path, width, signature)
+    if thumbnail is None:
+        return None
+    if static_serving and thumbnail.on_disk:
+        return f"{STATIC_URL_PREFIX}/{THUMBNAIL_DIR.relative_to(STATIC_DIR).as_posix()}/{thumbnail.filename}"
+    return thumbnail.data_uri
@@ -0,0 +1,306 @@
+"""
+Hot-path instrumentation for the Qdrant Stars Dashboard
+
+Timers (context manager `timer()` / decorator `timed()`) and counters
+(`count()`) recorded in a process-wide registry, plus per-rerun traces:
+everything timed inside `rerun()` is also attributed to that Streamlit
+rerun, so the admin "Performance" tab can show where one page view spent
+its time (JSON parsing, image encoding, HTML building, extraction, ...).
+
+Exports:
+  - prometheus_text(): Prometheus text format (histograms, counters and
+    collector gauges); with STARS_METRICS_TEXTFILE set it is also written
+    there after reruns, for node_exporter's textfile collector
+  - STARS_METRICS_LOG=1: one JSON log line per rerun (logger "stars.metrics")
+
+STARS_METRICS=0 turns every timer and counter into a no-op.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from storage import atomic_write
+
+METRICS_ENABLED = os.getenv("STARS_METRICS", "1") != "0"
+METRICS_LOG = os.getenv("STARS_METRICS_LOG", "0") == "1"
+METRICS_TEXTFILE = os.getenv("STARS_METRICS_TEXTFILE", "")
+# Minimum seconds between two textfile writes
+METRICS_TEXTFILE_INTERVAL = float(os.getenv("STARS_METRICS_TEXTFILE_INTERVAL", "15"))
+# Reruns kept for the admin Performance tab
+RERUN_HISTORY = 50
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+METRIC_PREFIX = "stars"
+
+logger = logging.getLogger("stars.metrics")
+
+
+class TimerStats:
+    """Calls, total/max seconds and a latency histogram of one operation"""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+
+    def copy(self) -> 'TimerStats':
+        copy = TimerStats()
+        copy.count, copy.total, copy.max, copy.buckets = self.count, self.total, self.max, list(self.buckets)
+        return copy
+
+    def as_dict(self) -> Dict:
+        return {
+            'calls': self.count,
+            'total_ms': round(1000 * self.total, 3),
+            'avg_ms': round(1000 * self.total / self.count, 3) if self.count else 0.0,
+            'max_ms': round(1000 * self.max, 3),
+        }
+
+
+class RerunTrace:
+    """Timings of one Streamlit rerun (operation -> [calls, seconds])"""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.started_at = time.time()
+        self.seconds = 0.0
+        self.operations: Dict[str, List[float]] = {}
+
+    def add(self, name: str, seconds: float):
+        entry = self.operations.get(name)
+        if entry is None:
+            self.operations[name] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def as_dict(self) -> Dict:
+        return {
+            'page': self.page,
+            'started_at': round(self.started_at, 3),
+            'total_ms': round(1000 * self.seconds, 3),
+            'operations': {
+                name: {'calls': int(calls), 'ms': round(1000 * seconds, 3)}
+                for name, (calls, seconds) in self.operations.items()
+            },
+        }
+
+
+class Metrics:
+    """Process-wide timers, counters, collectors and recent rerun traces"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timers: Dict[str, TimerStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.reruns: Deque[RerunTrace] = deque(maxlen=RERUN_HISTORY)
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                stats = self.timers[name] = TimerStats()
+            stats.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_rerun(self, trace: RerunTrace):
+        with self._lock:
+            self.reruns.append(trace)
+
+    def register_collector(self, name: str, collect: Callable[[], Dict[str, float]]):
+        """Gauges read at export time (e.g. cache hit counts owned by another module)"""
+        with self._lock:
+            self._collectors[name] = collect
+
+    def collect(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            collectors = dict(self._collectors)
+        collected = {}
+        for name, collect in collectors.items():
+            try:
+                collected[name] = collect()
+            except Exception:
+                logger.exception("Metrics collector %r failed", name)
+        return collected
+
+    def totals(self) -> Tuple[Dict[str, TimerStats], Dict[str, int]]:
+        """Copies of the timers and counters"""
+        with self._lock:
+            return {name: stats.copy() for name, stats in self.timers.items()}, dict(self.counters)
+
+    def snapshot(self) -> Dict:
+        """Copy of everything, safe to read while other threads keep recording"""
+        with self._lock:
+            timers = {name: stats.as_dict() for name, stats in self.timers.items()}
+            counters = dict(self.counters)
+            reruns = [trace.as_dict() for trace in self.reruns]
+        return {'timers': timers, 'counters': counters, 'collectors': self.collect(), 'reruns': reruns}
+
+    def reset(self):
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+            self.reruns.clear()
+
+
+metrics = Metrics()
+_current_rerun: ContextVar[Optional[RerunTrace]] = ContextVar('current_rerun', default=None)
+
+
+def record(name: str, seconds: float):
+    """Add a measured duration to the totals and to the current rerun"""
+    metrics.observe(name, seconds)
+    trace = _current_rerun.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+@contextmanager
+def _timer(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+@contextmanager
+def _noop() -> Iterator[None]:
+    yield
+
+
+def timer(name: str):
+    """Context manager timing its block as operation `name`"""
+    return _timer(name) if METRICS_ENABLED else _noop()
+
+
+def timed(name: str):
+    """Decorator timing every call of the function as operation `name`"""
+    def decorator(function):
+        if not METRICS_ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def count(name: str, amount: int = 1):
+    """Increment counter `name`"""
+    if METRICS_ENABLED:
+        metrics.increment(name, amount)
+
+
+@contextmanager
+def rerun(page: str = '') -> Iterator[Optional[RerunTrace]]:
+    """Attribute everything timed in the block to one rerun (set trace.page once the page is known)"""
+    if not METRICS_ENABLED:
+        yield None
+        return
+    trace = RerunTrace(page)
+    token = _current_rerun.set(trace)
+    started = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.seconds = time.perf_counter() - started
+        _current_rerun.reset(token)
+        metrics.add_rerun(trace)
+        record('rerun', trace.seconds)
+        if METRICS_LOG:
+            logger.info(json.dumps(trace.as_dict()))
+        if METRICS_TEXTFILE:
+            _maybe_write_textfile()
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    timers, counters = metrics.totals()
+    lines = [
+        f"# HELP {METRIC_PREFIX}_operation_seconds Latency of instrumented dashboard operations",
+        f"# TYPE {METRIC_PREFIX}_operation_seconds histogram",
+    ]
+    for name, stats in sorted(timers.items()):
+        cumulative = 0
+        for bound, bucket in zip(LATENCY_BUCKETS, stats.buckets):
+            cumulative += bucket
+            lines.append(f'{METRIC_PREFIX}_operation_seconds_bucket{{operation="{_label(name)}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_PREFIX}_operation_seconds_bucket{{operation="{_label(name)}",le="+Inf"}} {stats.count}')
+        lines.append(f'{METRIC_PREFIX}_operation_seconds_sum{{operation="{_label(name)}"}} {stats.total:.6f}')
+        lines.append(f'{METRIC_PREFIX}_operation_seconds_count{{operation="{_label(name)}"}} {stats.count}')
+
+    lines.append(f"# HELP {METRIC_PREFIX}_events_total Counted dashboard events")
+    lines.append(f"# TYPE {METRIC_PREFIX}_events_total counter")
+    for name, value in sorted(counters.items()):
+        lines.append(f'{METRIC_PREFIX}_events_total{{event="{_label(name)}"}} {value}')
+
+    for collector, values in sorted(metrics.collect().items()):
+        metric = f"{METRIC_PREFIX}_{collector}"
+        lines.append(f"# TYPE {metric} gauge")
+        for key, value in sorted(values.items()):
+            lines.append(f'{metric}{{key="{_label(key)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def json_snapshot() -> str:
+    """All metrics and recent reruns as one JSON document"""
+    return json.dumps(metrics.snapshot())
+
+
+_textfile_lock = threading.Lock()
+_textfile_written_at = 0.0
+
+
+def _maybe_write_textfile():
+    global _textfile_written_at
+    now = time.monotonic()
+    if now - _textfile_written_at < METRICS_TEXTFILE_INTERVAL or not _textfile_lock.acquire(blocking=False):
+        return
+    try:
+        _textfile_written_at = now
+        write_textfile(METRICS_TEXTFILE)
+    except OSError:
+        logger.exception("Could not write metrics to %s", METRICS_TEXTFILE)
+    finally:
+        _textfile_lock.release()
+
+
+def write_textfile(path: str):
+    """Atomically write prometheus_text() to `path` (node_exporter textfile collector format)"""
+    atomic_write(Path(path), prometheus_text(), durable=False)
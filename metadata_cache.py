@@ -0,0 +1,186 @@
+"""
+Persistent cache for URL metadata extraction
+
+Results of the extract_*_metadata functions are stored in a small SQLite
+database keyed by extractor and normalized URL, so extracting the same URL
+again (or in bulk) does not hit the network. Entries expire after a TTL
+(failed extractions sooner) and the least recently used ones are evicted
+once the cache holds more than `max_entries`.
+
+The ETag / Last-Modified validators of the response an entry was built from
+are stored with it. An expired entry is revalidated with a conditional GET;
+on 304 the stored metadata is reused (and its TTL restarted) without parsing.
+If revalidation fails, the old metadata is kept and retried after the
+negative TTL.
+"""
+import functools
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from http_client import conditional
+from instrumentation import count
+
+METADATA_CACHE_TTL = 7 * 24 * 3600
+METADATA_CACHE_NEGATIVE_TTL = 600
+METADATA_CACHE_MAX_ENTRIES = 5000
+
+# Query parameters that only track the click and never change the page
+_TRACKING_PARAMS = {'fbclid', 'gclid', 'rcm', 'si', 'trk', 'trackingid', 'lipi'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_metadata_accessed ON metadata (accessed_at);
+"""
+
+
+class CacheEntry(NamedTuple):
+    metadata: Dict
+    validators: Dict[str, str]  # etag / last_modified of the response it came from
+    fresh: bool
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key for a URL: trimmed, lowercase scheme/host, no fragment or tracking params"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith('utm_') and name.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+class MetadataCache:
+    """SQLite-backed TTL/LRU cache of extracted metadata dicts"""
+
+    def __init__(self, path: Path, ttl: float = METADATA_CACHE_TTL,
+                 negative_ttl: float = METADATA_CACHE_NEGATIVE_TTL,
+                 max_entries: int = METADATA_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _key(namespace: str, url: str) -> str:
+        return f"{namespace}:{normalize_url(url)}"
+
+    def lookup(self, namespace: str, url: str) -> Optional[CacheEntry]:
+        """Cached entry for a URL, fresh or expired-but-revalidatable, or None"""
+        key = self._key(namespace, url)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    'SELECT value, stored_at, etag, last_modified FROM metadata WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value = json.loads(row[0])
+                validators = {name: v for name, v in (('etag', row[2]), ('last_modified', row[3])) if v}
+                fresh = now - row[1] <= (self.ttl if value else self.negative_ttl)
+                if not fresh and not (value and validators):
+                    conn.execute('DELETE FROM metadata WHERE key = ?', (key,))
+                    return None
+                conn.execute('UPDATE metadata SET accessed_at = ? WHERE key = ?', (now, key))
+                return CacheEntry(value, validators, fresh)
+        except (sqlite3.Error, ValueError):
+            # A broken cache must never break extraction
+            return None
+
+    def get(self, namespace: str, url: str) -> Optional[Dict]:
+        """Cached metadata for a URL, or None if missing or expired"""
+        entry = self.lookup(namespace, url)
+        return entry.metadata if entry is not None and entry.fresh else None
+
+    def set(self, namespace: str, url: str, metadata: Dict, validators: Optional[Dict[str, str]] = None):
+        """Store metadata for a URL, evicting the least recently used entries if the cache is full"""
+        key = self._key(namespace, url)
+        now = time.time()
+        validators = validators or {}
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    'INSERT OR REPLACE INTO metadata (key, value, stored_at, accessed_at, etag, last_modified) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, json.dumps(metadata, ensure_ascii=False), now, now,
+                     validators.get('etag'), validators.get('last_modified'))
+                )
+                overflow = conn.execute('SELECT COUNT(*) FROM metadata').fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        'DELETE FROM metadata WHERE key IN '
+                        '(SELECT key FROM metadata ORDER BY accessed_at LIMIT ?)',
+                        (overflow,)
+                    )
+        except (sqlite3.Error, TypeError, ValueError):
+            pass
+
+    def retry_later(self, namespace: str, url: str):
+        """Keep an expired entry, due for revalidation again after the negative TTL"""
+        now = time.time()
+        try:
+            with self._lock:
+                self._connection().execute(
+                    'UPDATE metadata SET stored_at = ?, accessed_at = ? WHERE key = ?',
+                    (now - self.ttl + self.negative_ttl, now, self._key(namespace, url))
+                )
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._connection().execute('DELETE FROM metadata')
+
+    def cached(self, namespace: str) -> Callable:
+        """Decorator caching an `extract(url) -> Dict` function under `namespace`"""
+        def decorator(extract: Callable[[str], Dict]) -> Callable[[str], Dict]:
+            @functools.wraps(extract)
+            def wrapper(url: str) -> Dict:
+                entry = self.lookup(namespace, url)
+                if entry is not None and entry.fresh:
+                    count('metadata_cache_hit')
+                    return entry.metadata
+                count('metadata_cache_miss')
+                # The extractor's request is conditional on the stale entry's validators
+                with conditional(entry.validators if entry is not None else None) as revalidation:
+                    metadata = extract(url)
+                if revalidation.not_modified and entry is not None:
+                    count('metadata_not_modified')
+                    metadata = entry.metadata
+                elif not metadata and entry is not None:
+                    # Revalidation failed (network error, 5xx): an outage must not wipe good metadata
+                    count('metadata_revalidation_failed')
+                    self.retry_later(namespace, url)
+                    return entry.metadata
+                self.set(namespace, url, metadata, revalidation.validators if metadata else None)
+                return metadata
+            wrapper.uncached = extract
+            return wrapper
+        return decorator
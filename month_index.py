@@ -0,0 +1,145 @@
+"""
+Month-bucketed contribution index for the Qdrant Stars Dashboard
+
+Contribution `month` strings ('YYYY-MM') are parsed once into integer keys
+(year * 12 + month - 1) and grouped into sorted buckets with prefix counts,
+so "last N months", quarter and arbitrary range queries cost a binary
+search plus the matching items (O(log n + k)), and counts cost O(log n).
+The index is built once per roster snapshot.
+"""
+import bisect
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from storage import snapshot_derived
+
+MonthRange = Tuple[Optional[int], Optional[int]]  # inclusive month keys, None = open end
+
+# Months a real contribution can fall in; anything further out is a typo ("0202-10")
+PLAUSIBLE_YEARS_BACK = 30
+PLAUSIBLE_MONTHS_AHEAD = 12
+
+
+class MonthEntry(NamedTuple):
+    star_position: int
+    star: Dict
+    contribution: Dict
+
+
+def month_key(month: str) -> Optional[int]:
+    """'YYYY-MM' -> year * 12 + (month - 1), or None if malformed"""
+    try:
+        year, number = month.strip()[:7].split('-')
+        year, number = int(year), int(number)
+    except (AttributeError, ValueError):
+        return None
+    if not 1 <= number <= 12:
+        return None
+    return year * 12 + number - 1
+
+
+def month_label(key: int) -> str:
+    """Inverse of month_key"""
+    return f"{key // 12:04d}-{key % 12 + 1:02d}"
+
+
+def current_month_key(today: Optional[date] = None) -> int:
+    today = today or date.today()
+    return today.year * 12 + today.month - 1
+
+
+def plausible_months(today: Optional[date] = None) -> Tuple[int, int]:
+    """Inclusive month-key window of believable contribution months"""
+    current = current_month_key(today)
+    return current - PLAUSIBLE_YEARS_BACK * 12, current + PLAUSIBLE_MONTHS_AHEAD
+
+
+def last_months(count: int, today: Optional[date] = None) -> MonthRange:
+    """The current month and the `count - 1` before it"""
+    end = current_month_key(today)
+    return end - count + 1, end
+
+
+def previous_month(today: Optional[date] = None) -> MonthRange:
+    key = current_month_key(today) - 1
+    return key, key
+
+
+def quarter(year: int, number: int) -> MonthRange:
+    """Months of calendar quarter `number` (1-4) of `year`"""
+    if not 1 <= number <= 4:
+        raise ValueError(f"Quarter must be 1-4, got {number}")
+    start = year * 12 + (number - 1) * 3
+    return start, start + 2
+
+
+def current_quarter(today: Optional[date] = None, offset: int = 0) -> MonthRange:
+    """This calendar quarter, or the one `offset` quarters away (-1 = previous)"""
+    key = current_month_key(today)
+    start = key - key % 3 + offset * 3
+    return start, start + 2
+
+
+def month_range(start: Optional[str] = None, end: Optional[str] = None) -> MonthRange:
+    """Range from inclusive 'YYYY-MM' strings (either may be omitted)"""
+    return (month_key(start) if start else None), (month_key(end) if end else None)
+
+
+class MonthIndex:
+    """Contributions of one roster snapshot in sorted month buckets"""
+
+    def __init__(self, stars: Sequence[Dict]):
+        self.stars = stars
+        buckets: Dict[int, List[MonthEntry]] = {}
+        self.undated: List[MonthEntry] = []
+        for position, star in enumerate(stars):
+            for contrib in star.get('contributions', []):
+                entry = MonthEntry(position, star, contrib)
+                key = month_key(contrib.get('month', ''))
+                if key is None:
+                    self.undated.append(entry)
+                else:
+                    buckets.setdefault(key, []).append(entry)
+        self.keys: List[int] = sorted(buckets)
+        self._buckets: List[List[MonthEntry]] = [buckets[key] for key in self.keys]
+        # _prefix[i] = contributions in buckets before i
+        self._prefix = [0]
+        for bucket in self._buckets:
+            self._prefix.append(self._prefix[-1] + len(bucket))
+
+    def _bounds(self, month_range: MonthRange) -> Tuple[int, int]:
+        start, end = month_range
+        lower = 0 if start is None else bisect.bisect_left(self.keys, start)
+        upper = len(self.keys) if end is None else bisect.bisect_right(self.keys, end)
+        return lower, max(lower, upper)
+
+    def entries(self, month_range: MonthRange) -> List[MonthEntry]:
+        """(star position, star, contribution) in the range, oldest month first, roster order within a month"""
+        lower, upper = self._bounds(month_range)
+        return [entry for bucket in self._buckets[lower:upper] for entry in bucket]
+
+    def contributions(self, month_range: MonthRange) -> List[Dict]:
+        """Contributions in the range"""
+        return [entry.contribution for entry in self.entries(month_range)]
+
+    def count(self, month_range: MonthRange) -> int:
+        """Number of contributions in the range"""
+        lower, upper = self._bounds(month_range)
+        return self._prefix[upper] - self._prefix[lower]
+
+    def star_positions(self, month_range: MonthRange) -> Set[int]:
+        """Roster positions of stars with at least one contribution in the range"""
+        return {entry.star_position for entry in self.entries(month_range)}
+
+    def active_stars(self, month_range: MonthRange) -> List[Dict]:
+        """Stars with at least one contribution in the range, in roster order"""
+        return [self.stars[position] for position in sorted(self.star_positions(month_range))]
+
+    def months(self) -> List[str]:
+        """'YYYY-MM' of every month with contributions, oldest first"""
+        return [month_label(key) for key in self.keys]
+
+
+def get_month_index(stars: Sequence[Dict]) -> MonthIndex:
+    """Index for a roster snapshot, rebuilt only when load_stars() returns a new snapshot"""
+    return snapshot_derived(stars, 'month_index', MonthIndex)
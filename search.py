@@ -0,0 +1,217 @@
+"""
+In-memory full-text search over stars for the Qdrant Stars Dashboard
+
+Names, roles, bios and contribution titles/descriptions are tokenized into
+an inverted index (token -> star -> weight) with a sorted vocabulary for
+prefix matching. The index is built once per roster snapshot and rebuilt
+when load_stars() returns a new one; each star's tokens are memoized on its
+cached record, so a rebuild after a single edit only re-tokenizes that star.
+
+Names, ids and slugs also go into a trigram index for typo-tolerant lookups
+(deep links with a misspelled ?star_name=, searches with no exact match),
+scored by trigram overlap (Dice coefficient).
+"""
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from storage import slugify, snapshot_derived
+
+# Weight of a token by the field it came from (the best field counts)
+FIELD_WEIGHTS = {
+    'name': 8.0,
+    'role': 4.0,
+    'bio': 2.0,
+    'title': 2.0,
+    'description': 1.0,
+}
+# A query token that is only a prefix of an indexed token scores less than a whole-word match
+PREFIX_FACTOR = 0.6
+# Ranked results kept per index, so reruns with the same query cost a dict lookup
+QUERY_CACHE_SIZE = 256
+# Minimum trigram similarity (0-1) for fuzzy matches, and for a deep link to resolve to a star
+FUZZY_MIN_SCORE = 0.3
+FUZZY_LINK_MIN_SCORE = 0.5
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def normalize_text(text: str) -> str:
+    """Casefolded text without accents ("José" -> "jose")"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Words of a text, normalized for indexing and querying"""
+    return _TOKEN.findall(normalize_text(text or ''))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a normalized name, padded so word starts weigh more ("ann" -> "  a", " an", ...)"""
+    words = ' '.join(tokenize(text))
+    if not words:
+        return set()
+    padded = f"  {words} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def star_terms(star: Dict) -> Dict[str, float]:
+    """Token -> best field weight for one star"""
+    terms: Dict[str, float] = {}
+
+    def add(text: str, weight: float):
+        for token in tokenize(text):
+            if terms.get(token, 0.0) < weight:
+                terms[token] = weight
+
+    for field in ('name', 'role', 'bio'):
+        add(star.get(field, ''), FIELD_WEIGHTS[field])
+    for contrib in star.get('contributions', []):
+        add(contrib.get('title', ''), FIELD_WEIGHTS['title'])
+        add(contrib.get('description', ''), FIELD_WEIGHTS['description'])
+    return terms
+
+
+def _cached_terms(star: Dict) -> Dict[str, float]:
+    derived = getattr(star, 'derived', None)
+    if derived is None:
+        # Plain (editable) dicts can change under us, so they are never cached
+        return star_terms(star)
+    return derived('search_terms', star_terms)
+
+
+class FuzzyIndex:
+    """Trigram index over star names, ids and slugs"""
+
+    def __init__(self, stars: Sequence[Dict]):
+        self.stars = stars
+        # trigram -> (star position, key number) of every key containing it
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._sizes: Dict[Tuple[int, int], int] = {}
+        for position, star in enumerate(stars):
+            name = star.get('name', '')
+            keys = {' '.join(tokenize(key)) for key in (name, star.get('id', ''), slugify(name)) if key}
+            for number, key in enumerate(sorted(keys)):
+                grams = trigrams(key)
+                if not grams:
+                    continue
+                self._sizes[(position, number)] = len(grams)
+                for gram in grams:
+                    self._postings[gram].append((position, number))
+
+    def match(self, query: str, k: int = 5, min_score: float = FUZZY_MIN_SCORE) -> List[Tuple[float, Dict]]:
+        """Top-k (score, star) by trigram similarity of the query to any name / id / slug, best first"""
+        grams = trigrams(query)
+        if not grams:
+            return []
+        shared: Dict[Tuple[int, int], int] = defaultdict(int)
+        for gram in grams:
+            for key in self._postings.get(gram, ()):
+                shared[key] += 1
+
+        best: Dict[int, float] = {}
+        for key, count in shared.items():
+            score = 2.0 * count / (len(grams) + self._sizes[key])
+            if score >= min_score and score > best.get(key[0], 0.0):
+                best[key[0]] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(round(score, 3), self.stars[position]) for position, score in ranked]
+
+
+class SearchIndex:
+    """Inverted index over one list of stars"""
+
+    def __init__(self, stars: Sequence[Dict]):
+        self.stars = stars
+        self._names = [normalize_text(star.get('name', '')) for star in stars]
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._results: Dict[str, List[Tuple[float, Dict]]] = {}
+        self._fuzzy: Optional[FuzzyIndex] = None
+        for position, star in enumerate(stars):
+            for token, weight in _cached_terms(star).items():
+                self._postings.setdefault(token, {})[position] = weight
+        self._vocabulary = sorted(self._postings)
+
+    def _matches(self, query_token: str) -> Dict[int, float]:
+        """Star position -> score for one query token (whole word or prefix of an indexed token)"""
+        scores: Dict[int, float] = {}
+        start = bisect.bisect_left(self._vocabulary, query_token)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(query_token):
+                break
+            factor = 1.0 if token == query_token else PREFIX_FACTOR
+            for position, weight in self._postings[token].items():
+                score = weight * factor
+                if scores.get(position, 0.0) < score:
+                    scores[position] = score
+        return scores
+
+    def search_scored(self, query: str, limit: Optional[int] = None) -> List[Tuple[float, Dict]]:
+        """(score, star) for stars matching every query word, best first, roster order on ties"""
+        key = normalize_text(query.strip())
+        results = self._results.get(key)
+        if results is None:
+            results = self._rank(query)
+            if len(self._results) >= QUERY_CACHE_SIZE:
+                self._results.clear()
+            self._results[key] = results
+        return results[:limit]
+
+    def _rank(self, query: str) -> List[Tuple[float, Dict]]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return [(0.0, star) for star in self.stars]
+
+        # Rarest word first keeps the candidate set small
+        matches = sorted((self._matches(token) for token in tokens), key=len)
+        totals = dict(matches[0])
+        for scores in matches[1:]:
+            totals = {position: total + scores[position] for position, total in totals.items() if position in scores}
+            if not totals:
+                return []
+
+        phrase = normalize_text(query.strip())
+        ranked = []
+        for position, total in totals.items():
+            # Names that start with the whole query rank first ("jo" -> "John ...")
+            if self._names[position].startswith(phrase):
+                total += FIELD_WEIGHTS['name']
+            ranked.append((-total, position))
+        ranked.sort()
+        return [(-negative_score, self.stars[position]) for negative_score, position in ranked]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """Stars matching every query word (prefixes allowed), best first"""
+        return [star for _, star in self.search_scored(query, limit)]
+
+    @property
+    def fuzzy(self) -> FuzzyIndex:
+        """Trigram index over the same stars, built on first use"""
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(self.stars)
+        return self._fuzzy
+
+
+def get_search_index(stars: Sequence[Dict]) -> SearchIndex:
+    """Index for a roster snapshot, rebuilt only when a different snapshot is passed"""
+    return snapshot_derived(stars, 'search_index', SearchIndex)
+
+
+def search_stars(stars: Sequence[Dict], query: str, limit: Optional[int] = None) -> List[Dict]:
+    """Ranked stars matching a search box query"""
+    return get_search_index(stars).search(query, limit)
+
+
+def fuzzy_find_stars(stars: Sequence[Dict], query: str, k: int = 5,
+                     min_score: float = FUZZY_MIN_SCORE) -> List[Tuple[float, Dict]]:
+    """Top-k (score, star) whose name, id or slug is closest to `query` (typos, spacing, accents)"""
+    return get_search_index(stars).fuzzy.match(query, k, min_score)
+
+
+def find_star_fuzzy(stars: Sequence[Dict], name: str) -> Optional[Dict]:
+    """Best fuzzy match for a deep-link star name, if it is close enough to be meant"""
+    matches = fuzzy_find_stars(stars, name, k=1, min_score=FUZZY_LINK_MIN_SCORE)
+    return matches[0][1] if matches else None
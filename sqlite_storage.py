@@ -0,0 +1,256 @@
+"""
+SQLite storage backend for the Qdrant Stars Dashboard
+
+Enable it with ``STARS_BACKEND=sqlite`` (database path from ``STARS_DB``,
+default ``data/stars.db``) after importing the JSON data:
+
+    python sqlite_storage.py migrate [--json data/stars.json] [--db data/stars.db]
+"""
+import argparse
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from contribution_types import normalize_star, resolve_type
+from storage import ReadOnlyDict, ReadOnlyList, StarRepository, StarStore, freeze
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stars (
+    pk INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    role TEXT,
+    bio TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS contributions (
+    pk INTEGER PRIMARY KEY AUTOINCREMENT,
+    star_pk INTEGER NOT NULL REFERENCES stars (pk) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    type TEXT,
+    type_code INTEGER,
+    title TEXT,
+    url TEXT,
+    month TEXT,
+    description TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_stars_name_key ON stars (name_key);
+CREATE INDEX IF NOT EXISTS idx_stars_id ON stars (id);
+CREATE INDEX IF NOT EXISTS idx_contributions_star ON contributions (star_pk, position);
+CREATE INDEX IF NOT EXISTS idx_contributions_type ON contributions (type_code, month);
+CREATE INDEX IF NOT EXISTS idx_contributions_month ON contributions (month);
+"""
+
+STAR_COLUMNS = ('id', 'name', 'role', 'bio')
+CONTRIBUTION_COLUMNS = ('type', 'title', 'url', 'month', 'description')
+
+# Sorts after every valid character, turning a prefix match into an indexable range
+_PREFIX_END = '\U0010ffff'
+
+
+def _extra_json(record: Dict, columns: Tuple[str, ...], skip: Tuple[str, ...] = ()) -> Optional[str]:
+    """JSON for fields without a dedicated column (None if there are none)"""
+    extra = {key: value for key, value in record.items() if key not in columns and key not in skip}
+    return json.dumps(extra, ensure_ascii=False) if extra else None
+
+
+def _row_to_record(row: sqlite3.Row, columns: Tuple[str, ...]) -> Dict:
+    """Rebuild a record from its columns (NULL means the field was absent) and extras"""
+    record = {column: row[column] for column in columns if row[column] is not None}
+    if row['extra']:
+        record.update(json.loads(row['extra']))
+    return record
+
+
+class SQLiteStarStore:
+    """
+    Star storage in SQLite, with the same interface as storage.StarStore.
+
+    Stars and contributions live in separate tables, indexed by name, type
+    and month, so per-month and per-type queries run in SQL. The indexed
+    snapshot handed to readers is rebuilt only when ``PRAGMA data_version``
+    (or a write through this store) says the database changed. Writes run in
+    ``BEGIN IMMEDIATE`` transactions, which SQLite serializes across processes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._version: Optional[Tuple[int, int]] = None
+        self._local_writes = 0
+        self._transaction_depth = 0
+        self._repository = StarRepository()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Autocommit mode: transactions are opened explicitly in _transaction()
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA foreign_keys = ON')
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def repository(self) -> StarRepository:
+        """Return the indexed snapshot, re-reading the tables only if they changed"""
+        with self._lock:
+            conn = self._connection()
+            version = (conn.execute('PRAGMA data_version').fetchone()[0], self._local_writes)
+            if version != self._version:
+                self._repository = StarRepository(self._read_stars(conn))
+                self._version = version
+            return self._repository
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in one write transaction (nested calls join the outer one)"""
+        with self._lock:
+            conn = self._connection()
+            if self._transaction_depth:
+                self._transaction_depth += 1
+                try:
+                    yield conn
+                finally:
+                    self._transaction_depth -= 1
+                return
+            conn.execute('BEGIN IMMEDIATE')
+            self._transaction_depth = 1
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            else:
+                conn.execute('COMMIT')
+            finally:
+                self._transaction_depth = 0
+                self._local_writes += 1
+
+    @contextmanager
+    def write_lock(self) -> Iterator[StarRepository]:
+        """Serialize a read-modify-write in one transaction; yields the fresh repository"""
+        with self._transaction():
+            yield self.repository()
+
+    def load(self) -> List[Dict]:
+        """Return the current read-only snapshot of all stars"""
+        return self.repository().stars
+
+    def repository_for(self, stars: List[Dict]) -> Optional[StarRepository]:
+        """Return the cached repository if `stars` is the snapshot it handed out"""
+        repository = self._repository
+        return repository if repository.stars is stars else None
+
+    def _read_stars(self, conn: sqlite3.Connection) -> List[Dict]:
+        contributions: Dict[int, List[Dict]] = {}
+        for row in conn.execute('SELECT * FROM contributions ORDER BY star_pk, position'):
+            contributions.setdefault(row['star_pk'], []).append(
+                freeze(_row_to_record(row, CONTRIBUTION_COLUMNS))
+            )
+        stars = []
+        for row in conn.execute('SELECT * FROM stars ORDER BY pk'):
+            star = _row_to_record(row, STAR_COLUMNS)
+            star['contributions'] = ReadOnlyList(contributions.get(row['pk'], []))
+            stars.append(ReadOnlyDict((key, freeze(value)) for key, value in star.items()))
+        return stars
+
+    def _write_star(self, conn: sqlite3.Connection, star: Dict, pk: Optional[int] = None):
+        values = [star.get(column) for column in STAR_COLUMNS]
+        name_key = (star.get('name') or '').casefold()
+        extra = _extra_json(star, STAR_COLUMNS, skip=('contributions',))
+        if pk is None:
+            cursor = conn.execute(
+                'INSERT INTO stars (id, name, role, bio, name_key, extra) VALUES (?, ?, ?, ?, ?, ?)',
+                (*values, name_key, extra)
+            )
+            pk = cursor.lastrowid
+        else:
+            conn.execute(
+                'UPDATE stars SET id = ?, name = ?, role = ?, bio = ?, name_key = ?, extra = ? WHERE pk = ?',
+                (*values, name_key, extra, pk)
+            )
+            conn.execute('DELETE FROM contributions WHERE star_pk = ?', (pk,))
+
+        conn.executemany(
+            'INSERT INTO contributions (star_pk, position, type, type_code, title, url, month, description, extra) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [
+                (
+                    pk, position,
+                    contrib.get('type'), int(resolve_type(contrib.get('type'))),
+                    contrib.get('title'), contrib.get('url'), contrib.get('month'), contrib.get('description'),
+                    _extra_json(contrib, CONTRIBUTION_COLUMNS),
+                )
+                for position, contrib in enumerate(star.get('contributions', []))
+            ]
+        )
+
+    def upsert(self, star: Dict):
+        """Add or replace (by name) a single star and its contributions"""
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT pk FROM stars WHERE name_key = ? ORDER BY pk LIMIT 1',
+                ((star.get('name') or '').casefold(),)
+            ).fetchone()
+            self._write_star(conn, star, row['pk'] if row else None)
+
+    def delete(self, identifier: str):
+        """Delete every star whose ID or name matches the identifier"""
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM stars WHERE id = ? OR name_key = ?', (identifier, identifier.casefold()))
+
+    def save(self, stars: List[Dict]):
+        """Replace the whole roster in one transaction"""
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM contributions')
+            conn.execute('DELETE FROM stars')
+            for star in stars:
+                self._write_star(conn, star)
+
+    def query_contributions(self, month: Optional[str] = None, contrib_type: Optional[str] = None) -> List[Dict]:
+        """Contributions across all stars, filtered in SQL by month prefix and/or type"""
+        clauses, params = [], []
+        if month is not None:
+            clauses.append('month >= ? AND month < ?')
+            params += [month, month + _PREFIX_END]
+        if contrib_type:
+            clauses.append('type_code = ?')
+            params.append(int(resolve_type(contrib_type)))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock:
+            rows = self._connection().execute(
+                f'SELECT * FROM contributions {where} ORDER BY star_pk, position', params
+            ).fetchall()
+        return [freeze(_row_to_record(row, CONTRIBUTION_COLUMNS)) for row in rows]
+
+
+def migrate_json(json_path: Path, db_path: Path) -> int:
+    """Import the JSON roster (snapshot plus pending journal) into SQLite; returns the star count"""
+    stars = [normalize_star(star) for star in StarStore(json_path).load()]
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    SQLiteStarStore(db_path).save(stars)
+    return len(stars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the SQLite storage backend")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    migrate = subcommands.add_parser('migrate', help="Import data/stars.json into the SQLite database")
+    migrate.add_argument('--json', default='data/stars.json', help="JSON file to import")
+    migrate.add_argument('--db', default='data/stars.db', help="SQLite database to (re)create")
+    args = parser.parse_args()
+
+    if args.command == 'migrate':
+        count = migrate_json(Path(args.json), Path(args.db))
+        print(f"Imported {count} stars from {args.json} into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,583 @@
+"""
+Storage layer for the Qdrant Stars Dashboard
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Tuple, Union
+
+from contribution_types import contribution_type, resolve_type
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process locking is available
+    fcntl = None
+
+# Journal entries folded back into the snapshot once the journal gets this long
+JOURNAL_COMPACT_THRESHOLD = 200
+
+
+class StaleStarError(RuntimeError):
+    """Raised when a star changed between being read and being written back"""
+
+
+class ReadOnlyDict(dict):
+    """Dict view of cached star data that refuses in-place edits"""
+
+    __slots__ = ('_derived',)
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached star data is read-only; build a new dict (or use thaw()) to edit it")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def derived(self, key: str, compute):
+        """Memoize `compute(self)` on this record; a changed star is a new record, so it never goes stale"""
+        try:
+            cache = self._derived
+        except AttributeError:
+            cache = self._derived = {}
+        if key not in cache:
+            cache[key] = compute(self)
+        return cache[key]
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (thaw(self),))
+
+
+class ReadOnlyList(list):
+    """List view of cached star data that refuses in-place edits"""
+
+    __slots__ = ('_derived', '_derived_lock')
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached star data is read-only; build a new list (or use thaw()) to edit it")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def derived(self, key: str, compute):
+        """Memoize `compute(self)` on this snapshot (built once even under concurrent reruns); a changed roster is a new snapshot"""
+        try:
+            return self._derived[key]
+        except (AttributeError, KeyError):
+            pass
+        with _derived_locks_lock:
+            try:
+                lock = self._derived_lock
+            except AttributeError:
+                lock = self._derived_lock = threading.RLock()
+                self._derived = {}
+        with lock:
+            if key not in self._derived:
+                self._derived[key] = compute(self)
+            return self._derived[key]
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (list, (thaw(self),))
+
+
+_derived_locks_lock = threading.Lock()
+
+
+def snapshot_derived(stars: List[Dict], key: str, compute):
+    """`compute(stars)` memoized on a load_stars() snapshot; plain (editable) lists can change under us, so they are never cached"""
+    derived = getattr(stars, 'derived', None)
+    if derived is None:
+        return compute(stars)
+    return derived(key, compute)
+
+
+def freeze(value: Any) -> Any:
+    """Recursively wrap parsed JSON in read-only dict/list views"""
+    if isinstance(value, dict):
+        return ReadOnlyDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return ReadOnlyList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively copy (read-only) JSON data into plain, mutable dicts and lists"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def star_version(star: Optional[Dict]) -> Optional[str]:
+    """Content hash of a star record, used for optimistic concurrency checks"""
+    if star is None:
+        return None
+    payload = json.dumps(star, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=12).hexdigest()
+
+
+@contextmanager
+def advisory_lock(path: Path, shared: bool = False) -> Iterator[None]:
+    """Hold an flock on `path` (exclusive unless `shared`); a no-op without fcntl
+
+    Only writers need to create the lock file: a shared lock falls back to
+    opening it read-only, and to no lock at all on a read-only data directory
+    (where no writer can run either).
+    """
+    if fcntl is None:
+        yield
+        return
+    try:
+        f = open(path, 'a')
+    except OSError:
+        if not shared:
+            raise
+        try:
+            f = open(path, 'r')
+        except OSError:
+            yield
+            return
+    with f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write(path: Path, data: Union[bytes, str], durable: bool = True):
+    """Write bytes or UTF-8 text to a temp file and rename it over `path`
+
+    Keeps the permissions of an existing file (0644 for a new one). With
+    `durable`, the file and the rename are fsynced before returning.
+    """
+    path = Path(path)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    if durable:
+        _fsync_dir(path.parent)
+
+
+def atomic_write_json(path: Path, data: Any):
+    """Durably replace `path` with `data` as indented JSON"""
+    atomic_write(path, json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def _fsync_dir(directory: Path):
+    """Persist a rename by syncing its directory (POSIX only)"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def slugify(name: str) -> str:
+    """Slug used for star IDs: lowercase, spaces to underscores, other symbols dropped"""
+    return re.sub(r'[^a-z0-9_]+', '', name.lower().replace(' ', '_'))
+
+
+class StarRepository:
+    """
+    In-memory star roster with hash indexes by id, casefolded name and slug.
+
+    Lookups are O(1) and mirror the old linear scans: when several stars
+    share a key, the one that appears first in the roster wins. Records are
+    replaced wholesale on update, never edited in place, so a repository can
+    hold the frozen records of a cached snapshot.
+    """
+
+    def __init__(self, stars: Iterable[Dict] = ()):
+        self._records: Dict[int, Dict] = {}
+        self._by_id: Dict[str, List[int]] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_slug: Dict[str, List[int]] = {}
+        self._next_key = 0
+        self._stars: Optional[List[Dict]] = None
+        for star in stars:
+            self._insert(star)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def stars(self) -> List[Dict]:
+        """Read-only list of stars in roster order"""
+        if self._stars is None:
+            self._stars = ReadOnlyList(self._records.values())
+        return self._stars
+
+    def copy(self) -> 'StarRepository':
+        """Shallow copy that can be modified without affecting this repository"""
+        clone = StarRepository()
+        clone._records = dict(self._records)
+        clone._by_id = {key: list(keys) for key, keys in self._by_id.items()}
+        clone._by_name = {key: list(keys) for key, keys in self._by_name.items()}
+        clone._by_slug = {key: list(keys) for key, keys in self._by_slug.items()}
+        clone._next_key = self._next_key
+        return clone
+
+    @staticmethod
+    def _index_keys(star: Dict) -> Tuple[Optional[str], str, str]:
+        name = star.get('name', '')
+        return star.get('id'), name.casefold(), slugify(name)
+
+    def _index(self, key: int, star: Dict):
+        star_id, name_key, slug = self._index_keys(star)
+        if star_id:
+            self._by_id.setdefault(star_id, []).append(key)
+        self._by_name.setdefault(name_key, []).append(key)
+        if slug:
+            self._by_slug.setdefault(slug, []).append(key)
+
+    def _unindex(self, key: int, star: Dict):
+        star_id, name_key, slug = self._index_keys(star)
+        for index, index_key in ((self._by_id, star_id), (self._by_name, name_key), (self._by_slug, slug)):
+            keys = index.get(index_key)
+            if keys is None:
+                continue
+            keys.remove(key)
+            if not keys:
+                del index[index_key]
+
+    def _insert(self, star: Dict) -> int:
+        key = self._next_key
+        self._next_key += 1
+        self._records[key] = star
+        self._index(key, star)
+        self._stars = None
+        return key
+
+    def _first(self, index: Dict[str, List[int]], index_key: Optional[str]) -> Optional[int]:
+        # Keys are handed out in increasing order, so the smallest one is the
+        # earliest in the roster (updates keep their original key).
+        keys = index.get(index_key) if index_key else None
+        return min(keys) if keys else None
+
+    def get_by_id(self, star_id: str) -> Optional[Dict]:
+        """Get a star by its exact ID"""
+        key = self._first(self._by_id, star_id)
+        return self._records[key] if key is not None else None
+
+    def get_by_name(self, name: str) -> Optional[Dict]:
+        """Get a star by name (case-insensitive)"""
+        key = self._first(self._by_name, name.casefold())
+        return self._records[key] if key is not None else None
+
+    def get_by_slug(self, slug: str) -> Optional[Dict]:
+        """Get a star by the slug of its name"""
+        key = self._first(self._by_slug, slugify(slug))
+        return self._records[key] if key is not None else None
+
+    def find(self, identifier: str) -> Optional[Dict]:
+        """Get a star by ID or name, falling back to the slug of the identifier"""
+        candidates = [
+            key for key in (
+                self._first(self._by_id, identifier),
+                self._first(self._by_name, identifier.casefold()),
+            )
+            if key is not None
+        ]
+        if candidates:
+            return self._records[min(candidates)]
+        return self.get_by_slug(identifier)
+
+    def upsert(self, star: Dict) -> bool:
+        """Replace the star with the same name in place, or append it; returns True if it existed"""
+        key = self._first(self._by_name, star.get('name', '').casefold())
+        if key is None:
+            self._insert(star)
+            return False
+        self._unindex(key, self._records[key])
+        self._records[key] = star
+        self._index(key, star)
+        self._stars = None
+        return True
+
+    def delete(self, identifier: str) -> int:
+        """Remove every star whose ID or name matches the identifier; returns how many were removed"""
+        keys = set(self._by_id.get(identifier, ())) | set(self._by_name.get(identifier.casefold(), ()))
+        for key in keys:
+            self._unindex(key, self._records.pop(key))
+        if keys:
+            self._stars = None
+        return len(keys)
+
+
+class StarStore:
+    """
+    Process-wide cache of the stars data: a JSON snapshot plus a change journal.
+
+    The snapshot (``stars.json``) is a plain JSON list of stars. Single-star
+    writes are appended to a JSONL journal next to it (``stars.journal.jsonl``)
+    as ``{"op": "upsert", "star": {...}}`` or ``{"op": "delete", "identifier": ...}``
+    entries, and readers replay the journal over the snapshot. Once the journal
+    holds ``compact_threshold`` entries it is folded back into the snapshot.
+    The journal starts with ``{"op": "snapshot", "digest": ...}``, the hash of
+    the snapshot it applies to, so a journal left behind by a crash between
+    rewriting the snapshot and removing the journal is ignored, not replayed
+    over the newer roster.
+
+    Both files are revalidated by stat signature (mtime, size, inode), so
+    repeated reads cost two stat calls; a grown journal is replayed from the
+    last offset instead of re-parsing everything. Readers share one frozen
+    snapshot and must not mutate it.
+
+    Writers serialize on an advisory lock file (``stars.json.lock``) shared
+    by every process, and the snapshot is replaced atomically (temp file,
+    fsync, rename), so readers never see a half-written file.
+    """
+
+    def __init__(self, path: Path, journal_path: Optional[Path] = None,
+                 compact_threshold: int = JOURNAL_COMPACT_THRESHOLD):
+        self.path = Path(path)
+        self.journal_path = Path(journal_path) if journal_path else self.path.with_name(f"{self.path.stem}.journal.jsonl")
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._write_depth = 0
+        self._loaded = False
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._journal_signature: Optional[Tuple[int, int, int]] = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._journal_stale = False
+        self._snapshot_digest: Optional[str] = None
+        self._repository = StarRepository()
+
+    @staticmethod
+    def _stat_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _is_current(self, signature, journal_signature) -> bool:
+        return self._loaded and signature == self._signature and journal_signature == self._journal_signature
+
+    def repository(self) -> StarRepository:
+        """Return the indexed snapshot, re-reading only what changed on disk"""
+        if self._is_current(self._stat_signature(self.path), self._stat_signature(self.journal_path)):
+            return self._repository
+
+        with self._lock, self._read_lock():
+            # Re-stat under the lock so snapshot and journal are seen as a pair
+            signature = self._stat_signature(self.path)
+            journal_signature = self._stat_signature(self.journal_path)
+            if self._is_current(signature, journal_signature):
+                return self._repository
+            if not self._loaded or signature != self._signature or not self._journal_appended(journal_signature):
+                if not self._reload(signature):
+                    return self._repository
+            self._replay_journal(journal_signature)
+            self._loaded = True
+            return self._repository
+
+    def _read_lock(self):
+        # Writers in this thread already hold the exclusive lock
+        if self._write_depth or not self.lock_path.parent.exists():
+            return nullcontext()
+        return advisory_lock(self.lock_path, shared=True)
+
+    @contextmanager
+    def write_lock(self) -> Iterator[StarRepository]:
+        """Serialize a read-modify-write across threads and processes; yields the fresh repository"""
+        with self._lock:
+            lock = advisory_lock(self.lock_path) if self._write_depth == 0 else nullcontext()
+            with lock:
+                self._write_depth += 1
+                try:
+                    yield self.repository()
+                finally:
+                    self._write_depth -= 1
+
+    def _journal_appended(self, journal_signature: Optional[Tuple[int, int, int]]) -> bool:
+        """True if the journal only grew since it was last read (so a tail replay suffices)"""
+        previous = self._journal_signature
+        if journal_signature is None:
+            return previous is None
+        if previous is None:
+            return self._journal_offset == 0
+        return journal_signature[2] == previous[2] and journal_signature[1] >= self._journal_offset
+
+    def _reload(self, signature: Optional[Tuple[int, int, int]]) -> bool:
+        """Re-read the snapshot; on a corrupt file keep the last good data (returns False)"""
+        stars = ReadOnlyList()
+        digest = None
+        if signature is not None:
+            try:
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+                stars = freeze(json.loads(data))
+                digest = _snapshot_digest(data)
+            except FileNotFoundError:
+                pass
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                if self._loaded:
+                    return False
+        self._repository = StarRepository(stars)
+        self._signature = signature
+        self._snapshot_digest = digest
+        self._journal_signature = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._journal_stale = False
+        return True
+
+    def _replay_journal(self, journal_signature: Optional[Tuple[int, int, int]]):
+        self._journal_signature = journal_signature
+        if journal_signature is None:
+            return
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Only consume complete lines; a writer may be mid-append
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return
+        repository = self._repository.copy()
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('op') == 'snapshot':
+                # Written for another snapshot: the roster was rewritten since
+                self._journal_stale = entry.get('digest') != self._snapshot_digest
+                continue
+            if self._journal_stale:
+                continue
+            _apply_journal_entry(repository, entry)
+            self._journal_entries += 1
+        self._repository = repository
+        self._journal_offset += end
+
+    def load(self) -> List[Dict]:
+        """Return the current read-only snapshot of all stars"""
+        return self.repository().stars
+
+    def repository_for(self, stars: List[Dict]) -> Optional[StarRepository]:
+        """Return the cached repository if `stars` is the snapshot it handed out"""
+        repository = self._repository
+        return repository if repository.stars is stars else None
+
+    def upsert(self, star: Dict):
+        """Add or replace (by name) a single star"""
+        self.append({'op': 'upsert', 'star': star})
+
+    def delete(self, identifier: str):
+        """Delete every star whose ID or name matches the identifier"""
+        with self.write_lock() as repository:
+            if repository.get_by_id(identifier) is None and repository.get_by_name(identifier) is None:
+                return
+            self.append({'op': 'delete', 'identifier': identifier})
+
+    def query_contributions(self, month: Optional[str] = None, contrib_type: Optional[str] = None) -> List[Dict]:
+        """Contributions across all stars, filtered by month prefix and/or type (name or alias)"""
+        type_code = resolve_type(contrib_type) if contrib_type else None
+        return [
+            contrib
+            for star in self.load()
+            for contrib in star.get('contributions', [])
+            if (month is None or contrib.get('month', '').startswith(month))
+            and (type_code is None or contribution_type(contrib) == type_code)
+        ]
+
+    def append(self, entry: Dict):
+        """Record one change in the journal (O(record)), compacting once it is long enough"""
+        with self.write_lock():
+            if self._journal_stale:
+                self._drop_journal()
+            lines = [json.dumps(entry, ensure_ascii=False) + '\n']
+            if self._journal_signature is None:
+                lines.insert(0, json.dumps({'op': 'snapshot', 'digest': self._snapshot_digest}) + '\n')
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+            self.repository()
+            if self._journal_entries >= self.compact_threshold:
+                self.compact()
+
+    def compact(self):
+        """Fold the journal into the snapshot and start a fresh journal"""
+        with self.write_lock() as repository:
+            self.save(repository.stars)
+
+    def save(self, stars: List[Dict]):
+        """Replace the whole roster: atomically rewrite the snapshot and drop the journal"""
+        with self.write_lock():
+            atomic_write_json(self.path, stars)
+            # A crash before this leaves a journal whose digest no longer matches
+            self._drop_journal()
+            self.invalidate()
+
+    def _drop_journal(self):
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self._journal_signature = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._journal_stale = False
+
+    def invalidate(self):
+        """Forget the cached snapshot so the next load re-reads the files"""
+        with self._lock:
+            self._loaded = False
+
+
+def _snapshot_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _apply_journal_entry(repository: StarRepository, entry: Dict):
+    """Apply one journal entry to a repository"""
+    op = entry.get('op')
+    if op == 'upsert' and isinstance(entry.get('star'), dict):
+        repository.upsert(freeze(entry['star']))
+    elif op == 'delete' and entry.get('identifier') is not None:
+        repository.delete(entry['identifier'])
@@ -0,0 +1,61 @@
+"""Contribution cube: month axis bounds, leaderboards, trends and streaks"""
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('pandas')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import ContributionCube  # noqa: E402
+from month_index import current_month_key, month_label  # noqa: E402
+
+
+def ago(months):
+    return month_label(current_month_key() - months)
+
+
+STARS = [
+    {'name': 'Ada', 'contributions': [
+        {'type': 'YouTube', 'month': ago(2)},
+        {'type': 'Medium', 'month': ago(1)},
+        {'type': 'Medium', 'month': ago(0)},
+    ]},
+    {'name': 'Grace', 'contributions': [
+        {'type': 'Medium', 'month': ago(2)},
+        {'type': 'Medium', 'month': '0202-10'},  # mistyped year
+        {'type': 'Other'},
+    ]},
+]
+
+
+def test_month_axis_ignores_implausible_months():
+    cube = ContributionCube(STARS)
+    assert cube.months == [ago(2), ago(1), ago(0)]
+    assert cube.counts.shape[:2] == (2, 3)
+    assert cube.undated == 2
+
+
+def test_leaderboard():
+    cube = ContributionCube(STARS)
+    board = cube.leaderboard()
+    assert list(board['Star']) == ['Ada', 'Grace']
+    assert list(board['Total']) == [3, 1]
+    assert list(cube.leaderboard(start=ago(1))['Star']) == ['Ada']
+
+
+def test_trend_and_streaks():
+    cube = ContributionCube(STARS)
+    assert list(cube.trend()['Total']) == [2, 1, 1]
+    assert list(cube.trend()['Change']) == [0, -1, 0]
+    streaks = cube.streaks(through=ago(0)).set_index('Star')
+    assert streaks.loc['Ada', 'Current streak'] == 3
+    assert streaks.loc['Grace', 'Current streak'] == 0
+    assert streaks.loc['Grace', 'Longest streak'] == 1
+
+
+def test_empty_roster():
+    cube = ContributionCube([])
+    assert cube.months == []
+    assert cube.leaderboard().empty
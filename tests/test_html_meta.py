@@ -0,0 +1,78 @@
+"""Encoding detection of the streamed <head> parser"""
+import http.server
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractors import og_fetch  # noqa: E402
+from html_meta import parse_head, sniff_encoding  # noqa: E402
+from http_client import HttpClient, header_charset  # noqa: E402
+
+UTF8_PAGE = "<html><head><meta charset='utf-8'><title>Café — naïve</title></head><body></body></html>".encode('utf-8')
+
+
+@pytest.fixture
+def stub_server():
+    """Serves (content type, body) set by the test at every path, under served['header'] if set"""
+    served = {}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            content_type, body = served['page']
+            self.send_response(200)
+            self.send_header(served.get('header', 'Content-Type'), content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield served, f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_header_charset():
+    assert header_charset('text/html') is None
+    assert header_charset('text/html; charset="UTF-8"') == 'UTF-8'
+    assert header_charset('text/html;CHARSET=windows-1252') == 'windows-1252'
+
+
+@pytest.mark.parametrize('data, declared, expected', [
+    (b'<title>x</title>', None, 'utf-8'),
+    (b"<meta charset='utf-8'>", None, 'utf-8'),
+    (b'<meta http-equiv="Content-Type" content="text/html; charset=windows-1252">', None, 'cp1252'),
+    (b'<meta charset="utf-8">', 'iso-8859-1', 'iso8859-1'),
+    (b'\xef\xbb\xbf<title>x</title>', 'iso-8859-1', 'utf-8-sig'),
+    (b'<meta charset="no-such-codec">', None, 'utf-8'),
+])
+def test_sniff_encoding(data, declared, expected):
+    assert sniff_encoding(data, declared) == expected
+
+
+def test_parse_head_without_declared_charset_is_utf8():
+    # Split inside a multi-byte character and inside the <meta> tag
+    chunks = [UTF8_PAGE[:10], UTF8_PAGE[10:52], UTF8_PAGE[52:]]
+    assert parse_head(chunks).title == 'Café — naïve'
+
+
+def test_og_fetch_html_without_charset_header(stub_server):
+    served, url = stub_server
+    served['page'] = ('text/html', UTF8_PAGE)
+    metadata = og_fetch('og:title', 'title')(HttpClient(), url, 5)
+    assert metadata['title'] == 'Café — naïve'
+
+
+@pytest.mark.parametrize('header', ['Content-Type', 'content-type'])
+def test_og_fetch_respects_header_charset(stub_server, header):
+    served, url = stub_server
+    served['header'] = header
+    served['page'] = ('text/html; charset=windows-1252', '<title>Café</title>'.encode('cp1252'))
+    assert og_fetch('title')(HttpClient(), url, 5)['title'] == 'Café'
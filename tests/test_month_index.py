@@ -0,0 +1,90 @@
+"""Month keys, month ranges and MonthIndex range queries"""
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from month_index import (MonthIndex, current_quarter, last_months, month_key, month_label,  # noqa: E402
+                         month_range, plausible_months, previous_month, quarter)
+
+TODAY = date(2024, 3, 15)
+STARS = [
+    {'name': 'Ada', 'contributions': [
+        {'title': 'a1', 'month': '2023-11'},
+        {'title': 'a2', 'month': '2024-01'},
+        {'title': 'a3', 'month': '2024-03'},
+    ]},
+    {'name': 'Grace', 'contributions': [
+        {'title': 'g1', 'month': '2024-01'},
+        {'title': 'g2', 'month': 'soon'},
+        {'title': 'g3'},
+    ]},
+    {'name': 'Linus', 'contributions': [
+        {'title': 'l1', 'month': '2024-02-10'},
+    ]},
+]
+
+
+def titles(contributions):
+    return [contrib['title'] for contrib in contributions]
+
+
+@pytest.mark.parametrize('month, key', [
+    ('2024-01', 2024 * 12),
+    ('2024-12', 2024 * 12 + 11),
+    (' 2024-02-10', 2024 * 12 + 1),
+    ('2024-13', None),
+    ('2024', None),
+    ('', None),
+    (None, None),
+])
+def test_month_key(month, key):
+    assert month_key(month) == key
+
+
+def test_month_label_inverts_month_key():
+    assert month_label(month_key('0999-07')) == '0999-07'
+    assert month_label(month_key('2024-12')) == '2024-12'
+
+
+def test_calendar_ranges():
+    march = month_key('2024-03')
+    assert last_months(3, TODAY) == (march - 2, march)
+    assert previous_month(TODAY) == (march - 1, march - 1)
+    assert quarter(2024, 1) == (month_key('2024-01'), march)
+    assert current_quarter(TODAY) == quarter(2024, 1)
+    assert current_quarter(TODAY, offset=-1) == quarter(2023, 4)
+    assert month_range('2024-01', None) == (month_key('2024-01'), None)
+    assert plausible_months(TODAY) == (march - 30 * 12, march + 12)
+    with pytest.raises(ValueError):
+        quarter(2024, 5)
+
+
+@pytest.mark.parametrize('bounds, expected', [
+    ((None, None), ['a1', 'a2', 'g1', 'l1', 'a3']),
+    (('2024-01', '2024-01'), ['a2', 'g1']),
+    (('2024-01', '2024-02'), ['a2', 'g1', 'l1']),
+    (('2024-02', None), ['l1', 'a3']),
+    ((None, '2023-12'), ['a1']),
+    (('2023-12', '2023-12'), []),
+    (('2025-01', '2025-12'), []),
+])
+def test_entries_in_range(bounds, expected):
+    index = MonthIndex(STARS)
+    requested = month_range(*bounds)
+    assert titles(index.contributions(requested)) == expected
+    assert index.count(requested) == len(expected)
+
+
+def test_undated_contributions():
+    assert titles(entry.contribution for entry in MonthIndex(STARS).undated) == ['g2', 'g3']
+
+
+def test_active_stars_and_months():
+    index = MonthIndex(STARS)
+    assert [star['name'] for star in index.active_stars(quarter(2024, 1))] == ['Ada', 'Grace', 'Linus']
+    assert [star['name'] for star in index.active_stars(month_range('2024-03', '2024-03'))] == ['Ada']
+    assert index.months() == ['2023-11', '2024-01', '2024-02', '2024-03']
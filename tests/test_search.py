@@ -0,0 +1,89 @@
+"""Full-text search and fuzzy name lookups"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search import (SearchIndex, find_star_fuzzy, fuzzy_find_stars, get_search_index, normalize_text,  # noqa: E402
+                    search_stars)
+from storage import ReadOnlyList, freeze  # noqa: E402
+
+STARS = [
+    {'id': 'jose_garcia', 'name': 'José García', 'role': 'Developer Advocate', 'bio': 'Talks about RAG',
+     'contributions': [{'title': 'Hybrid retrieval in practice', 'description': 'BM25 plus search'}]},
+    {'id': 'anna_schmidt', 'name': 'Anna Schmidt', 'role': 'Search Engineer', 'bio': 'Quantization nerd',
+     'contributions': [{'title': 'Vector retrieval at scale', 'description': 'Sharding'}]},
+    {'id': 'john_doe', 'name': 'John Doe', 'role': 'Data Scientist', 'bio': 'Joins search and LLMs',
+     'contributions': []},
+]
+
+
+def names(stars):
+    return [star['name'] for star in stars]
+
+
+def test_normalize_text_drops_case_and_accents():
+    assert normalize_text('José GARCÍA') == 'jose garcia'
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('jose', ['José García']),
+    ('JOSÉ garcía', ['José García']),
+    ('vector ret', ['Anna Schmidt']),
+    ('hybrid', ['José García']),
+    ('nothing matches', []),
+])
+def test_search_matches_every_word(query, expected):
+    assert names(SearchIndex(STARS).search(query)) == expected
+
+
+def test_search_ranks_by_field_weight():
+    # Role (Anna) beats bio (John) beats a contribution description (José)
+    assert names(SearchIndex(STARS).search('search')) == ['Anna Schmidt', 'John Doe', 'José García']
+
+
+def test_prefix_matches_rank_by_field():
+    # 'sc' prefixes Anna's name ('schmidt') and only John's role ('scientist')
+    assert names(SearchIndex(STARS).search('sc')) == ['Anna Schmidt', 'John Doe']
+    # Ties keep roster order
+    assert names(SearchIndex(STARS).search('jo')) == ['José García', 'John Doe']
+
+
+def test_empty_query_returns_roster_order():
+    assert names(SearchIndex(STARS).search('  ')) == names(STARS)
+
+
+def test_limit():
+    assert len(SearchIndex(STARS).search('search', limit=2)) == 2
+
+
+def test_index_is_memoized_per_snapshot():
+    snapshot = ReadOnlyList(freeze(star) for star in STARS)
+    assert get_search_index(snapshot) is get_search_index(snapshot)
+    assert names(search_stars(snapshot, 'anna')) == ['Anna Schmidt']
+    # Plain lists are indexed on every call
+    assert get_search_index(STARS) is not get_search_index(STARS)
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('Jose Garcia', 'José García'),
+    ('Ana Shmidt', 'Anna Schmidt'),
+    ('john_doe', 'John Doe'),
+    ('jon doe', 'John Doe'),
+])
+def test_fuzzy_find_tolerates_typos(query, expected):
+    score, star = fuzzy_find_stars(STARS, query)[0]
+    assert star['name'] == expected
+    assert 0 < score <= 1
+
+
+def test_fuzzy_find_orders_by_score():
+    scores = [score for score, _ in fuzzy_find_stars(STARS, 'jo', min_score=0)]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_find_star_fuzzy_needs_a_close_match():
+    assert find_star_fuzzy(STARS, 'Anna Schmit')['name'] == 'Anna Schmidt'
+    assert find_star_fuzzy(STARS, 'Zebra') is None
@@ -0,0 +1,82 @@
+"""SQLite backend: migration from JSON and parity of queries and writes with the JSON store"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contribution_types import normalize_star  # noqa: E402
+from sqlite_storage import SQLiteStarStore, migrate_json  # noqa: E402
+from storage import StarStore, thaw  # noqa: E402
+
+ROSTER = [normalize_star(star) for star in [
+    {'id': 'ada', 'name': 'Ada', 'role': 'Engineer', 'bio': 'Engines', 'pronouns': 'she/her', 'contributions': [
+        {'type': 'YouTube', 'title': 'Talk', 'url': 'https://youtu.be/x', 'month': '2024-01'},
+        {'type': 'medium', 'title': 'Post', 'url': 'https://medium.com/p', 'month': '2024-02',
+         'description': 'Vectors'},
+    ]},
+    {'id': 'grace', 'name': 'Grace', 'contributions': [
+        {'type': 'Meetups', 'title': 'Meetup', 'url': 'https://lu.ma/x', 'month': '2024-01', 'attendees': 40},
+        {'type': 'Other', 'title': 'Undated', 'url': 'https://example.com'},
+    ]},
+    {'id': 'linus', 'name': 'Linus', 'role': 'Maintainer', 'contributions': []},
+]]
+
+
+@pytest.fixture
+def stores(tmp_path):
+    json_store = StarStore(tmp_path / 'stars.json')
+    json_store.save(ROSTER)
+    # A pending journal entry must be migrated too
+    json_store.upsert(normalize_star({'id': 'barbara', 'name': 'Barbara', 'contributions': [
+        {'type': 'Open Source', 'title': 'Patch', 'url': 'https://github.com/x/y', 'month': '2024-02'},
+    ]}))
+    assert migrate_json(json_store.path, tmp_path / 'stars.db') == 4
+    return json_store, SQLiteStarStore(tmp_path / 'stars.db')
+
+
+def test_migrate_keeps_every_field(stores):
+    json_store, sqlite_store = stores
+    assert thaw(sqlite_store.load()) == thaw(json_store.load())
+
+
+@pytest.mark.parametrize('month, contrib_type', [
+    (None, None),
+    ('2024-01', None),
+    ('2024', None),
+    ('2023-12', None),
+    (None, 'YouTube'),
+    (None, 'meetups'),
+    ('2024-02', 'Open Source'),
+])
+def test_query_contributions_parity(stores, month, contrib_type):
+    json_store, sqlite_store = stores
+    expected = thaw(json_store.query_contributions(month=month, contrib_type=contrib_type))
+    assert thaw(sqlite_store.query_contributions(month=month, contrib_type=contrib_type)) == expected
+
+
+@pytest.mark.parametrize('identifier', ['grace', 'LINUS', 'nobody'])
+def test_delete_parity(stores, identifier):
+    json_store, sqlite_store = stores
+    json_store.delete(identifier)
+    sqlite_store.delete(identifier)
+    assert thaw(sqlite_store.load()) == thaw(json_store.load())
+
+
+def test_upsert_replaces_by_name(stores):
+    json_store, sqlite_store = stores
+    updated = normalize_star({**thaw(json_store.load()[0]), 'role': 'Countess', 'contributions': []})
+    json_store.upsert(updated)
+    sqlite_store.upsert(updated)
+    assert thaw(sqlite_store.load()) == thaw(json_store.load())
+    assert sqlite_store.load()[0]['role'] == 'Countess'
+    assert sqlite_store.query_contributions(month='2024-01') == json_store.query_contributions(month='2024-01')
+
+
+def test_other_connection_sees_writes(stores, tmp_path):
+    _, sqlite_store = stores
+    reader = SQLiteStarStore(tmp_path / 'stars.db')
+    assert len(reader.load()) == 4
+    sqlite_store.delete('ada')
+    assert [star['name'] for star in reader.load()] == ['Grace', 'Linus', 'Barbara']
@@ -0,0 +1,142 @@
+"""Journaled JSON store: replay, compaction, crash safety, locking and version checks"""
+import builtins
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage  # noqa: E402
+import utils  # noqa: E402
+from storage import StaleStarError, StarStore, atomic_write_json, star_version, thaw  # noqa: E402
+
+
+def star(name, **fields):
+    return {'id': storage.slugify(name), 'name': name, 'contributions': [], **fields}
+
+
+def names(store):
+    return [record['name'] for record in store.load()]
+
+
+def journal_lines(store):
+    with open(store.journal_path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StarStore(tmp_path / 'stars.json', compact_threshold=3)
+    store.save([star('Ada'), star('Grace')])
+    return store
+
+
+def test_upsert_and_delete_append_to_the_journal(store):
+    store.upsert(star('Linus'))
+    store.upsert(star('Ada', role='Engineer'))
+    assert [entry['op'] for entry in journal_lines(store)] == ['snapshot', 'upsert', 'upsert']
+    # The snapshot is untouched until compaction
+    with open(store.path, encoding='utf-8') as f:
+        assert [record['name'] for record in json.load(f)] == ['Ada', 'Grace']
+    assert names(store) == ['Ada', 'Grace', 'Linus']
+    assert store.load()[0]['role'] == 'Engineer'
+
+
+def test_other_store_replays_the_journal(store):
+    store.upsert(star('Linus'))
+    other = StarStore(store.path)
+    assert names(other) == ['Ada', 'Grace', 'Linus']
+    store.delete('grace')
+    assert names(other) == ['Ada', 'Linus']
+
+
+def test_partial_journal_line_is_ignored(store):
+    store.upsert(star('Linus'))
+    with open(store.journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "upsert", "star": {"name": "Half')
+    assert names(StarStore(store.path)) == ['Ada', 'Grace', 'Linus']
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(store):
+    for name in ('Linus', 'Guido', 'Barbara'):
+        store.upsert(star(name))
+    assert not store.journal_path.exists()
+    with open(store.path, encoding='utf-8') as f:
+        assert [record['name'] for record in json.load(f)] == ['Ada', 'Grace', 'Linus', 'Guido', 'Barbara']
+    assert names(StarStore(store.path)) == ['Ada', 'Grace', 'Linus', 'Guido', 'Barbara']
+
+
+def test_save_drops_the_journal(store):
+    store.upsert(star('Linus'))
+    store.save([star('Margaret')])
+    assert not store.journal_path.exists()
+    assert names(store) == ['Margaret']
+    assert names(StarStore(store.path)) == ['Margaret']
+
+
+def test_journal_from_before_a_snapshot_rewrite_is_skipped(store):
+    store.upsert(star('Linus'))
+    # Crash between rewriting the snapshot and removing the journal
+    atomic_write_json(store.path, [star('Margaret')])
+    reader = StarStore(store.path)
+    assert names(reader) == ['Margaret']
+    # The next write replaces the stale journal instead of appending to it
+    reader.upsert(star('Barbara'))
+    assert [entry['op'] for entry in journal_lines(reader)] == ['snapshot', 'upsert']
+    assert names(StarStore(store.path)) == ['Margaret', 'Barbara']
+
+
+def test_journal_without_header_is_replayed(store):
+    with open(store.journal_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'op': 'upsert', 'star': star('Linus')}) + '\n')
+    assert names(StarStore(store.path)) == ['Ada', 'Grace', 'Linus']
+
+
+def test_snapshot_is_read_only(store):
+    with pytest.raises(TypeError):
+        store.load()[0]['name'] = 'Changed'
+    with pytest.raises(TypeError):
+        store.load().append(star('Linus'))
+
+
+def test_reader_without_a_writable_lock_file(store, monkeypatch):
+    real_open = builtins.open
+
+    def read_only_open(path, mode='r', *args, **kwargs):
+        if str(path) == str(store.lock_path) and mode != 'r':
+            raise PermissionError(13, 'Read-only file system', str(path))
+        return real_open(path, mode, *args, **kwargs)
+
+    os.remove(store.lock_path)
+    monkeypatch.setattr(builtins, 'open', read_only_open)
+    assert names(StarStore(store.path)) == ['Ada', 'Grace']
+    with pytest.raises(PermissionError):
+        StarStore(store.path).upsert(star('Linus'))
+
+
+@pytest.fixture
+def utils_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = StarStore(tmp_path / 'data' / 'stars.json')
+    monkeypatch.setattr(utils, '_star_store', store)
+    utils.ensure_data_dir()
+    utils.save_stars([star('Ada', role='Engineer')])
+    return store
+
+
+def test_add_or_update_star_with_current_version(utils_store):
+    current = utils.get_star_by_name(utils.load_stars(), 'Ada')
+    utils.add_or_update_star({**thaw(current), 'role': 'Mathematician'}, expected_version=star_version(current))
+    assert utils.get_star_by_name(utils.load_stars(), 'Ada')['role'] == 'Mathematician'
+
+
+def test_stale_star_error_on_version_mismatch(utils_store):
+    read = utils.get_star_by_name(utils.load_stars(), 'Ada')
+    version = star_version(read)
+    # Someone else saves first
+    utils.add_or_update_star({**thaw(read), 'role': 'Countess'})
+    with pytest.raises(StaleStarError):
+        utils.add_or_update_star({**thaw(read), 'role': 'Mathematician'}, expected_version=version)
+    assert utils.get_star_by_name(utils.load_stars(), 'Ada')['role'] == 'Countess'
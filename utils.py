@@ -1,108 +1,131 @@
 """
 Utility functions for the Qdrant Stars Dashboard
 """
-import json
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import re
+import threading
+from typing import Callable, List, Dict, Optional
 from pathlib import Path
 
+from contribution_types import extract_youtube_id, normalize_contribution, normalize_star, resolve_type, type_info
+from http_client import HttpClient
+from instrumentation import metrics, timed
+from month_index import MonthRange, current_month_key, get_month_index, month_key, month_label, plausible_months
+from storage import StaleStarError, StarRepository, StarStore, slugify, star_version
+
 # Data directory
 DATA_DIR = Path("data")
 STARS_FILE = DATA_DIR / "stars.json"
 
+METADATA_CACHE_FILE = DATA_DIR / "metadata_cache.db"
+
+# Storage backend: "json" (STARS_FILE, default) or "sqlite" (STARS_DB)
+STARS_BACKEND = os.getenv("STARS_BACKEND", "json").lower()
+STARS_DB = Path(os.getenv("STARS_DB", str(DATA_DIR / "stars.db")))
+
+def _create_star_store():
+    """Create the configured storage backend"""
+    if STARS_BACKEND == "json":
+        return StarStore(STARS_FILE)
+    if STARS_BACKEND == "sqlite":
+        from sqlite_storage import SQLiteStarStore
+        return SQLiteStarStore(STARS_DB)
+    raise ValueError(f"Unknown STARS_BACKEND {STARS_BACKEND!r} (expected 'json' or 'sqlite')")
+
+# Shared, process-wide store (one parse/query serves every session)
+_star_store = _create_star_store()
+
 def ensure_data_dir():
     """Create data directory if it doesn't exist"""
     DATA_DIR.mkdir(exist_ok=True)
 
+@timed('load_stars')
 def load_stars() -> List[Dict]:
-    """Load stars data from JSON file"""
+    """Load stars data (read-only, cached until the JSON file changes)"""
     ensure_data_dir()
-    if not STARS_FILE.exists():
-        return []
-    
-    try:
-        with open(STARS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    return _star_store.load()
 
 def save_stars(stars: List[Dict]):
-    """Save stars data to JSON file"""
+    """Save stars data, replacing the whole roster"""
     ensure_data_dir()
-    with open(STARS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(stars, f, indent=2, ensure_ascii=False)
+    _star_store.save([normalize_star(star) for star in stars])
 
 def generate_id_from_name(name: str) -> str:
     """Generate a unique ID from name (slug-like)"""
-    import re
-    # Convert to lowercase, replace spaces with underscores, remove special chars
-    id_str = re.sub(r'[^a-z0-9_]+', '', name.lower().replace(' ', '_'))
-    return id_str
+    # Lowercase, spaces become underscores, other special chars are removed
+    return slugify(name)
+
+def _repository_for(stars: List[Dict]) -> StarRepository:
+    """Indexed view of `stars` (free for the cached snapshot, O(n) otherwise)"""
+    repository = _star_store.repository_for(stars)
+    return repository if repository is not None else StarRepository(stars)
 
 def get_star_by_id(stars: List[Dict], identifier: str) -> Optional[Dict]:
     """Get a star by ID or name (backward compatible)"""
-    for star in stars:
-        # Try by ID first (for backward compatibility)
-        if star.get('id') == identifier:
-            return star
-        # Try by name
-        if star.get('name', '').lower() == identifier.lower():
-            return star
-    return None
+    return _repository_for(stars).find(identifier)
 
 def get_star_by_name(stars: List[Dict], name: str) -> Optional[Dict]:
     """Get a star by name"""
-    for star in stars:
-        if star.get('name', '').lower() == name.lower():
-            return star
-    return None
+    return _repository_for(stars).get_by_name(name)
 
-def add_or_update_star(star_data: Dict):
+def add_or_update_star(star_data: Dict, expected_version: Optional[str] = None):
     """Add a new star or update existing one"""
-    stars = load_stars()
+    ensure_data_dir()
     
     # Generate ID from name if not provided
     if 'id' not in star_data or not star_data.get('id'):
         star_data['id'] = generate_id_from_name(star_data.get('name', ''))
     
-    # Check if star exists by name (primary identifier)
-    existing_idx = None
-    star_name = star_data.get('name', '').lower()
-    
-    for idx, star in enumerate(stars):
-        if star.get('name', '').lower() == star_name:
-            existing_idx = idx
-            break
-    
-    if existing_idx is not None:
-        # Update existing star, preserve contributions if not provided
-        if 'contributions' not in star_data:
-            star_data['contributions'] = stars[existing_idx].get('contributions', [])
-        stars[existing_idx] = star_data
-    else:
-        # Add new star
+    # Hold the write lock across read-modify-write so concurrent admins can't lose updates
+    with _star_store.write_lock() as repository:
+        # Existing stars are matched by name (primary identifier)
+        existing = repository.get_by_name(star_data.get('name', ''))
+        
+        # Optimistic check: refuse to overwrite a star someone else changed since it was read
+        if expected_version is not None and star_version(existing) != expected_version:
+            raise StaleStarError(f"Star '{star_data.get('name', '')}' was modified by someone else")
+        
         if 'contributions' not in star_data:
-            star_data['contributions'] = []
-        stars.append(star_data)
-    
-    save_stars(stars)
+            # Preserve contributions on update, start empty for a new star
+            star_data['contributions'] = existing.get('contributions', []) if existing else []
+        
+        # Store canonical contribution types (e.g. "meetups" -> "Meetups/Events")
+        star_data['contributions'] = [normalize_contribution(c) for c in star_data['contributions']]
+        
+        # Only this star is written (a journal entry or a few SQL rows)
+        _star_store.upsert(star_data)
 
 def delete_star(identifier: str):
     """Delete a star by ID or name"""
-    stars = load_stars()
-    stars = [
-        star for star in stars 
-        if star.get('id') != identifier and star.get('name', '').lower() != identifier.lower()
-    ]
-    save_stars(stars)
+    ensure_data_dir()
+    _star_store.delete(identifier)
+
+def update_stars(update: Callable[[List[Dict]], List[Dict]]):
+    """Apply `update` to the current roster and save its result in one write, under the write lock"""
+    ensure_data_dir()
+    with _star_store.write_lock() as repository:
+        save_stars(update(repository.stars))
 
-def get_current_month_contributions(contributions: List[Dict]) -> List[Dict]:
-    """Get contributions for the current month"""
-    current_month = datetime.now().strftime('%Y-%m')
+def get_contributions(month: Optional[str] = None, contrib_type: Optional[str] = None) -> List[Dict]:
+    """Get contributions across all stars, optionally filtered by month (prefix) and type"""
+    ensure_data_dir()
+    return _star_store.query_contributions(month=month, contrib_type=contrib_type)
+
+def get_contributions_in_range(month_range: MonthRange) -> List[Dict]:
+    """Contributions across all stars in an inclusive month-key range (see month_index.last_months, quarter, ...)"""
+    return get_month_index(load_stars()).contributions(month_range)
+
+def get_current_month_contributions(contributions: Optional[List[Dict]] = None) -> List[Dict]:
+    """Get contributions for the current month (across all stars if no list is given)"""
+    current = current_month_key()
+    if contributions is None:
+        if STARS_BACKEND == "sqlite":
+            # Indexed range query in SQL instead of loading the whole roster
+            return get_contributions(month=month_label(current))
+        return get_contributions_in_range((current, current))
     return [
         contrib for contrib in contributions
-        if contrib.get('month', '').startswith(current_month)
+        if month_key(contrib.get('month', '')) == current
     ]
 
 def validate_url(url: str, url_type: str) -> bool:
@@ -111,29 +134,22 @@ def validate_url(url: str, url_type: str) -> bool:
         return False
     
     url = url.strip()
+    info = type_info(resolve_type(url_type))
     
-    if url_type == 'youtube':
-        return 'youtube.com' in url or 'youtu.be' in url
-    elif url_type == 'medium':
-        return 'medium.com' in url or 'towardsdatascience.com' in url
-    elif url_type == 'linkedin':
-        return 'linkedin.com' in url
-    elif url_type == 'substack':
-        return 'substack.com' in url
-    elif url_type in ['meetups/events', 'meetups', 'events']:
-        return True  # Any URL is valid for meetups/events
-    elif url_type in ['open source', 'opensource']:
-        return True  # Any URL is valid for open source (GitHub, GitLab, etc.)
+    if info.url_hosts:
+        return any(host in url for host in info.url_hosts)
+    if info.any_url:
+        return True  # e.g. meetups/events and open source (GitHub, GitLab, etc.)
     
     return url.startswith('http://') or url.startswith('https://')
 
-def extract_youtube_id(url: str) -> Optional[str]:
-    """Extract YouTube video ID from URL"""
-    if 'youtube.com/watch?v=' in url:
-        return url.split('v=')[1].split('&')[0]
-    elif 'youtu.be/' in url:
-        return url.split('youtu.be/')[1].split('?')[0]
-    return None
+def validate_month(month: str) -> bool:
+    """'YYYY-MM' within month_index.plausible_months() (catches typos like '0202-10')"""
+    if not re.fullmatch(r'\d{4}-\d{2}', (month or '').strip()):
+        return False
+    key = month_key(month)
+    earliest, latest = plausible_months()
+    return key is not None and earliest <= key <= latest
 
 # Admin credentials (default - should be changed in production)
 # In production, use environment variables or Streamlit secrets
@@ -151,175 +167,51 @@ def verify_admin_credentials(username: str, password: str) -> bool:
     admin_username, admin_password = get_admin_credentials()
     return username == admin_username and password == admin_password
 
-def extract_youtube_metadata(url: str) -> Dict:
-    """Extract metadata from YouTube URL"""
-    try:
-        import requests
-        video_id = extract_youtube_id(url)
-        if not video_id:
-            return {}
-        
-        # Use YouTube oEmbed API
-        oembed_url = f"https://www.youtube.com/oembed?url={url}&format=json"
-        response = requests.get(oembed_url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                'title': data.get('title', ''),
-                'author': data.get('author_name', ''),
-                'thumbnail': data.get('thumbnail_url', '')
-            }
-    except Exception:
-        pass
-    return {}
-
-def extract_medium_metadata(url: str) -> Dict:
-    """Extract metadata from Medium article URL"""
-    try:
-        import requests
-        from bs4 import BeautifulSoup
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Try to find title
-            title = ''
-            if soup.find('h1'):
-                title = soup.find('h1').get_text().strip()
-            elif soup.find('title'):
-                title = soup.find('title').get_text().strip()
-            
-            # Try to find description
-            description = ''
-            meta_desc = soup.find('meta', property='og:description')
-            if meta_desc:
-                description = meta_desc.get('content', '')
-            
-            return {
-                'title': title,
-                'description': description
-            }
-    except Exception:
-        pass
-    return {}
-
-def extract_linkedin_metadata(url: str) -> Dict:
-    """Extract metadata from LinkedIn post URL"""
-    try:
-        import requests
-        from bs4 import BeautifulSoup
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Try to find title
-            title = ''
-            meta_title = soup.find('meta', property='og:title')
-            if meta_title:
-                title = meta_title.get('content', '')
-            elif soup.find('title'):
-                title = soup.find('title').get_text().strip()
-            
-            # Try to find description
-            description = ''
-            meta_desc = soup.find('meta', property='og:description')
-            if meta_desc:
-                description = meta_desc.get('content', '')
-            
-            return {
-                'title': title,
-                'description': description
-            }
-    except Exception:
-        pass
-    return {}
-
-def extract_substack_metadata(url: str) -> Dict:
-    """Extract metadata from Substack article URL"""
-    try:
-        import requests
-        from bs4 import BeautifulSoup
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Try to find title
-            title = ''
-            meta_title = soup.find('meta', property='og:title')
-            if meta_title:
-                title = meta_title.get('content', '')
-            elif soup.find('h1'):
-                title = soup.find('h1').get_text().strip()
-            elif soup.find('title'):
-                title = soup.find('title').get_text().strip()
-            
-            # Try to find description
-            description = ''
-            meta_desc = soup.find('meta', property='og:description')
-            if meta_desc:
-                description = meta_desc.get('content', '')
-            
-            return {
-                'title': title,
-                'description': description
-            }
-    except Exception:
-        pass
-    return {}
+# Shared pooled HTTP client (keep-alive, retries with backoff, size-capped bodies);
+# `requests` itself is only imported by the first request
+HTTP_POOL_SIZE = 32
+http_client = HttpClient(pool_size=HTTP_POOL_SIZE)
+
+# Extraction code (extractors, html parser, SQLite metadata cache) is loaded on
+# first use only, so the dashboard never imports it
+_extractors = None
+_extractors_lock = threading.Lock()
+
+_EXTRACTOR_ALIASES = {
+    'extract_youtube_metadata': 'youtube',
+    'extract_medium_metadata': 'medium',
+    'extract_linkedin_metadata': 'linkedin',
+    'extract_substack_metadata': 'substack',
+    'extract_generic_metadata': 'generic',
+}
+
+def _extractor_gauges() -> Dict[str, float]:
+    """Per-extractor counters as '<name>_<counter>' gauges"""
+    return {
+        f"{name}_{key}": value
+        for name, counters in _extractors.stats().items()
+        for key, value in counters.items()
+    }
+
+def get_extractors():
+    """URL metadata extractors by contribution type and host (see extractors.BUILTIN_EXTRACTORS)"""
+    global _extractors
+    if _extractors is None:
+        with _extractors_lock:
+            if _extractors is None:
+                from extractors import ExtractorRegistry
+                from metadata_cache import MetadataCache
+                # Persistent cache of extracted URL metadata (keyed by normalized URL, TTL + LRU)
+                _extractors = ExtractorRegistry(http_client, MetadataCache(METADATA_CACHE_FILE))
+                metrics.register_collector('extractor', _extractor_gauges)
+    return _extractors
+
+def __getattr__(name: str):
+    """Per-site extractors (utils.extract_medium_metadata, ...), resolved lazily"""
+    if name in _EXTRACTOR_ALIASES:
+        return get_extractors().get(_EXTRACTOR_ALIASES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def extract_url_metadata(url: str, url_type: str) -> Dict:
     """Extract metadata from URL based on type"""
-    if url_type.lower() == 'youtube':
-        return extract_youtube_metadata(url)
-    elif url_type.lower() == 'medium':
-        return extract_medium_metadata(url)
-    elif url_type.lower() == 'substack':
-        return extract_substack_metadata(url)
-    elif url_type.lower() == 'linkedin':
-        # LinkedIn doesn't extract metadata - just use the link
-        return {}
-    
-    # Generic extraction for other URLs
-    try:
-        import requests
-        from bs4 import BeautifulSoup
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            title = ''
-            meta_title = soup.find('meta', property='og:title')
-            if meta_title:
-                title = meta_title.get('content', '')
-            elif soup.find('title'):
-                title = soup.find('title').get_text().strip()
-            
-            description = ''
-            meta_desc = soup.find('meta', property='og:description')
-            if meta_desc:
-                description = meta_desc.get('content', '')
-            
-            return {
-                'title': title,
-                'description': description
-            }
-    except Exception:
-        pass
-    return {}
-
+    return get_extractors().extract(url, url_type)